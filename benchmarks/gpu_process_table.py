@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Scaling of the fleet gpu process table with the number of machines, rebuilt on render and maintained
+           per host on ingest, python -m benchmarks.gpu_process_table
+           """
+
+import random
+import time
+from typing import Callable, Mapping
+
+import numpy
+import pandas
+from pandas import DataFrame
+
+from heimdallr.configuration.heimdallr_config import (
+    DROP_COLUMNS,
+    INT_COLUMNS,
+    MB_COLUMNS,
+    PERCENT_COLUMNS,
+)
+from heimdallr.utilities.date_tools import timestamp_to_datetime
+from heimdallr.utilities.server.gpu_utilities import (
+    MB_DIVISOR,
+    to_overall_gpu_process_df,
+)
+from heimdallr.utilities.server.process_table import GpuProcessTable
+
+
+def per_device_gpu_process_df(
+    gpu_stats: Mapping, sort_by_key="used_gpu_mem"
+) -> DataFrame:
+    """The previous implementation, one DataFrame per device and element-wise conversions"""
+    resulta = []
+    columns = []
+    for k2, v2 in gpu_stats.items():
+        for device_i in v2["devices"]:
+            processes = device_i["processes"]
+            if len(processes) > 0:
+                columns = list(processes[0].keys())
+            df = pandas.DataFrame(data=processes)
+            df["machine"] = [k2] * len(processes)
+            resulta.append(df)
+
+    out_df = pandas.concat(resulta, sort=False)
+    out_df.sort_values(by=sort_by_key, axis=0, ascending=False, inplace=True)
+    out_df = out_df[["machine", *columns]]
+    out_df.create_time = out_df.create_time.map(timestamp_to_datetime)
+    for c in INT_COLUMNS:
+        out_df[c] = out_df[c].astype(int)
+    for c in PERCENT_COLUMNS:
+        out_df[c] = numpy.round(out_df[c], 2)
+    for c in MB_COLUMNS:
+        out_df[c] = numpy.round(out_df[c] // MB_DIVISOR, 2)
+    return out_df[[c for c in out_df.columns if c not in DROP_COLUMNS]]
+
+
+def fleet_stats(machines: int, devices: int = 8, processes: int = 20) -> Mapping:
+    """Synthetic gpu stats of machines"""
+    rng = random.Random(0)
+    return {
+        f"machine{m}": {
+            "devices": [
+                {
+                    "id": d,
+                    "processes": [
+                        {
+                            "used_gpu_mem": rng.randrange(1 << 34),
+                            "device_idx": d,
+                            "name": "python",
+                            "username": f"user{rng.randrange(50)}",
+                            "memory_percent": rng.random() * 10,
+                            "cpu_percent": rng.random() * 100,
+                            "cmdline": "python train.py --epochs 100",
+                            "device_name": "NVIDIA A100-SXM4-80GB",
+                            "create_time": 1.7e9 + rng.random() * 1e6,
+                            "status": "running",
+                            "pid": rng.randrange(1 << 22),
+                        }
+                        for _ in range(processes)
+                    ],
+                }
+                for d in range(devices)
+            ]
+        }
+        for m in range(machines)
+    }
+
+
+def best_of(func: Callable, *args, repeats: int = 3) -> float:
+    """Best wall time of repeats calls"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """description"""
+    print(
+        f"{'machines':>8} {'rows':>6} {'per device':>11} {'columnar':>9} {'speedup':>8}"
+    )
+    for machines in (1, 10, 50, 100, 250, 500):
+        stats = fleet_stats(machines)
+        legacy = best_of(per_device_gpu_process_df, stats)
+        columnar = best_of(to_overall_gpu_process_df, stats)
+        print(
+            f"{machines:>8} {machines * 8 * 20:>6} {legacy * 1e3:>9.1f}ms "
+            f"{columnar * 1e3:>7.1f}ms {legacy / columnar:>7.1f}x"
+        )
+
+
+def rebuild_records(gpu_stats: Mapping) -> list:
+    """Rebuild the whole table on render, as rows for the DataTable"""
+    return to_overall_gpu_process_df(gpu_stats).to_dict("records")
+
+
+def one_host_changed(table: GpuProcessTable, gpu_stats: Mapping) -> list:
+    """Ingest one changed host and render from the per host blocks"""
+    host = next(iter(gpu_stats))
+    table.update({host: gpu_stats[host]})
+    return table.rows()
+
+
+def main_incremental() -> None:
+    """One host changed between renders"""
+    print(
+        f"{'machines':>8} {'rows':>6} {'rebuild':>11} {'incremental':>11} {'speedup':>8}"
+    )
+    for machines in (1, 10, 50, 100, 250, 500):
+        stats = fleet_stats(machines)
+        table = GpuProcessTable()
+        table.update(stats)
+        rebuild = best_of(rebuild_records, stats)
+        incremental = best_of(one_host_changed, table, stats)
+        print(
+            f"{machines:>8} {machines * 8 * 20:>6} {rebuild * 1e3:>9.1f}ms "
+            f"{incremental * 1e3:>9.1f}ms {rebuild / incremental:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
+    print()
+    main_incremental()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Per-call overhead of the nvml wrappers on the collection hot path, looked up per call and pre-resolved,
+           against a stub libnvidia-ml.so.1 compiled with the system c compiler, python -m benchmarks.nvml_call_overhead
+           """
+
+import os
+import shutil
+import subprocess
+import tempfile
+import timeit
+from ctypes import CDLL, POINTER, byref, c_uint
+
+from heimdallr.utilities.nvidia import bindings
+
+STUB_SOURCE = r"""
+typedef struct { unsigned long long total, free, used; } memory_t;
+typedef struct { unsigned int gpu, memory; } utilization_t;
+
+int nvmlInit_v2(void) { return 0; }
+int nvmlShutdown(void) { return 0; }
+int nvmlDeviceGetCount_v2(unsigned int *count) { *count = 8; return 0; }
+int nvmlDeviceGetHandleByIndex_v2(unsigned int index, void **device) {
+  *device = (void *)(unsigned long)(index + 1);
+  return 0;
+}
+int nvmlDeviceGetName(void *device, char *name, unsigned int length) {
+  name[0] = 'T'; name[1] = '4'; name[2] = 0;
+  return 0;
+}
+int nvmlDeviceGetMemoryInfo(void *device, memory_t *memory) {
+  memory->total = 16ULL << 30; memory->used = 1ULL << 30; memory->free = memory->total - memory->used;
+  return 0;
+}
+int nvmlDeviceGetUtilizationRates(void *device, utilization_t *utilization) {
+  utilization->gpu = 42; utilization->memory = 7;
+  return 0;
+}
+"""
+
+
+def build_stub_library(directory: str) -> str:
+    """Compile STUB_SOURCE to directory/libnvidia-ml.so.1 and return its path"""
+    compiler = os.environ.get("CC") or shutil.which("cc") or shutil.which("gcc")
+    if compiler is None:
+        raise RuntimeError("A c compiler is needed to build the stub nvml library")
+    source = os.path.join(directory, "nvml_stub.c")
+    library = os.path.join(directory, "libnvidia-ml.so.1")
+    with open(source, "w") as f:
+        f.write(STUB_SOURCE)
+    subprocess.run(
+        [compiler, "-shared", "-fPIC", "-O2", "-o", library, source], check=True
+    )
+    return library
+
+
+def looked_up_memory_info(handle):
+    """The previous wrapper, get_func_pointer and check_return on every call"""
+    c_memory = bindings.c_nvmlMemory_t()
+    fn = bindings.get_func_pointer("nvmlDeviceGetMemoryInfo")
+    ret = fn(handle, byref(c_memory))
+    bindings.check_return(ret)
+    return c_memory
+
+
+def looked_up_utilization_rates(handle):
+    """The previous wrapper, get_func_pointer and check_return on every call"""
+    c_util = bindings.c_nvmlUtilization_t()
+    fn = bindings.get_func_pointer("nvmlDeviceGetUtilizationRates")
+    ret = fn(handle, byref(c_util))
+    bindings.check_return(ret)
+    return c_util
+
+
+def looked_up_name(handle):
+    """The previous wrapper, get_func_pointer and check_return on every call"""
+    c_name = bindings.create_string_buffer(bindings.NVML_DEVICE_NAME_BUFFER_SIZE)
+    fn = bindings.get_func_pointer("nvmlDeviceGetName")
+    ret = fn(handle, c_name, c_uint(bindings.NVML_DEVICE_NAME_BUFFER_SIZE))
+    bindings.check_return(ret)
+    return c_name.value
+
+
+def per_call_us(fn, *args, number: int = 100_000, repeat: int = 7) -> float:
+    """Best of repeat, in microseconds per call"""
+    return min(timeit.repeat(lambda: fn(*args), number=number, repeat=repeat)) / (
+        number * 1e-6
+    )
+
+
+def main():
+    """description"""
+    with tempfile.TemporaryDirectory() as directory:
+        library = build_stub_library(directory)
+        bindings.nvml_lib = CDLL(library)
+        bindings.nvmlInit()
+        handle = bindings.nvmlDeviceGetHandleByIndex(0)
+
+        # The same symbol from a separate handle, so its prototype does not affect the wrappers
+        typed = getattr(CDLL(library), "nvmlDeviceGetMemoryInfo")
+        typed.argtypes = [bindings.c_nvmlDevice_t, POINTER(bindings.c_nvmlMemory_t)]
+        untyped = getattr(CDLL(library), "nvmlDeviceGetMemoryInfo")
+        memory = bindings.c_nvmlMemory_t()
+
+        print(f"{'':32}{'looked up':>12}{'resolved':>12}")
+        for name, before, after in (
+            (
+                "nvmlDeviceGetMemoryInfo",
+                looked_up_memory_info,
+                bindings.nvmlDeviceGetMemoryInfo,
+            ),
+            (
+                "nvmlDeviceGetUtilizationRates",
+                looked_up_utilization_rates,
+                bindings.nvmlDeviceGetUtilizationRates,
+            ),
+            ("nvmlDeviceGetName", looked_up_name, bindings.nvmlDeviceGetName),
+        ):
+            print(
+                f"{name:32}{per_call_us(before, handle):10.3f}us{per_call_us(after, handle):10.3f}us"
+            )
+
+        print(
+            f"\nbare ctypes call{'':16}"
+            f"{per_call_us(untyped, handle, byref(memory)):10.3f}us without argtypes, "
+            f"{per_call_us(typed, handle, byref(memory)):.3f}us with argtypes"
+        )
+        bindings.nvml_functions.clear()
+        bindings.nvml_lib = None
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           The publisher collection, the smi device query and the publisher to server pipeline of a simulated fleet,
+           on top of the fake nvml library, python -m benchmarks.publisher_pipeline
+           """
+
+import time
+from typing import Callable, Dict, List, Sequence
+
+from heimdallr.configuration.heimdallr_config import (
+    HISTORY_CAPACITY,
+    HISTORY_WINDOWS_SEC,
+)
+from heimdallr.utilities.messaging import DeltaEncoder, get_codec
+from heimdallr.utilities.nvidia.fake_nvml import FakeNvml, use_nvml_lib
+from heimdallr.utilities.nvidia.packing import DeviceInventory, get_nv_info
+from heimdallr.utilities.nvidia.smi_parsing import NvidiaSMI
+from heimdallr.utilities.publisher.process_sampling import ProcessCache
+from heimdallr.utilities.server.history import TelemetryHistory
+from heimdallr.utilities.server.ingest import PayloadApplier
+from heimdallr.utilities.server.process_table import GpuProcessTable
+from heimdallr.utilities.server.telemetry_store import TelemetryStore
+
+
+def best_ms(fn: Callable, repeat: int = 5) -> float:
+    """Best of repeat, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+class SimulatedHost:
+    """A publisher on a fake nvml library, with its own device inventory, process cache and delta encoder"""
+
+    def __init__(self, name: str, nvml: FakeNvml, keyframe_interval: int):
+        self.name = name
+        self.nvml = nvml
+        self.inventory = DeviceInventory()
+        self.process_cache = ProcessCache(cpu_interval=0)  # No priming sleep
+        self.delta_encoder = DeltaEncoder(keyframe_interval)
+
+    def collect(self) -> Dict:
+        """The gpu_stats of pull_gpu_info"""
+        with use_nvml_lib(self.nvml):
+            driver_version, devices = get_nv_info(
+                process_cache=self.process_cache, device_inventory=self.inventory
+            )
+        return {
+            "count": len(devices),
+            "driver_version": driver_version,
+            "devices": devices,
+        }
+
+    def publish(self, codec) -> bytes:
+        """Step the simulation and encode a message like the publisher"""
+        self.nvml.step()
+        payload = {self.name: {"gpu_stats": self.collect(), "du_stats": {}}}
+        return codec.encode(self.delta_encoder.encode(payload))
+
+
+class ServerState:
+    """The telemetry state the server applies payloads to, without the dashboard"""
+
+    def __init__(self):
+        self.telemetry = TelemetryStore()
+        self.process_table = GpuProcessTable()
+        self.history = TelemetryHistory(HISTORY_CAPACITY, HISTORY_WINDOWS_SEC)
+        self.apply_payloads = PayloadApplier(
+            self.telemetry, self.process_table, self.history, log=lambda message: None
+        )
+
+    def apply(self, payloads: Sequence[bytes]) -> int:
+        """Apply one batch like the ingest worker of the server, returns the number ingested"""
+        received = time.monotonic()
+        return self.apply_payloads(list(payloads), [received] * len(payloads))
+
+
+def main_collection(
+    device_counts: Sequence[int] = (1, 8, 16), processes: Sequence[int] = (1, 8)
+) -> None:
+    """get_nv_info of one host, processes are sampled with psutil from the pids of this machine"""
+    print("get_nv_info")
+    print(f"{'devices':>8}{'processes':>10}{'ms':>10}")
+    for device_count in device_counts:
+        for processes_per_device in processes:
+            host = SimulatedHost(
+                "host", FakeNvml(device_count, processes_per_device), 1
+            )
+            host.collect()  # Build the inventory and prime the process cache
+            ms = best_ms(host.collect)
+            print(f"{device_count:8}{processes_per_device:10}{ms:10.2f}")
+
+
+def main_device_query(
+    device_count: int = 8,
+    filters: Sequence = (None, "memory.free,utilization.gpu"),
+) -> None:
+    """NvidiaSMI.DeviceQuery, all fields and the fields polled by loop_async"""
+    print("\nNvidiaSMI.DeviceQuery")
+    fake = FakeNvml(device_count)
+    with use_nvml_lib(fake):
+        smi = NvidiaSMI.getInstance()
+        for query in filters:
+            fake.calls.clear()
+            smi.DeviceQuery(query)
+            calls = sum(fake.calls.values())
+            ms = best_ms(lambda: smi.DeviceQuery(query))
+            print(f"{str(query):32}{ms:10.2f}ms{calls:8} nvml calls")
+        NvidiaSMI._NvidiaSMI__instance = None  # Shuts down while the fake is in use
+
+
+def main_fleet(
+    host_counts: Sequence[int] = (10, 100, 250),
+    device_count: int = 8,
+    processes_per_device: int = 2,
+    ticks: int = 5,
+    codec_name: str = "compact",
+    keyframe_interval: int = 15,
+) -> None:
+    """Every host publishes once per tick and the server applies the tick as one batch"""
+    print(f"\nfleet of {device_count} device hosts, {codec_name} codec, deltas")
+    print(f"{'hosts':>8}{'publish ms/host':>18}{'apply ms/tick':>16}")
+    codec = get_codec(codec_name)
+    for host_count in host_counts:
+        hosts = [
+            SimulatedHost(
+                f"host-{i}",
+                FakeNvml(device_count, processes_per_device, seed=i),
+                keyframe_interval,
+            )
+            for i in range(host_count)
+        ]
+        server = ServerState()
+        server.apply([host.publish(codec) for host in hosts])  # Keyframes
+        publish_sec = apply_sec = 0.0
+        for _ in range(ticks):
+            start = time.perf_counter()
+            payloads: List[bytes] = [host.publish(codec) for host in hosts]
+            publish_sec += time.perf_counter() - start
+            start = time.perf_counter()
+            server.apply(payloads)
+            apply_sec += time.perf_counter() - start
+        print(
+            f"{host_count:8}{publish_sec * 1000 / ticks / host_count:18.2f}"
+            f"{apply_sec * 1000 / ticks:16.2f}"
+        )
+
+
+def main() -> None:
+    """description"""
+    main_collection()
+    main_device_query()
+    main_fleet()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,25 +10,68 @@ from warg import NOD
 
 SERVER_ADDRESS = "localhost"
 SERVER_PORT = int(os.environ.get("PORT", 5555))
+SERVER_THREADS = 16  # Waitress threads, every open push stream holds one
 
 TABLE_PAGE_SIZE = 30
 TIMEOUT_MACHINES_SEC = 20  # SECONDS
+EVICTION_INTERVAL_SEC = 1  # SECONDS between checks for timed out machines
 
 MQTT_TOPIC = "v1/gpu/status"
 MQTT_PUBLISH_INTERVAL_SEC = 2  # SECONDS
 MQTT_QOS = 0  # At most once (0), At least once (1), Exactly once (2)
+MQTT_CODEC = (
+    "json"  # Payload codec of the publisher, "json" or "compact", the server reads both
+)
+MQTT_KEYFRAME_INTERVAL = 0  # Publish full keyframes every N ticks and deltas in between, 0 publishes only full payloads
+INGEST_QUEUE_SIZE = 1000  # Received payloads waiting to be applied by the server
+INGEST_BATCH_SIZE = 100  # Payloads applied to the telemetry store at once
+PUBLISHER_ASYNCIO = False  # Collect on a thread pool with per collector timeouts, publishing on a drift-free timer
+COLLECTOR_TIMEOUT_SEC = MQTT_PUBLISH_INTERVAL_SEC * 0.75  # SECONDS
+COLLECTOR_MAX_WORKERS = 2
+PUBLISHER_NVML_EVENTS = False  # Publish on nvml events, otherwise rarely
+MQTT_QUIET_PUBLISH_INTERVAL_SEC = 10  # With nvml events, below TIMEOUT_MACHINES_SEC
+NVML_EVENT_MIN_INTERVAL_SEC = MQTT_PUBLISH_INTERVAL_SEC  # Between event publishes
+PUBLISH_UTILIZATION_SUMMARIES = True  # p50, p95 and max of the driver samples
 
 HTML_TITLE = "VCLab Board"
 
+TELEMETRY_VERSION_ID = "telemetry-version"
+DU_VERSION_ID = "du-version"
+PUSH_STATUS_ID = "push-status"
+PUSH_MAX_STREAMS = SERVER_THREADS // 2  # Further dashboards fall back to polling
+PUSH_MIN_INTERVAL_SEC = MQTT_PUBLISH_INTERVAL_SEC  # No more often than GPU_INTERVAL_MS
+PUSH_KEEP_ALIVE_SEC = 15  # SECONDS
+PUSH_STREAM_MAX_SEC = 300  # Streams are then reopened, freeing stale threads
+PUSH_RETRY_MS = 2000
+
 GPU_GRAPHS_ID = "gpu-graphs"
+GPU_GRAPHS_SIGNATURE_ID = "gpu-graphs-signature"
 GPU_TABLES_ID = "gpu-tables"
+GPU_TABLE_ID = "gpu-table-0"
 GPU_INTERVAL_ID = "gpu-interval"
 GPU_INTERVAL_MS = MQTT_PUBLISH_INTERVAL_SEC * 1000
+GPU_HISTORY_TABLE_ID = "gpu-history-table"
+HISTORY_WINDOWS_SEC = {"5m": 60 * 5, "1h": 60 * 60}
+HISTORY_CAPACITY = 60 * 60 // MQTT_PUBLISH_INTERVAL_SEC + 1  # Samples kept per host
+HISTORY_AGGREGATE_INTERVAL_SEC = 10  # SECONDS the aggregates are reused
 
 DU_TABLES_ID = "du-tables"
+DU_TABLE_IDS = ["du-table-0", "du-table-1", "du-table-2"]  # Partitions, users, dirs
 DU_INTERVAL_ID = "du-interval"
 DU_INTERVAL_MS = MQTT_PUBLISH_INTERVAL_SEC * 1000 * 10
 
+GPU_COLLECTOR_PERIOD_SEC = MQTT_PUBLISH_INTERVAL_SEC  # SECONDS
+DU_COLLECTOR_PERIOD_SEC = (
+    DU_INTERVAL_MS / 1000
+)  # SECONDS, no faster than the dashboard refreshes it
+COLLECTOR_COST_BUDGET = (
+    None  # Maximum summed collector cost per publish tick, None for no limit
+)
+DU_DIRECTORIES = []  # E.g. shared dataset volumes, totalled per top-level dir and user
+DU_DIRECTORY_INTERVAL_SEC = 60  # SECONDS between incremental refreshes
+DU_DIRECTORY_WORKERS = 4  # Threads running stat and scandir calls
+DU_DIRECTORY_HOT_WINDOW_SEC = 60 * 10  # Recently modified dirs are always rescanned
+
 TEAMS_STATUS_ID = "teams-status"
 TEAMS_STATUS_INTERVAL_ID = "teams-status-interval"
 TEAMS_STATUS_INTERVAL_MS = MQTT_PUBLISH_INTERVAL_SEC * 1000 * 10
@@ -37,6 +80,21 @@ INT_COLUMNS = ["device_idx", "pid"]  # "cpu_num", "num_threads"]
 PERCENT_COLUMNS = ["cpu_percent", "memory_percent"]
 MB_COLUMNS = ["used_gpu_mem"]
 DROP_COLUMNS = ["cmdline", "cpu_percent", "memory_percent"]
+PROCESS_ATTRIBUTES = [
+    "name",
+    "username",
+    "memory_percent",
+    "cpu_percent",
+    "cmdline",
+    "create_time",
+    "status",
+]  # Read by the publisher for every gpu process
+PUBLISH_DROPPED_COLUMNS = True  # Older servers need PERCENT_COLUMNS
+PUBLISHED_PROCESS_ATTRIBUTES = (
+    PROCESS_ATTRIBUTES
+    if PUBLISH_DROPPED_COLUMNS
+    else [a for a in PROCESS_ATTRIBUTES if a not in DROP_COLUMNS]
+)
 
 TIME_ID = "time-text"
 TIME_INTERVAL_ID = "time-interval"
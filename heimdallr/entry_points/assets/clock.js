@@ -0,0 +1,16 @@
+// Clientside callbacks of the board, loaded by dash from the assets folder.
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+  heimdallr: Object.assign({}, (window.dash_clientside || {}).heimdallr, {
+    // The local time like warg.default_datetime_repr, %Y-%m-%d_%H:%M:%S.%f
+    clock: function (n_intervals) {
+      const now = new Date();
+      const pad = (v, n) => String(v).padStart(n || 2, "0");
+      return (
+        `${now.getFullYear()}-${pad(now.getMonth() + 1)}-${pad(now.getDate())}_` +
+        `${pad(now.getHours())}:${pad(now.getMinutes())}:${pad(now.getSeconds())}.` +
+        `${pad(now.getMilliseconds() * 1000, 6)}`
+      );
+    },
+  }),
+});
@@ -0,0 +1,50 @@
+// Refreshes the board when the server pushes a telemetry change, instead of polling on intervals.
+
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+  heimdallr: Object.assign({}, (window.dash_clientside || {}).heimdallr, {
+    // Opens the event stream once per page, the intervals only poll while it is not connected
+    connect_push: function (
+      _,
+      status_id,
+      version_id,
+      du_version_id,
+      gpu_interval_id,
+      du_interval_id
+    ) {
+      const set_props = (window.dash_clientside || {}).set_props;
+      if (window.heimdallr_push || !window.EventSource || !set_props) {
+        return "polling";
+      }
+      const polling = (enabled) => {
+        set_props(gpu_interval_id, { disabled: !enabled });
+        set_props(du_interval_id, { disabled: !enabled });
+        set_props(status_id, { data: enabled ? "polling" : "push" });
+      };
+      let shown = {};
+      const connect = () => {
+        const source = new EventSource("events");
+        window.heimdallr_push = source;
+        source.onopen = () => polling(false);
+        source.onmessage = (event) => {
+          const versions = JSON.parse(event.data);
+          if (versions.version !== shown.version) {
+            set_props(version_id, { data: versions.version });
+          }
+          if (versions.du_version !== shown.du_version) {
+            set_props(du_version_id, { data: versions.du_version });
+          }
+          shown = versions;
+        };
+        source.onerror = () => {
+          polling(true);
+          if (source.readyState === EventSource.CLOSED) {
+            // Refused, e.g. too many streams, the browser does not retry by itself
+            setTimeout(connect, 60000);
+          }
+        };
+      };
+      connect();
+      return "connecting";
+    },
+  }),
+});
@@ -1,6 +1,6 @@
-import json
+import asyncio
 import socket
-import time
+import threading
 from typing import Any
 
 import paho.mqtt.client as mqtt
@@ -16,6 +16,10 @@ from heimdallr.configuration.heimdallr_settings import (
     HeimdallrSettings,
     SettingScopeEnum,
 )
+from heimdallr.utilities.messaging import DeltaEncoder, get_codec
+from heimdallr.utilities.publisher.async_publishing import AsyncPublisher
+from heimdallr.utilities.publisher.collectors import CollectorRegistry
+from heimdallr.utilities.publisher.nvml_events import NvmlEventWatcher
 from heimdallr.utilities.publisher.unpacking import pull_disk_usage_info, pull_gpu_info
 
 HOSTNAME = socket.gethostname()
@@ -43,8 +47,31 @@ def on_disconnect(client: Any, userdata: Any, rc, writer: callable = print) -> N
         writer(result)
 
 
-def main(setting_scope: SettingScopeEnum = SettingScopeEnum.user) -> None:
-    """description"""
+def get_collector_registry() -> CollectorRegistry:
+    """The collectors of the publisher, their periods and relative costs"""
+    registry = CollectorRegistry(cost_budget=ALL_CONSTANTS.COLLECTOR_COST_BUDGET)
+    registry.register(
+        "gpu_stats", pull_gpu_info, ALL_CONSTANTS.GPU_COLLECTOR_PERIOD_SEC, cost=1
+    )
+    registry.register(
+        "du_stats",
+        pull_disk_usage_info,
+        ALL_CONSTANTS.DU_COLLECTOR_PERIOD_SEC,
+        cost=4,
+    )
+    return registry
+
+
+def main(
+    setting_scope: SettingScopeEnum = SettingScopeEnum.user,
+    asynchronous: bool = ALL_CONSTANTS.PUBLISHER_ASYNCIO,
+) -> None:
+    """
+
+    Args:
+      setting_scope: Scope of the settings and logs
+      asynchronous: Collect on a thread pool and publish from an asyncio loop instead of the schedule loop
+    """
     global LOG_WRITER
     if setting_scope == SettingScopeEnum.user:
         LOG_WRITER = LogWriter(
@@ -80,30 +107,83 @@ def main(setting_scope: SettingScopeEnum = SettingScopeEnum.user) -> None:
 
     client.loop_start()
 
-    sensor_data = NOD(
-        {HOSTNAME: {"gpu_stats": pull_gpu_info(), "du_stats": pull_disk_usage_info()}}
-    )
+    collectors = get_collector_registry()
+    interval_sec = ALL_CONSTANTS.MQTT_PUBLISH_INTERVAL_SEC
+    publish_now = threading.Event()  # Set on nvml events, wakes the schedule loop
+    wake_publisher = publish_now.set  # Rebound to the wake of the asyncio publisher
+    event_watcher = None
+    if ALL_CONSTANTS.PUBLISHER_NVML_EVENTS:
+
+        def on_nvml_event(device_index: int, event_type: int, event_data: int) -> None:
+            """Publish fresh gpu stats now"""
+            LOG_WRITER(
+                f"nvml event {event_type:#x} ({event_data}) on device {device_index}"
+            )
+            collectors["gpu_stats"].expire()
+            wake_publisher()
+
+        event_watcher = NvmlEventWatcher(
+            on_nvml_event, min_interval_sec=ALL_CONSTANTS.NVML_EVENT_MIN_INTERVAL_SEC
+        )
+        if event_watcher.register():
+            event_watcher.start()
+            interval_sec = ALL_CONSTANTS.MQTT_QUIET_PUBLISH_INTERVAL_SEC
+        else:
+            event_watcher = None
+    tick_slack_sec = interval_sec / 2
+    sensor_data = NOD({HOSTNAME: collectors.collect()})
+
+    codec = get_codec(ALL_CONSTANTS.MQTT_CODEC)
+    delta_encoder = None
+    if ALL_CONSTANTS.MQTT_KEYFRAME_INTERVAL:
+        delta_encoder = DeltaEncoder(ALL_CONSTANTS.MQTT_KEYFRAME_INTERVAL)
 
     if True:  # with IgnoreInterruptSignal():
         print("Publisher started")
 
-        def job():
+        def publish(host_stats: dict) -> None:
             """description"""
-            sensor_data[HOSTNAME]["gpu_stats"] = pull_gpu_info()
-            sensor_data[HOSTNAME]["du_stats"] = pull_disk_usage_info()
+            for k, v in host_stats.items():
+                sensor_data[HOSTNAME][k] = v
+            payload = sensor_data.as_dict()
+            if delta_encoder:
+                payload = delta_encoder.encode(payload)
             client.publish(
                 ALL_CONSTANTS.MQTT_TOPIC,
-                json.dumps(sensor_data.as_dict()),
+                codec.encode(payload),
                 ALL_CONSTANTS.MQTT_QOS,
             )
 
-        schedule.every(ALL_CONSTANTS.MQTT_PUBLISH_INTERVAL_SEC).seconds.do(job)
-
-        for _ in busy_indicator():
-            schedule.run_pending()
-            time.sleep(1)
+        def job():
+            """description"""
+            publish(collectors.collect(slack_sec=tick_slack_sec))
+
+        if asynchronous:
+            with AsyncPublisher(
+                collectors,
+                publish,
+                interval_sec=interval_sec,
+                collector_timeout_sec=ALL_CONSTANTS.COLLECTOR_TIMEOUT_SEC,
+                max_workers=ALL_CONSTANTS.COLLECTOR_MAX_WORKERS,
+            ) as async_publisher:
+                wake_publisher = async_publisher.wake
+                loop = asyncio.new_event_loop()  # asyncio.run is 3.7+
+                try:
+                    loop.run_until_complete(async_publisher.run())
+                finally:
+                    loop.close()
+        else:
+            schedule.every(interval_sec).seconds.do(job)
+
+            for _ in busy_indicator():
+                schedule.run_pending()
+                if publish_now.wait(1):
+                    publish_now.clear()
+                    job()
 
     # noinspection PyUnreachableCode
+    if event_watcher:
+        event_watcher.stop()
     LOG_WRITER.close()
     client.loop_stop()
     client.disconnect()
@@ -1,25 +1,21 @@
-import copy
-import datetime
-import json
 import logging
 import socket
-from typing import Any
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Mapping, Tuple
 
 import dash
 import flask
 from apppath import ensure_existence
 from dash import Dash
 from dash.dash_table import DataTable
-from dash.dependencies import Input, Output
+from dash.dependencies import ClientsideFunction, Input, Output, State
 from dash.html import Div
-from warg import default_datetime_repr
 from draugr.writers import LogWriter, MockWriter, Writer
 from flask import Response
 from paho import mqtt
 from paho.mqtt.client import Client
-from pandas import DataFrame
 from waitress import serve
-from warg import NOD
 
 from heimdallr import PROJECT_APP_PATH, PROJECT_NAME
 from heimdallr.configuration.heimdallr_config import ALL_CONSTANTS
@@ -28,15 +24,36 @@ from heimdallr.configuration.heimdallr_settings import (
     SettingScopeEnum,
 )
 from heimdallr.server.board_layout import get_root_layout
+from heimdallr.utilities.messaging import DeltaDecoder
 from heimdallr.utilities.server import (
     get_calender_df,
+    patch_pie_charts,
     per_machine_per_device_pie_charts,
-    to_overall_gpu_process_df,
+    pie_charts_signature,
 )
 
 __all__ = ["main"]
 
-from heimdallr.utilities.server.du_utilities import to_overall_du_process_df
+from heimdallr.utilities.server.du_utilities import (
+    to_overall_du_directory_df,
+    to_overall_du_process_df,
+    to_overall_du_user_df,
+)
+from heimdallr.utilities.server.history import TelemetryHistory, history_rows
+from heimdallr.utilities.server.ingest import IngestWorker, PayloadApplier
+from heimdallr.utilities.server.process_table import GpuProcessTable
+from heimdallr.utilities.server.push import version_events
+from heimdallr.utilities.server.render_cache import RenderCache
+from heimdallr.utilities.server.table_query import (
+    page_rows,
+    query_rows,
+    table_columns,
+)
+from heimdallr.utilities.server.telemetry_store import (
+    HostEvictor,
+    TelemetrySnapshot,
+    TelemetryStore,
+)
 from heimdallr.utilities.server.teams_status import team_members_status
 
 log = logging.getLogger("werkzeug")
@@ -64,9 +81,13 @@ external_stylesheets = [
     },
 ]
 
-GPU_STATS = NOD()
-DU_STATS = NOD()
-KEEP_ALIVE = NOD()
+TELEMETRY = TelemetryStore()
+PROCESS_TABLE = GpuProcessTable()
+HISTORY = TelemetryHistory(
+    ALL_CONSTANTS.HISTORY_CAPACITY, ALL_CONSTANTS.HISTORY_WINDOWS_SEC
+)
+RENDER_CACHE = RenderCache()
+DELTA_DECODER = DeltaDecoder()
 
 # CLIENT_ID = str(uuid.getnode())
 HOSTNAME = socket.gethostname()
@@ -86,28 +107,45 @@ DASH_APP.layout = get_root_layout(DEVELOPMENT)
 LOG_WRITER: Writer = MockWriter()
 
 
-@DASH_APP.callback(
+DASH_APP.clientside_callback(  # assets/clock.js, no server round trip per browser
+    ClientsideFunction(namespace="heimdallr", function_name="clock"),
     Output(ALL_CONSTANTS.TIME_ID, "children"),
     [Input(ALL_CONSTANTS.TIME_INTERVAL_ID, "n_intervals")],
 )
-def update_time(n: int) -> str:
-    """description"""
-    global GPU_STATS
-    global KEEP_ALIVE
-    for k, v in KEEP_ALIVE.items():
-        if v > ALL_CONSTANTS.TIMEOUT_MACHINES_SEC:
-            if k in GPU_STATS.keys():
-                GPU_STATS.pop(k)
-                print(f"deleting {k} from stats")
 
-    for key in list(KEEP_ALIVE.keys()):
-        if key in GPU_STATS.keys():
-            KEEP_ALIVE[key] = KEEP_ALIVE[key] + 1
-        else:
-            KEEP_ALIVE.pop(key)
-            print(f"deleting {key} from keep alive")
 
-    return default_datetime_repr(datetime.datetime.now())
+DASH_APP.clientside_callback(  # assets/push.js, refreshes on pushed changes
+    ClientsideFunction(namespace="heimdallr", function_name="connect_push"),
+    Output(ALL_CONSTANTS.PUSH_STATUS_ID, "data"),
+    [Input(ALL_CONSTANTS.PUSH_STATUS_ID, "id")],
+    [
+        State(i, "id")
+        for i in (
+            ALL_CONSTANTS.PUSH_STATUS_ID,
+            ALL_CONSTANTS.TELEMETRY_VERSION_ID,
+            ALL_CONSTANTS.DU_VERSION_ID,
+            ALL_CONSTANTS.GPU_INTERVAL_ID,
+            ALL_CONSTANTS.DU_INTERVAL_ID,
+        )
+    ],
+)
+
+
+def forget_hosts(evicted: List[str]) -> None:
+    """Drop the state kept for hosts evicted from the telemetry store"""
+    PROCESS_TABLE.remove(evicted)
+    HISTORY.forget(evicted)
+    for k in evicted:
+        DELTA_DECODER.forget(k)
+        print(f"deleting {k} from stats")
+
+
+HOST_EVICTOR = HostEvictor(
+    TELEMETRY,
+    ALL_CONSTANTS.TIMEOUT_MACHINES_SEC,
+    on_evict=forget_hosts,
+    interval_sec=ALL_CONSTANTS.EVICTION_INTERVAL_SEC,
+)
 
 
 @DASH_APP.callback(
@@ -148,90 +186,232 @@ def update_teams_status_live(n: int) -> Div:
     return Div(team_members_status(None), className="row")
 
 
+def render_gpu_graphs(snapshot: TelemetrySnapshot, keep_alive: Mapping) -> List[Div]:
+    """description"""
+    return per_machine_per_device_pie_charts(snapshot.gpu_stats, keep_alive)
+
+
+def render_du_tables(snapshot: TelemetrySnapshot) -> List[Tuple[List[Dict], List[str]]]:
+    """Rows and columns of the partition, user and directory tables"""
+    tables = []
+    for to_df in (
+        to_overall_du_process_df,
+        to_overall_du_user_df,
+        to_overall_du_directory_df,
+    ):
+        df = to_df(snapshot.du_stats)
+        df = df.astype(object).where(df.notna(), None)  # NaN is not valid json
+        tables.append((df.to_dict("records"), list(df.columns)))
+    return tables
+
+
+def table_page(
+    name: str,
+    version: Hashable,
+    rows: List[Mapping],
+    columns: List[str],
+    page_current: int,
+    page_size: int,
+    sort_by: List[Mapping],
+    filter_query: str,
+) -> Tuple[List[Mapping], List[Dict], int]:
+    """
+    The requested page of a backend paged table, the filtered and sorted rows are computed once per version
+    and query and shared by all browsers paging through them.
+
+    Returns:
+      The rows of the page, the columns and the number of pages
+    """
+    if not rows:
+        rows, columns = [{"data": "No data"}], ["data"]
+    queried = RENDER_CACHE.get(
+        name,
+        (
+            version,
+            filter_query,
+            tuple((s["column_id"], s["direction"]) for s in sort_by or ()),
+        ),
+        lambda: query_rows(rows, filter_query, sort_by),
+    )
+    page, page_count = page_rows(
+        queried, page_current, page_size or ALL_CONSTANTS.TABLE_PAGE_SIZE
+    )
+    return page, table_columns(columns, rows), page_count
+
+
 @DASH_APP.callback(
-    Output(ALL_CONSTANTS.GPU_GRAPHS_ID, "children"),
-    [Input(ALL_CONSTANTS.GPU_INTERVAL_ID, "n_intervals")],
+    [
+        Output(ALL_CONSTANTS.GPU_GRAPHS_ID, "children"),
+        Output(ALL_CONSTANTS.GPU_GRAPHS_SIGNATURE_ID, "data"),
+    ],
+    [
+        Input(ALL_CONSTANTS.GPU_INTERVAL_ID, "n_intervals"),
+        Input(ALL_CONSTANTS.TELEMETRY_VERSION_ID, "data"),
+    ],
+    [State(ALL_CONSTANTS.GPU_GRAPHS_SIGNATURE_ID, "data")],
 )
-def update_graph(n: int) -> Div:
-    """description"""
-    global GPU_STATS
-    global KEEP_ALIVE
-    compute_machines = []
-    if GPU_STATS:
-        compute_machines.extend(
-            per_machine_per_device_pie_charts(copy.deepcopy(GPU_STATS), KEEP_ALIVE)
+def update_graph(n: int, version: int, shown_signature: List) -> Tuple[Any, Any]:
+    """
+    Builds the pie charts when the machines or devices shown by the browser differ from the current ones,
+    otherwise only patches the titles and values of the charts already shown.
+    """
+    snapshot = TELEMETRY.snapshot()
+    keep_alive = snapshot.keep_alive()
+    key = (snapshot.version, tuple(keep_alive.items()))  # The titles show the ages
+    signature = RENDER_CACHE.get(
+        ALL_CONSTANTS.GPU_GRAPHS_SIGNATURE_ID,
+        snapshot.version,
+        lambda: pie_charts_signature(snapshot.gpu_stats),
+    )
+    if signature == shown_signature:
+        return (
+            RENDER_CACHE.get(
+                f"{ALL_CONSTANTS.GPU_GRAPHS_ID}-patch",
+                key,
+                lambda: patch_pie_charts(snapshot.gpu_stats, keep_alive),
+            ),
+            dash.no_update,
         )
-    return Div(compute_machines)
+    return (
+        RENDER_CACHE.get(
+            ALL_CONSTANTS.GPU_GRAPHS_ID,
+            key,
+            lambda: render_gpu_graphs(snapshot, keep_alive),
+        ),
+        signature,
+    )
+
+
+def backend_table_io(
+    table_id: str, interval_id: str, version_id: str
+) -> Tuple[List, List]:
+    """Outputs and inputs of the callback of a backend paged table, refreshed by polling or pushed versions"""
+    return (
+        [
+            Output(table_id, "data"),
+            Output(table_id, "columns"),
+            Output(table_id, "page_count"),
+        ],
+        [
+            Input(interval_id, "n_intervals"),
+            Input(version_id, "data"),
+            Input(table_id, "page_current"),
+            Input(table_id, "page_size"),
+            Input(table_id, "sort_by"),
+            Input(table_id, "filter_query"),
+        ],
+    )
 
 
 @DASH_APP.callback(
-    Output(ALL_CONSTANTS.GPU_TABLES_ID, "children"),
-    [Input(ALL_CONSTANTS.GPU_INTERVAL_ID, "n_intervals")],
+    *backend_table_io(
+        ALL_CONSTANTS.GPU_TABLE_ID,
+        ALL_CONSTANTS.GPU_INTERVAL_ID,
+        ALL_CONSTANTS.TELEMETRY_VERSION_ID,
+    )
 )
-def update_table(n: int) -> Div:
+def update_table(
+    n: int,
+    version: int,
+    page_current: int,
+    page_size: int,
+    sort_by: List,
+    filter_query: str,
+) -> Tuple[List[Mapping], List[Dict], int]:
     """description"""
-    MQTT_CLIENT.loop()
-
-    compute_machines = []
-
-    if GPU_STATS:
-        df = to_overall_gpu_process_df(copy.deepcopy(GPU_STATS))
-    else:
-        df = DataFrame(["No data"], columns=("data",))
-
-    compute_machines.append(
-        DataTable(
-            id="gpu-table-0",
-            columns=[{"name": i, "id": i} for i in df.columns],
-            data=df.to_dict("records"),
-            page_size=ALL_CONSTANTS.TABLE_PAGE_SIZE,
-            # style_as_list_view=True,
-            style_data_conditional=[
-                {"if": {"row_index": "odd"}, "backgroundColor": "rgb(248, 248, 248)"}
-            ],
-            style_header={
-                "backgroundColor": "rgb(230, 230, 230)",
-                "fontWeight": "bold",
-            },
-        )
+    version, rows, columns = PROCESS_TABLE.snapshot()
+    return table_page(
+        ALL_CONSTANTS.GPU_TABLE_ID,
+        version,
+        rows,
+        columns,
+        page_current,
+        page_size,
+        sort_by,
+        filter_query,
     )
 
-    return Div(compute_machines)
+
+def history_aggregates() -> Tuple[int, Mapping]:
+    """The aggregates of the device history, recomputed at most every HISTORY_AGGREGATE_INTERVAL_SEC"""
+    interval = int(time.monotonic() // ALL_CONSTANTS.HISTORY_AGGREGATE_INTERVAL_SEC)
+    return interval, RENDER_CACHE.get("history", interval, HISTORY.aggregates)
 
 
 @DASH_APP.callback(
-    Output(ALL_CONSTANTS.DU_TABLES_ID, "children"),
-    [Input(ALL_CONSTANTS.DU_INTERVAL_ID, "n_intervals")],
+    *backend_table_io(
+        ALL_CONSTANTS.GPU_HISTORY_TABLE_ID,
+        ALL_CONSTANTS.GPU_INTERVAL_ID,
+        ALL_CONSTANTS.TELEMETRY_VERSION_ID,
+    )
 )
-def update_table(n: int) -> Div:
-    """description"""
-    MQTT_CLIENT.loop()
+def update_history_table(
+    n: int,
+    version: int,
+    page_current: int,
+    page_size: int,
+    sort_by: List,
+    filter_query: str,
+) -> Tuple[List[Mapping], List[Dict], int]:
+    """Min, mean, max and p95 of the device metrics over the history windows"""
+    interval, aggregates = history_aggregates()
+    rows = RENDER_CACHE.get(
+        f"{ALL_CONSTANTS.GPU_HISTORY_TABLE_ID}-rows",
+        interval,
+        lambda: history_rows(aggregates),
+    )
+    return table_page(
+        ALL_CONSTANTS.GPU_HISTORY_TABLE_ID,
+        interval,
+        rows,
+        list(rows[0]) if rows else [],
+        page_current,
+        page_size,
+        sort_by,
+        filter_query,
+    )
 
-    compute_machines = []
 
-    if DU_STATS:
-        df = to_overall_du_process_df(copy.deepcopy(DU_STATS))
-    else:
-        df = DataFrame(["No data"], columns=("data",))
-
-    compute_machines.append(
-        DataTable(
-            id="du-table-0",
-            columns=[{"name": i, "id": i} for i in df.columns],
-            data=df.to_dict("records"),
-            page_size=ALL_CONSTANTS.TABLE_PAGE_SIZE,
-            # style_as_list_view=True,
-            style_data_conditional=[
-                {"if": {"row_index": "odd"}, "backgroundColor": "rgb(248, 248, 248)"}
-            ],
-            style_header={
-                "backgroundColor": "rgb(230, 230, 230)",
-                "fontWeight": "bold",
-            },
-        )
+def register_du_table_callback(table_i: int, table_id: str) -> None:
+    """The callback of the table_i'th disk usage table"""
+    outputs, inputs = backend_table_io(
+        table_id, ALL_CONSTANTS.DU_INTERVAL_ID, ALL_CONSTANTS.DU_VERSION_ID
     )
 
-    return Div(compute_machines)
+    @DASH_APP.callback([*outputs, Output(table_id, "style_table")], inputs)
+    def update_du_table(
+        n: int,
+        du_version: int,
+        page_current: int,
+        page_size: int,
+        sort_by: List,
+        filter_query: str,
+    ) -> Tuple[List[Mapping], List[Dict], int, Dict]:
+        """description"""
+        snapshot = TELEMETRY.snapshot()
+        rows, columns = RENDER_CACHE.get(
+            ALL_CONSTANTS.DU_TABLES_ID,
+            snapshot.du_version,
+            lambda: render_du_tables(snapshot),
+        )[table_i]
+        hidden = table_i > 0 and columns == ["no data"]  # No directories indexed
+        return (
+            *table_page(
+                table_id,
+                snapshot.du_version,
+                rows,
+                columns,
+                page_current,
+                page_size,
+                sort_by,
+                filter_query,
+            ),
+            {"display": "none"} if hidden else {},
+        )
+
+
+for du_table_i, du_table_id in enumerate(ALL_CONSTANTS.DU_TABLE_IDS):
+    register_du_table_callback(du_table_i, du_table_id)
 
 
 @DASH_APP.callback(
@@ -269,24 +449,66 @@ def on_post_config() -> Response:
     return flask.redirect("/")
 
 
-def on_message(client: Any, userdata: Any, result: mqtt.client.MQTTMessage) -> None:
-    """description"""
-    global LOG_WRITER
-    global GPU_STATS
-    global KEEP_ALIVE
-    d = json.loads(result.payload)
-    keys = d.keys()
-    for key in keys:
-        if "gpu_stats" in d[key]:
-            GPU_STATS[key] = d[key]["gpu_stats"]
-            DU_STATS[key] = d[key]["du_stats"]
-        else:
-            GPU_STATS[key] = d[key]  # ["gpu_stats"]
-            DU_STATS[key] = {}
-        KEEP_ALIVE[key] = 0
-    LOG_WRITER(
-        f"received payload for {keys}, retain:{result.retain}, timestamp:{result.timestamp}"
+APPLY_PAYLOADS = PayloadApplier(
+    TELEMETRY,
+    PROCESS_TABLE,
+    HISTORY,
+    DELTA_DECODER,
+    log=lambda message: LOG_WRITER(message),  # LOG_WRITER is replaced in main
+)
+
+
+INGEST = IngestWorker(
+    APPLY_PAYLOADS,
+    maxsize=ALL_CONSTANTS.INGEST_QUEUE_SIZE,
+    batch_size=ALL_CONSTANTS.INGEST_BATCH_SIZE,
+)
+
+
+PUSH_STREAMS = threading.BoundedSemaphore(ALL_CONSTANTS.PUSH_MAX_STREAMS)
+
+
+@DASH_APP.server.route("/events", methods=["GET"])
+def on_get_events() -> Response:
+    """Server-sent events with the telemetry versions whenever they change, see assets/push.js"""
+    if not PUSH_STREAMS.acquire(blocking=False):  # Keep threads for the callbacks
+        return Response("Too many event streams", status=503)
+
+    def describe() -> Mapping:
+        snapshot = TELEMETRY.snapshot()
+        return {"version": snapshot.version, "du_version": snapshot.du_version}
+
+    response = Response(
+        version_events(
+            TELEMETRY.wait,
+            describe,
+            keep_alive_sec=ALL_CONSTANTS.PUSH_KEEP_ALIVE_SEC,
+            min_interval_sec=ALL_CONSTANTS.PUSH_MIN_INTERVAL_SEC,
+            max_duration_sec=ALL_CONSTANTS.PUSH_STREAM_MAX_SEC,
+            retry_ms=ALL_CONSTANTS.PUSH_RETRY_MS,
+        ),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
+    response.call_on_close(PUSH_STREAMS.release)
+    return response
+
+
+@DASH_APP.server.route("/history", methods=["GET"])
+def on_get_history() -> Response:
+    """host -> device id -> metric -> window -> min, mean, max and p95"""
+    return flask.jsonify(history_aggregates()[1])
+
+
+@DASH_APP.server.route("/ingest", methods=["GET"])
+def on_get_ingest() -> Response:
+    """Counters of received, dropped and applied messages"""
+    return flask.jsonify(INGEST.stats())
+
+
+def on_message(client: Any, userdata: Any, result: mqtt.client.MQTTMessage) -> None:
+    """Called on the mqtt network thread, hands the payload to the ingest thread"""
+    INGEST.put(result.payload)
 
 
 def on_disconnect(client: Any, userdata: Any, rc: Any) -> None:
@@ -350,6 +572,9 @@ def main(
     if True:
         crystallised_heimdallr_settings = HeimdallrSettings(setting_scope)
         setup_mqtt_connection(settings=crystallised_heimdallr_settings)
+    INGEST.start()
+    HOST_EVICTOR.start()
+    MQTT_CLIENT.loop_start()
 
     DASH_APP.title = ALL_CONSTANTS.HTML_TITLE
     DASH_APP.update_title = ALL_CONSTANTS.HTML_TITLE
@@ -368,8 +593,11 @@ def main(
         )
     else:
         # DASH_APP.run_server(host=host, port=port)
-        serve(DASH_APP.server, **kwargs)
+        serve(DASH_APP.server, **{"threads": ALL_CONSTANTS.SERVER_THREADS, **kwargs})
 
+    MQTT_CLIENT.loop_stop()
+    INGEST.stop()
+    HOST_EVICTOR.stop()
     LOG_WRITER.close()
 
 
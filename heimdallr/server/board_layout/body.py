@@ -10,6 +10,7 @@ __doc__ = r"""
 from typing import List
 
 from dash import dcc, html
+from dash.dash_table import DataTable
 
 from heimdallr.configuration.heimdallr_config import (
     CALENDAR_ID,
@@ -18,18 +19,51 @@ from heimdallr.configuration.heimdallr_config import (
     DU_INTERVAL_ID,
     DU_INTERVAL_MS,
     DU_TABLES_ID,
+    DU_TABLE_IDS,
+    DU_VERSION_ID,
     GPU_GRAPHS_ID,
+    GPU_GRAPHS_SIGNATURE_ID,
+    GPU_HISTORY_TABLE_ID,
     GPU_INTERVAL_ID,
     GPU_INTERVAL_MS,
     GPU_TABLES_ID,
+    GPU_TABLE_ID,
+    PUSH_STATUS_ID,
+    TABLE_PAGE_SIZE,
     TEAMS_STATUS_ID,
     TEAMS_STATUS_INTERVAL_ID,
     TEAMS_STATUS_INTERVAL_MS,
+    TELEMETRY_VERSION_ID,
 )
 
 __all__ = ["get_body"]
 
 
+def backend_table(table_id: str) -> DataTable:
+    """A table paged, sorted and filtered by the server, which only sends the rows of the current page"""
+    return DataTable(
+        id=table_id,
+        columns=[],
+        data=[],
+        page_current=0,
+        page_size=TABLE_PAGE_SIZE,
+        page_action="custom",
+        sort_action="custom",
+        sort_mode="multi",
+        sort_by=[],
+        filter_action="custom",
+        filter_query="",
+        # style_as_list_view=True,
+        style_data_conditional=[
+            {"if": {"row_index": "odd"}, "backgroundColor": "rgb(248, 248, 248)"}
+        ],
+        style_header={
+            "backgroundColor": "rgb(230, 230, 230)",
+            "fontWeight": "bold",
+        },
+    )
+
+
 def get_body() -> List[html.Div]:
     """description"""
     return [
@@ -46,10 +80,19 @@ def get_body() -> List[html.Div]:
                     ],
                     className="col p-2",
                 ),
-                html.Div([html.Div([], id=GPU_GRAPHS_ID)], className="col"),
                 html.Div(
                     [
-                        html.Div([], id=GPU_TABLES_ID),
+                        html.Div([], id=GPU_GRAPHS_ID),
+                        dcc.Store(
+                            id=GPU_GRAPHS_SIGNATURE_ID
+                        ),  # Machines and devices shown
+                    ],
+                    className="col",
+                ),
+                html.Div(
+                    [
+                        html.Div([backend_table(GPU_TABLE_ID)], id=GPU_TABLES_ID),
+                        backend_table(GPU_HISTORY_TABLE_ID),
                     ],
                     className="col p-2",
                 ),
@@ -58,7 +101,9 @@ def get_body() -> List[html.Div]:
                 ),
                 html.Div(  # Disk Usage
                     [
-                        html.Div([], id=DU_TABLES_ID),
+                        html.Div(
+                            [backend_table(i) for i in DU_TABLE_IDS], id=DU_TABLES_ID
+                        ),
                         dcc.Interval(
                             id=DU_INTERVAL_ID, interval=DU_INTERVAL_MS, n_intervals=0
                         ),
@@ -79,4 +124,7 @@ def get_body() -> List[html.Div]:
             ],
             className="row p-1",
         ),
+        dcc.Store(id=TELEMETRY_VERSION_ID),  # Set by the push stream, assets/push.js
+        dcc.Store(id=DU_VERSION_ID),
+        dcc.Store(id=PUSH_STATUS_ID, data="polling"),
     ]
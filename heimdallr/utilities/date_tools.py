@@ -8,8 +8,9 @@ __doc__ = r"""
            """
 
 import datetime
+from typing import Optional, Sequence
 
-__all__ = ["timestamp_to_datetime", "iso_dt_to_datetime"]
+__all__ = ["timestamp_to_datetime", "timestamps_to_datetimes", "iso_dt_to_datetime"]
 
 from warg import default_datetime_repr
 
@@ -19,6 +20,37 @@ def timestamp_to_datetime(t: int) -> str:
     return default_datetime_repr(datetime.datetime.fromtimestamp(t))
 
 
+def timestamps_to_datetimes(t: Sequence[Optional[float]]) -> Sequence[Optional[str]]:
+    """
+    Vectorised timestamp_to_datetime, formatting a whole column at once.
+
+    Rounds to microseconds like datetime.fromtimestamp and converts to local time with the zone rules of the
+    system timezone, so the strings are identical to those of timestamp_to_datetime. Missing timestamps, None
+    or nan, e.g. create_time of publishers not sending it, are None. pandas is only imported here as it is only
+    required by the server.
+    """
+    import numpy
+    import pandas
+    from dateutil.tz import gettz
+
+    t = numpy.asarray(t, dtype=float)
+    finite = numpy.isfinite(t)
+    out = numpy.full(t.shape, None, dtype=object)
+    if not finite.any():  # numpy.char.replace fails on empty arrays
+        return out
+    frac, secs = numpy.modf(t[finite])
+    us = secs.astype("int64") * 1_000_000 + numpy.round(frac * 1e6).astype("int64")
+    local = (
+        pandas.to_datetime(us, unit="us", utc=True)
+        .tz_convert(gettz())
+        .tz_localize(None)
+        .to_numpy()
+        .astype("datetime64[us]")
+    )
+    out[finite] = numpy.char.replace(numpy.datetime_as_string(local), "T", "_")
+    return out
+
+
 def iso_dt_to_datetime(t: str) -> str:
     """description"""
     return default_datetime_repr(datetime.datetime.fromisoformat(t[:-1]))
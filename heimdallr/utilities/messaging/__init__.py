@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Encoding of the telemetry messages exchanged between publishers and the server.
+           """
+
+from .codecs import *
+from .delta_encoding import *
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Wire codecs for publisher to server telemetry.
+
+           JSON payloads are sent as is and always start with "{". Every other codec prefixes its payload with a
+           version byte, so the server can decode any payload regardless of what the publisher was configured with.
+
+           The compact codec is a self-describing tagged binary encoding of the JSON data model, versioned by its
+           key table, with
+           - strings interned per message, the first occurrence is sent inline and later ones as a table index,
+             the table is seeded with the known telemetry keys of the version so those are never sent inline
+           - integers (e.g. bytes of memory) as zigzag varints
+           - floats under percentage keys as float32, other floats as float64
+           """
+
+import json
+import struct
+from typing import Any, Dict, List, Tuple
+
+__all__ = [
+    "Codec",
+    "JsonCodec",
+    "CompactCodec",
+    "CODECS",
+    "get_codec",
+    "decode_payload",
+]
+
+COMPACT_VERSION = 2
+
+KEY_TABLE_V1 = (  # Never changed, inline strings are numbered after the table
+    "gpu_stats",
+    "du_stats",
+    "driver_version",
+    "devices",
+    "id",
+    "name",
+    "uuid",
+    "pci_bus_id",
+    "free",
+    "used",
+    "total",
+    "gpu_utilization",
+    "memory_utilization",
+    "processes",
+    "used_gpu_mem",
+    "device_idx",
+    "username",
+    "memory_percent",
+    "cpu_percent",
+    "cmdline",
+    "device_name",
+    "create_time",
+    "status",
+    "pid",
+    "kind",
+    "seq",
+    "patch",
+    "set",
+    "drop",
+    "keyframe",
+    "delta",
+    "partitions",
+    "mountpoint",
+    "fstype",
+    "device",
+    "percent",
+)
+
+KEY_TABLES = {  # Version -> key table, a changed table needs a new version
+    1: KEY_TABLE_V1,
+    2: KEY_TABLE_V1
+    + (
+        "gpu_utilization_p50",
+        "gpu_utilization_p95",
+        "gpu_utilization_max",
+        "memory_utilization_p50",
+        "memory_utilization_p95",
+        "memory_utilization_max",
+    ),
+}
+KEY_TABLE = KEY_TABLES[COMPACT_VERSION]
+
+FLOAT32_KEYS = frozenset(
+    (
+        "memory_percent",
+        "cpu_percent",
+        "gpu_utilization",
+        "memory_utilization",
+        "percent",
+        "gpu_utilization_p50",
+        "gpu_utilization_p95",
+        "gpu_utilization_max",
+        "memory_utilization_p50",
+        "memory_utilization_p95",
+        "memory_utilization_max",
+    )
+)
+
+(
+    NONE_TAG,
+    FALSE_TAG,
+    TRUE_TAG,
+    INT_TAG,
+    FLOAT32_TAG,
+    FLOAT64_TAG,
+    STR_TAG,
+    STR_REF_TAG,
+    LIST_TAG,
+    DICT_TAG,
+) = range(10)
+
+FLOAT32 = struct.Struct("<f")
+FLOAT64 = struct.Struct("<d")
+
+
+class Codec:
+    """Encodes payloads to and decodes payloads from the bytes sent over mqtt"""
+
+    name = None
+
+    def encode(self, payload: Any) -> bytes:
+        """description"""
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> Any:
+        """description"""
+        raise NotImplementedError
+
+
+class JsonCodec(Codec):
+    """Plain JSON, readable by every server version"""
+
+    name = "json"
+
+    def encode(self, payload: Any) -> bytes:
+        """description"""
+        return json.dumps(payload).encode()
+
+    def decode(self, data: bytes) -> Any:
+        """description"""
+        return json.loads(data)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class _CompactWriter:
+    def __init__(self):
+        self.out = bytearray((COMPACT_VERSION,))
+        self.strings: Dict[str, int] = {s: i for i, s in enumerate(KEY_TABLE)}
+
+    def write_str(self, value: str) -> None:
+        """Inline on first occurrence, a table reference afterwards"""
+        out = self.out
+        index = self.strings.get(value)
+        if index is not None:
+            out.append(STR_REF_TAG)
+            _write_varint(out, index)
+            return
+        self.strings[value] = len(self.strings)
+        encoded = value.encode()
+        out.append(STR_TAG)
+        _write_varint(out, len(encoded))
+        out += encoded
+
+    def write(self, value: Any, float32: bool = False) -> None:
+        """float32 is set for values under percentage keys"""
+        out = self.out
+        if value is None:
+            out.append(NONE_TAG)
+        elif value is True:
+            out.append(TRUE_TAG)
+        elif value is False:
+            out.append(FALSE_TAG)
+        elif isinstance(value, int):
+            out.append(INT_TAG)
+            _write_varint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+        elif isinstance(value, float):
+            if float32:
+                out.append(FLOAT32_TAG)
+                out += FLOAT32.pack(value)
+            else:
+                out.append(FLOAT64_TAG)
+                out += FLOAT64.pack(value)
+        elif isinstance(value, str):
+            self.write_str(value)
+        elif isinstance(value, dict):
+            out.append(DICT_TAG)
+            _write_varint(out, len(value))
+            for k, v in value.items():
+                k = str(k)  # As json.dumps would
+                self.write_str(k)
+                self.write(v, k in FLOAT32_KEYS)
+        elif isinstance(value, (list, tuple)):
+            out.append(LIST_TAG)
+            _write_varint(out, len(value))
+            for v in value:
+                self.write(v)
+        else:
+            raise TypeError(f"Object of type {type(value).__name__} is not encodable")
+
+
+class _CompactReader:
+    def __init__(self, data: bytes):
+        if data[0] not in KEY_TABLES:
+            raise ValueError(f"Unsupported compact payload version {data[0]}")
+        self.data = data
+        self.pos = 1
+        self.strings: List[str] = list(KEY_TABLES[data[0]])
+
+    def read(self) -> Any:
+        """description"""
+        data = self.data
+        tag = data[self.pos]
+        self.pos += 1
+        if tag == STR_REF_TAG:
+            index, self.pos = _read_varint(data, self.pos)
+            return self.strings[index]
+        if tag == INT_TAG:
+            value, self.pos = _read_varint(data, self.pos)
+            return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+        if tag == DICT_TAG:
+            n, self.pos = _read_varint(data, self.pos)
+            read = self.read
+            out = {}
+            for _ in range(n):  # Not a comprehension, key first is only 3.8+
+                k = read()
+                out[k] = read()
+            return out
+        if tag == LIST_TAG:
+            n, self.pos = _read_varint(data, self.pos)
+            return [self.read() for _ in range(n)]
+        if tag == STR_TAG:
+            n, pos = _read_varint(data, self.pos)
+            self.pos = pos + n
+            if self.pos > len(data):  # Slicing would not raise
+                raise ValueError(f"Truncated string at offset {pos}")
+            value = data[pos : self.pos].decode()
+            self.strings.append(value)
+            return value
+        if tag == FLOAT32_TAG:
+            (value,) = FLOAT32.unpack_from(data, self.pos)
+            self.pos += 4
+            return value
+        if tag == FLOAT64_TAG:
+            (value,) = FLOAT64.unpack_from(data, self.pos)
+            self.pos += 8
+            return value
+        if tag == NONE_TAG:
+            return None
+        if tag == TRUE_TAG:
+            return True
+        if tag == FALSE_TAG:
+            return False
+        raise ValueError(f"Unknown tag {tag} at offset {self.pos - 1}")
+
+
+class CompactCodec(Codec):
+    """Compact binary encoding, see module docstring"""
+
+    name = "compact"
+
+    def encode(self, payload: Any) -> bytes:
+        """description"""
+        writer = _CompactWriter()
+        writer.write(payload)
+        return bytes(writer.out)
+
+    def decode(self, data: bytes) -> Any:
+        """Raises ValueError on truncated or corrupt data"""
+        try:
+            return _CompactReader(data).read()
+        except (IndexError, struct.error) as e:
+            raise ValueError(f"Corrupt compact payload: {e}") from e
+
+
+CODECS = {codec.name: codec for codec in (JsonCodec(), CompactCodec())}
+VERSIONED_CODECS = {version: CODECS["compact"] for version in KEY_TABLES}
+
+
+def get_codec(name: str) -> Codec:
+    """The codec named name, e.g. MQTT_CODEC"""
+    try:
+        return CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unknown codec {name}, choose from {list(CODECS)}")
+
+
+def decode_payload(data: bytes) -> Any:
+    """Decode a payload of any codec, JSON is recognised by its leading "{" and the others by their version byte"""
+    if not data:
+        raise ValueError("Empty payload")
+    codec = VERSIONED_CODECS.get(data[0], CODECS["json"])
+    return codec.decode(data)
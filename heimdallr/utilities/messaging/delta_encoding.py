@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Delta encoding of host telemetry with periodic keyframes.
+
+           A keyframe is the full host payload, {"gpu_stats": ..., "du_stats": ...}, tagged with
+           "kind": "keyframe" and a sequence number, so servers that predate delta encoding can still read it.
+           In between keyframes only a patch against the previously published state is sent. Patches are
+           computed on an indexed form of the payload where devices are keyed by uuid and processes by pid, see
+           index_processes.
+           """
+
+from typing import Dict, Iterable, Mapping, MutableMapping, Optional
+
+__all__ = [
+    "diff",
+    "apply_patch",
+    "index_processes",
+    "index_host_stats",
+    "deindex_host_stats",
+    "DeltaEncoder",
+    "DeltaDecoder",
+    "KEYFRAME_KIND",
+    "DELTA_KIND",
+]
+
+KEYFRAME_KIND = "keyframe"
+DELTA_KIND = "delta"
+
+
+def diff(old: Mapping, new: Mapping) -> Dict:
+    """
+    Patch that turns old into new.
+
+    Args:
+      old: The previous mapping
+      new: The current mapping
+
+    Returns:
+      A dict with the optional keys "set" (new or replaced values), "patch" (patches of nested mappings) and
+      "drop" (removed keys), empty if old equals new
+    """
+    replaced = {}
+    patched = {}
+    for k, v in new.items():
+        if k not in old:
+            replaced[k] = v
+            continue
+        o = old[k]
+        if isinstance(v, Mapping) and isinstance(o, Mapping):
+            sub_patch = diff(o, v)
+            if sub_patch:
+                patched[k] = sub_patch
+        elif o != v:
+            replaced[k] = v
+    dropped = [k for k in old if k not in new]
+
+    patch = {}
+    if replaced:
+        patch["set"] = replaced
+    if patched:
+        patch["patch"] = patched
+    if dropped:
+        patch["drop"] = dropped
+    return patch
+
+
+def apply_patch(state: Mapping, patch: Mapping) -> Dict:
+    """
+    Apply a patch produced by `diff`, without mutating state.
+
+    Unchanged nested mappings are shared between state and the returned dict.
+
+    Args:
+      state: The mapping to patch
+      patch: The patch
+
+    Returns:
+      The patched mapping
+    """
+    out = dict(state)
+    for k in patch.get("drop", ()):
+        out.pop(k, None)
+    out.update(patch.get("set", {}))
+    for k, sub_patch in patch.get("patch", {}).items():
+        out[k] = apply_patch(out.get(k, {}), sub_patch)
+    return out
+
+
+def device_key(device: Mapping) -> str:
+    """Devices are keyed by uuid, falling back to the device index for publishers that do not report it"""
+    return str(device.get("uuid", device["id"]))
+
+
+def index_processes(processes: Iterable[Mapping]) -> Dict:
+    """
+    Processes keyed by pid, a pid listed again on the same device (e.g. as both a compute and a graphics
+    process) is keyed by its pid and occurrence, "pid#1", "pid#2", ...
+    """
+    indexed = {}
+    occurrences = {}
+    for p in processes:
+        key = str(p["pid"])
+        n = occurrences.get(key, 0)
+        occurrences[key] = n + 1
+        indexed[f"{key}#{n}" if n else key] = p
+    return indexed
+
+
+def index_host_stats(host_stats: Mapping) -> Dict:
+    """Host payload with the device list keyed by device uuid and the process lists keyed by `index_processes`"""
+    indexed = dict(host_stats)
+    gpu_stats = host_stats.get("gpu_stats")
+    if gpu_stats is not None:
+        indexed["gpu_stats"] = {
+            **gpu_stats,
+            "devices": {
+                device_key(device): {
+                    **device,
+                    "processes": index_processes(device["processes"]),
+                }
+                for device in gpu_stats["devices"]
+            },
+        }
+    return indexed
+
+
+def deindex_host_stats(indexed: Mapping) -> Dict:
+    """Inverse of `index_host_stats`, devices are ordered by device index"""
+    host_stats = dict(indexed)
+    gpu_stats = indexed.get("gpu_stats")
+    if gpu_stats is not None:
+        host_stats["gpu_stats"] = {
+            **gpu_stats,
+            "devices": sorted(
+                (
+                    {**device, "processes": list(device["processes"].values())}
+                    for device in gpu_stats["devices"].values()
+                ),
+                key=lambda device: device["id"],
+            ),
+        }
+    return host_stats
+
+
+class DeltaEncoder:
+    """
+    Publisher side, turns full payloads into a keyframe every `keyframe_interval` messages and deltas in between
+    """
+
+    def __init__(self, keyframe_interval: int = 15):
+        """
+
+        Args:
+          keyframe_interval: Number of messages between keyframes, including the keyframe
+        """
+        self.keyframe_interval = keyframe_interval
+        self._seq = -1
+        self._previous: Dict[str, Dict] = {}
+
+    def encode(self, payload: Mapping) -> Dict:
+        """
+        Args:
+          payload: The full payload, {hostname: {"gpu_stats": ..., "du_stats": ...}}
+
+        Returns:
+          The message to publish
+        """
+        self._seq += 1
+        keyframe = self._seq % self.keyframe_interval == 0
+        message = {}
+        for host, host_stats in payload.items():
+            indexed = index_host_stats(host_stats)
+            if keyframe or host not in self._previous:
+                message[host] = {**host_stats, "kind": KEYFRAME_KIND, "seq": self._seq}
+            else:
+                message[host] = {
+                    "kind": DELTA_KIND,
+                    "seq": self._seq,
+                    "patch": diff(self._previous[host], indexed),
+                }
+            self._previous[host] = indexed
+        return message
+
+
+class DeltaDecoder:
+    """
+    Server side, reconstructs full host payloads from keyframes and deltas.
+
+    A delta is only applied when it directly follows the last applied message of its host, after a lost message
+    the host is skipped until its next keyframe."""
+
+    def __init__(self):
+        self._states: MutableMapping[str, Dict] = {}
+        self._seqs: MutableMapping[str, int] = {}
+
+    def forget(self, host: str) -> None:
+        """Drop the state of host"""
+        self._states.pop(host, None)
+        self._seqs.pop(host, None)
+
+    def decode(self, host: str, message: Mapping) -> Optional[Dict]:
+        """
+        Args:
+          host: The publishing host
+          message: A keyframe or delta message of host
+
+        Returns:
+          The full host payload, or None if the message could not be applied
+        """
+        kind = message["kind"]
+        seq = message["seq"]
+        if kind == KEYFRAME_KIND:
+            host_stats = {k: v for k, v in message.items() if k not in ("kind", "seq")}
+            self._states[host] = index_host_stats(host_stats)
+            self._seqs[host] = seq
+            return host_stats
+
+        if kind != DELTA_KIND or self._seqs.get(host) != seq - 1:
+            self.forget(host)
+            return None
+
+        self._states[host] = apply_patch(self._states[host], message["patch"])
+        self._seqs[host] = seq
+        return deindex_host_stats(self._states[host])
@@ -415,8 +415,10 @@ def get_func_pointer(name):
     """description"""
     global nvml_lib
 
-    if name in _func_pointer_cache:
+    try:  # lock-free fast path
         return _func_pointer_cache[name]
+    except KeyError:
+        pass
 
     lib_load_lock.acquire()
     try:
@@ -433,6 +435,52 @@ def get_func_pointer(name):
         lib_load_lock.release()
 
 
+class FunctionTable(object):
+    """
+    NVML function pointers as attributes, resolved through get_func_pointer on first access. A resolved function
+    is a plain instance attribute, so the wrappers on the collection hot path call it without a string lookup,
+    a function call or locking.
+    """
+
+    def __getattr__(self, name):
+        # only called for functions that are not resolved yet
+        if name.startswith("_"):
+            raise AttributeError(name)
+        fn = get_func_pointer(name)
+        setattr(self, name, fn)
+        return fn
+
+    def resolve(self, names):
+        """Resolve names ahead of use, functions missing from the driver raise when called instead"""
+        for name in names:
+            try:
+                getattr(self, name)
+            except NVMLError:
+                pass
+
+    def clear(self):
+        """Forget the resolved functions, e.g. when another library is loaded"""
+        self.__dict__.clear()
+
+
+nvml_functions = FunctionTable()
+
+# Called for every device on every collection, resolved once at nvmlInit
+HOT_PATH_FUNCTIONS = (
+    "nvmlSystemGetDriverVersion",
+    "nvmlDeviceGetCount_v2",
+    "nvmlDeviceGetHandleByIndex_v2",
+    "nvmlDeviceGetName",
+    "nvmlDeviceGetUUID",
+    "nvmlDeviceGetPciInfo_v2",
+    "nvmlDeviceGetMemoryInfo",
+    "nvmlDeviceGetUtilizationRates",
+    "nvmlDeviceGetComputeRunningProcesses",
+    "nvmlDeviceGetGraphicsRunningProcesses",
+    "nvmlDeviceGetSamples",
+)
+
+
 ## Alternative object
 # Allows the object to be printed
 # Allows mismatched types to be assigned
@@ -829,6 +877,7 @@ def nvmlInit():
     fn = get_func_pointer("nvmlInit_v2")
     ret = fn()
     check_return(ret)
+    nvml_functions.resolve(HOT_PATH_FUNCTIONS)
 
     # Atomically update refcount
     global nvml_lib_refcount
@@ -897,9 +946,11 @@ def nvmlSystemGetProcessName(pid):
 def nvmlSystemGetDriverVersion():
     """description"""
     c_version = create_string_buffer(NVML_SYSTEM_DRIVER_VERSION_BUFFER_SIZE)
-    fn = get_func_pointer("nvmlSystemGetDriverVersion")
-    ret = fn(c_version, c_uint(NVML_SYSTEM_DRIVER_VERSION_BUFFER_SIZE))
-    check_return(ret)
+    ret = nvml_functions.nvmlSystemGetDriverVersion(
+        c_version, c_uint(NVML_SYSTEM_DRIVER_VERSION_BUFFER_SIZE)
+    )
+    if ret != NVML_SUCCESS:
+        raise NVMLError(ret)
     return c_version.value
 
 
@@ -1021,9 +1072,9 @@ def nvmlUnitGetDevices(unit):
 def nvmlDeviceGetCount():
     """description"""
     c_count = c_uint()
-    fn = get_func_pointer("nvmlDeviceGetCount_v2")
-    ret = fn(byref(c_count))
-    check_return(ret)
+    ret = nvml_functions.nvmlDeviceGetCount_v2(byref(c_count))
+    if ret != NVML_SUCCESS:
+        raise NVMLError(ret)
     return c_count.value
 
 
@@ -1031,9 +1082,9 @@ def nvmlDeviceGetHandleByIndex(index):
     """description"""
     c_index = c_uint(index)
     device = c_nvmlDevice_t()
-    fn = get_func_pointer("nvmlDeviceGetHandleByIndex_v2")
-    ret = fn(c_index, byref(device))
-    check_return(ret)
+    ret = nvml_functions.nvmlDeviceGetHandleByIndex_v2(c_index, byref(device))
+    if ret != NVML_SUCCESS:
+        raise NVMLError(ret)
     return device
 
 
@@ -1070,9 +1121,11 @@ def nvmlDeviceGetHandleByPciBusId(pciBusId):
 def nvmlDeviceGetName(handle):
     """description"""
     c_name = create_string_buffer(NVML_DEVICE_NAME_BUFFER_SIZE)
-    fn = get_func_pointer("nvmlDeviceGetName")
-    ret = fn(handle, c_name, c_uint(NVML_DEVICE_NAME_BUFFER_SIZE))
-    check_return(ret)
+    ret = nvml_functions.nvmlDeviceGetName(
+        handle, c_name, c_uint(NVML_DEVICE_NAME_BUFFER_SIZE)
+    )
+    if ret != NVML_SUCCESS:
+        raise NVMLError(ret)
     return c_name.value
 
 
@@ -1150,9 +1203,11 @@ def nvmlDeviceGetMinorNumber(handle):
 def nvmlDeviceGetUUID(handle):
     """description"""
     c_uuid = create_string_buffer(NVML_DEVICE_UUID_BUFFER_SIZE)
-    fn = get_func_pointer("nvmlDeviceGetUUID")
-    ret = fn(handle, c_uuid, c_uint(NVML_DEVICE_UUID_BUFFER_SIZE))
-    check_return(ret)
+    ret = nvml_functions.nvmlDeviceGetUUID(
+        handle, c_uuid, c_uint(NVML_DEVICE_UUID_BUFFER_SIZE)
+    )
+    if ret != NVML_SUCCESS:
+        raise NVMLError(ret)
     return c_uuid.value
 
 
@@ -1229,9 +1284,9 @@ def nvmlDeviceGetPersistenceMode(handle):
 def nvmlDeviceGetPciInfo(handle):
     """description"""
     c_info = nvmlPciInfo_t()
-    fn = get_func_pointer("nvmlDeviceGetPciInfo_v2")
-    ret = fn(handle, byref(c_info))
-    check_return(ret)
+    ret = nvml_functions.nvmlDeviceGetPciInfo_v2(handle, byref(c_info))
+    if ret != NVML_SUCCESS:
+        raise NVMLError(ret)
     return c_info
 
 
@@ -1484,9 +1539,9 @@ def nvmlDeviceGetMemoryInfo(handle):
 
     """
     c_memory = c_nvmlMemory_t()
-    fn = get_func_pointer("nvmlDeviceGetMemoryInfo")
-    ret = fn(handle, byref(c_memory))
-    check_return(ret)
+    ret = nvml_functions.nvmlDeviceGetMemoryInfo(handle, byref(c_memory))
+    if ret != NVML_SUCCESS:
+        raise NVMLError(ret)
     return c_memory
 
 
@@ -1578,9 +1633,9 @@ def nvmlDeviceGetMemoryErrorCounter(handle, errorType, counterType, locationType
 def nvmlDeviceGetUtilizationRates(handle):
     """description"""
     c_util = c_nvmlUtilization_t()
-    fn = get_func_pointer("nvmlDeviceGetUtilizationRates")
-    ret = fn(handle, byref(c_util))
-    check_return(ret)
+    ret = nvml_functions.nvmlDeviceGetUtilizationRates(handle, byref(c_util))
+    if ret != NVML_SUCCESS:
+        raise NVMLError(ret)
     return c_util
 
 
@@ -1650,7 +1705,7 @@ def nvmlDeviceGetComputeRunningProcesses(handle):
     """description"""
     # first call to get the size
     c_count = c_uint(0)
-    fn = get_func_pointer("nvmlDeviceGetComputeRunningProcesses")
+    fn = nvml_functions.nvmlDeviceGetComputeRunningProcesses
     ret = fn(handle, byref(c_count), None)
 
     if ret == NVML_SUCCESS:
@@ -1686,7 +1741,7 @@ def nvmlDeviceGetGraphicsRunningProcesses(handle):
     """description"""
     # first call to get the size
     c_count = c_uint(0)
-    fn = get_func_pointer("nvmlDeviceGetGraphicsRunningProcesses")
+    fn = nvml_functions.nvmlDeviceGetGraphicsRunningProcesses
     ret = fn(handle, byref(c_count), None)
 
     if ret == NVML_SUCCESS:
@@ -2083,7 +2138,7 @@ def nvmlDeviceGetSamples(device, sampling_type, timeStamp):
     c_time_stamp = c_ulonglong(timeStamp)
     c_sample_count = c_uint(0)
     c_sample_value_type = _nvmlValueType_t()
-    fn = get_func_pointer("nvmlDeviceGetSamples")
+    fn = nvml_functions.nvmlDeviceGetSamples
 
     ## First Call gets the size
     ret = fn(
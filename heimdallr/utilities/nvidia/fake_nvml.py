@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           A simulated stand-in for libnvidia-ml.so.1, for testing and benchmarking the collection on machines
+           without gpus.
+           """
+
+import collections
+import contextlib
+import functools
+import random
+import threading
+from ctypes import POINTER, c_void_p, cast, pointer
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import psutil
+
+from heimdallr.utilities.nvidia import bindings
+from heimdallr.utilities.nvidia.bindings import (
+    NVML_BRAND_TESLA,
+    NVML_ERROR_INSUFFICIENT_SIZE,
+    NVML_ERROR_INVALID_ARGUMENT,
+    NVML_ERROR_NOT_FOUND,
+    NVML_ERROR_NOT_SUPPORTED,
+    NVML_ERROR_TIMEOUT,
+    NVML_GPU_UTILIZATION_SAMPLES,
+    NVML_MEMORY_UTILIZATION_SAMPLES,
+    NVML_ERROR_UNINITIALIZED,
+    NVML_ERROR_UNKNOWN,
+    NVML_SUCCESS,
+    NVML_VALUE_TYPE_UNSIGNED_INT,
+    c_nvmlDevice_t,
+    nvmlEventTypeAll,
+)
+
+__all__ = ["FakeDevice", "FakeNvml", "use_nvml_lib"]
+
+MB = 1 << 20
+SAMPLE_BUFFER_SIZE = 120  # Samples the driver keeps per sampling type
+
+
+class FakeDevice:
+    """The simulated state of one device, its processes are pid -> used gpu memory in bytes"""
+
+    def __init__(
+        self,
+        index: int,
+        name: str,
+        total_memory: int,
+        processes: Dict[int, int],
+        reserved_memory: int = 300 * MB,
+    ):
+        self.index = index
+        self.name = name
+        self.uuid = f"GPU-{index:08x}-fake-4e1d-8b5a-{index:012x}"
+        self.serial = f"{1320000000000 + index}"
+        self.pci_bus_id = f"00000000:{index + 1:02X}:00.0"
+        self.total_memory = total_memory
+        self.reserved_memory = reserved_memory
+        self.processes = processes
+        self.gpu_utilization = 0
+        self.memory_utilization = 0
+        self.temperature = 35
+        self.power_usage = 60000  # mW
+        self.power_limit = 300000  # mW
+        self.clock = 1410  # MHz
+        self.samples = {  # Sampling type -> (timestamp us, value)
+            NVML_GPU_UTILIZATION_SAMPLES: collections.deque(maxlen=SAMPLE_BUFFER_SIZE),
+            NVML_MEMORY_UTILIZATION_SAMPLES: collections.deque(
+                maxlen=SAMPLE_BUFFER_SIZE
+            ),
+        }
+
+    @property
+    def used_memory(self) -> int:
+        return min(
+            self.total_memory, self.reserved_memory + sum(self.processes.values())
+        )
+
+
+def simulated(fn):
+    """Counts calls of the nvml function and returns injected errors in place of calling it"""
+    name = fn.__name__
+
+    @functools.wraps(fn)
+    def call(self, *args):
+        self.calls[name] += 1
+        code = self._fault(name)
+        if code != NVML_SUCCESS:
+            return code
+        return fn(self, *args)
+
+    return call
+
+
+def _set_handle(device_ref, index: int) -> None:
+    cast(pointer(device_ref._obj), POINTER(c_void_p))[0] = index + 1
+
+
+def _set_string(buffer, length, value: str) -> int:
+    encoded = value.encode()
+    if len(encoded) >= length.value:
+        return NVML_ERROR_INSUFFICIENT_SIZE
+    buffer.value = encoded
+    return NVML_SUCCESS
+
+
+class FakeNvml:
+    """
+    A ctypes compatible double of libnvidia-ml.so.1, to be injected into bindings.nvml_lib with use_nvml_lib.
+
+    The nvml functions are methods taking the same ctypes arguments as the library, writing through the
+    pointers they are passed and returning nvmlReturn_t codes, so everything from the bindings to get_nv_info
+    and NvidiaSMI.DeviceQuery runs unchanged on top of it. Functions that are not simulated return
+    NVML_ERROR_NOT_SUPPORTED, like a real driver on a device lacking the feature.
+
+    The devices change when `step` is called, processes start and exit and their memory use drifts. Errors are
+    injected either deterministically with `fail` or randomly with `error_rate`.
+    """
+
+    def __init__(
+        self,
+        device_count: int = 8,
+        processes_per_device: int = 4,
+        memory_churn: float = 0.05,
+        process_turnover: float = 0.1,
+        samples_per_step: int = 12,
+        error_rate: float = 0.0,
+        error_code: int = NVML_ERROR_UNKNOWN,
+        pids: Optional[Sequence[int]] = None,
+        name: str = "NVIDIA A100-SXM4-80GB",
+        total_memory: int = 80 << 30,
+        driver_version: str = "535.104.05",
+        seed: Optional[int] = 0,
+        supported_event_types: int = nvmlEventTypeAll,
+    ):
+        """
+
+        Args:
+          device_count: Number of simulated devices
+          processes_per_device: Mean number of processes on each device
+          memory_churn: Maximum relative change of the memory use of a process per step
+          process_turnover: Probability per step that a process exits and another one starts
+          samples_per_step: Utilisation samples buffered per step, the driver samples every 1/6 s or faster
+          error_rate: Probability that a call fails with error_code
+          error_code: The nvmlReturn_t of random failures
+          pids: Pool of process ids of the simulated gpu processes, real pids let the psutil sampling of the
+          publisher run as on a gpu host, defaults to the pids of this machine
+          name: Product name of the devices
+          total_memory: Memory of each device in bytes
+          driver_version: Reported driver version
+          seed: Seed of the simulation, None for a random one
+          supported_event_types: Bit mask of the nvmlEventType* the devices support
+        """
+        self.memory_churn = memory_churn
+        self.process_turnover = process_turnover
+        self.samples_per_step = samples_per_step
+        self.sample_period_us = 166667
+        self._clock_us = 0
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.driver_version = driver_version
+        self.pids = list(psutil.pids() if pids is None else pids)
+        self.calls = collections.Counter()
+        self.initialized = 0
+        self._faults: Dict[str, List[int]] = {}
+        self._rng = random.Random(seed)
+        self.supported_event_types = supported_event_types
+        self.registered_events: Dict[int, int] = {}  # Device index -> event types
+        self._events = collections.deque()
+        self._events_changed = threading.Condition()
+        # A function rather than a method, the bindings declare its restype
+        self.nvmlErrorString = lambda result: f"Simulated error {result}".encode()
+        self.devices = [
+            FakeDevice(
+                i,
+                name,
+                total_memory,
+                {
+                    pid: self._process_memory(total_memory, processes_per_device)
+                    for pid in self._rng.sample(
+                        self.pids, min(processes_per_device, len(self.pids))
+                    )
+                },
+            )
+            for i in range(device_count)
+        ]
+        for device in self.devices:
+            self._sample_device(device)
+        self._clock_us += self.samples_per_step * self.sample_period_us
+
+    def _process_memory(self, total_memory: int, processes_per_device: int) -> int:
+        return int(
+            self._rng.uniform(0.05, 0.8) * total_memory / max(processes_per_device, 1)
+        )
+
+    def _sample_device(self, device: FakeDevice) -> None:
+        busy = bool(device.processes)
+        for i in range(self.samples_per_step):  # Mostly moderate with short bursts
+            t = self._clock_us + (i + 1) * self.sample_period_us
+            gpu = 0
+            if busy:
+                gpu = 100 if self._rng.random() < 0.1 else self._rng.randint(20, 70)
+            device.samples[NVML_GPU_UTILIZATION_SAMPLES].append((t, gpu))
+            device.samples[NVML_MEMORY_UTILIZATION_SAMPLES].append((t, gpu // 3))
+        device.gpu_utilization = self._rng.randint(20, 70) if busy else 0
+        device.memory_utilization = device.gpu_utilization // 3
+        device.temperature = 35 + device.gpu_utilization // 3
+        device.power_usage = 60000 + 2400 * device.gpu_utilization
+        device.clock = 1410 if busy else 210
+
+    def step(self) -> None:
+        """Advance the simulation, processes start, exit and change their memory use"""
+        for device in self.devices:
+            processes_per_device = max(len(device.processes), 1)
+            for pid, used in list(device.processes.items()):
+                if self._rng.random() < self.process_turnover:
+                    del device.processes[pid]
+                    free = [p for p in self.pids if p not in device.processes]
+                    if free:
+                        device.processes[self._rng.choice(free)] = self._process_memory(
+                            device.total_memory, processes_per_device
+                        )
+                else:
+                    change = self._rng.uniform(-self.memory_churn, self.memory_churn)
+                    device.processes[pid] = max(MB, int(used * (1 + change)))
+            self._sample_device(device)
+        self._clock_us += self.samples_per_step * self.sample_period_us
+
+    def emit(self, device_index: int, event_type: int, event_data: int = 0) -> bool:
+        """Raise an event on a device, returns whether the device is registered for the event type"""
+        if not self.registered_events.get(device_index, 0) & event_type:
+            return False
+        with self._events_changed:
+            self._events.append((device_index, event_type, event_data))
+            self._events_changed.notify_all()
+        return True
+
+    def fail(
+        self, function: str, code: int = NVML_ERROR_UNKNOWN, times: int = 1
+    ) -> None:
+        """Make the next `times` calls of the nvml function return code"""
+        self._faults.setdefault(function, []).extend([code] * times)
+
+    def _fault(self, name: str) -> int:
+        faults = self._faults.get(name)
+        if faults:
+            return faults.pop(0)
+        if not self.initialized and name != "nvmlInit_v2":
+            return NVML_ERROR_UNINITIALIZED
+        if self.error_rate and self._rng.random() < self.error_rate:
+            return self.error_code
+        return NVML_SUCCESS
+
+    def _device(self, handle) -> FakeDevice:
+        return self.devices[cast(handle, c_void_p).value - 1]
+
+    def __getattr__(self, name: str):
+        if not name.startswith("nvml"):
+            raise AttributeError(name)
+
+        def not_supported(*args):
+            self.calls[name] += 1
+            return NVML_ERROR_NOT_SUPPORTED
+
+        return not_supported
+
+    ## Library
+
+    @simulated
+    def nvmlInit_v2(self):
+        self.initialized += 1
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlShutdown(self):
+        self.initialized -= 1
+        return NVML_SUCCESS
+
+    ## System
+
+    @simulated
+    def nvmlSystemGetDriverVersion(self, version, length):
+        return _set_string(version, length, self.driver_version)
+
+    @simulated
+    def nvmlSystemGetProcessName(self, pid, name, length):
+        try:
+            process_name = psutil.Process(pid.value).name()
+        except psutil.Error:
+            return bindings.NVML_ERROR_NOT_FOUND
+        return _set_string(name, length, process_name)
+
+    ## Devices
+
+    @simulated
+    def nvmlDeviceGetCount_v2(self, count):
+        count._obj.value = len(self.devices)
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetHandleByIndex_v2(self, index, device):
+        if not 0 <= index.value < len(self.devices):
+            return NVML_ERROR_INVALID_ARGUMENT
+        _set_handle(device, index.value)
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetName(self, handle, name, length):
+        return _set_string(name, length, self._device(handle).name)
+
+    @simulated
+    def nvmlDeviceGetUUID(self, handle, uuid, length):
+        return _set_string(uuid, length, self._device(handle).uuid)
+
+    @simulated
+    def nvmlDeviceGetSerial(self, handle, serial, length):
+        return _set_string(serial, length, self._device(handle).serial)
+
+    @simulated
+    def nvmlDeviceGetBrand(self, handle, brand):
+        brand._obj.value = NVML_BRAND_TESLA
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetPciInfo_v2(self, handle, info):
+        device = self._device(handle)
+        info._obj.busId = device.pci_bus_id.encode()
+        info._obj.bus = device.index + 1
+        info._obj.pciDeviceId = 0x20B210DE
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetMemoryInfo(self, handle, memory):
+        device = self._device(handle)
+        used = device.used_memory
+        memory._obj.total = device.total_memory
+        memory._obj.used = used
+        memory._obj.free = device.total_memory - used
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetUtilizationRates(self, handle, utilization):
+        device = self._device(handle)
+        utilization._obj.gpu = device.gpu_utilization
+        utilization._obj.memory = device.memory_utilization
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetTemperature(self, handle, sensor, temperature):
+        temperature._obj.value = self._device(handle).temperature
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetPowerUsage(self, handle, power):
+        power._obj.value = self._device(handle).power_usage
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetPowerManagementLimit(self, handle, limit):
+        limit._obj.value = self._device(handle).power_limit
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetEnforcedPowerLimit(self, handle, limit):
+        limit._obj.value = self._device(handle).power_limit
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetClockInfo(self, handle, clock_type, clock):
+        clock._obj.value = self._device(handle).clock
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetMaxClockInfo(self, handle, clock_type, clock):
+        clock._obj.value = 1410
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetPerformanceState(self, handle, state):
+        state._obj.value = 0 if self._device(handle).processes else 8
+        return NVML_SUCCESS
+
+    def _running_processes(self, handle, count, infos):
+        processes = list(self._device(handle).processes.items())
+        capacity = count._obj.value
+        count._obj.value = len(processes)
+        if not processes:
+            return NVML_SUCCESS
+        if infos is None or capacity < len(processes):
+            return NVML_ERROR_INSUFFICIENT_SIZE
+        for info, (pid, used) in zip(infos, processes):
+            info.pid = pid
+            info.usedGpuMemory = used
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetComputeRunningProcesses(self, handle, count, infos):
+        return self._running_processes(handle, count, infos)
+
+    @simulated
+    def nvmlDeviceGetGraphicsRunningProcesses(self, handle, count, infos):
+        count._obj.value = 0
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetSamples(
+        self, handle, sampling_type, timestamp, value_type, count, samples
+    ):
+        buffer = self._device(handle).samples.get(sampling_type.value)
+        if buffer is None:
+            return NVML_ERROR_NOT_SUPPORTED
+        new = [(t, v) for t, v in buffer if t > timestamp.value]
+        if not new:
+            return NVML_ERROR_NOT_FOUND
+        value_type._obj.value = NVML_VALUE_TYPE_UNSIGNED_INT
+        if samples is None:
+            count._obj.value = len(new)
+            return NVML_SUCCESS
+        count._obj.value = min(count._obj.value, len(new))
+        for sample, (t, v) in zip(samples, new):
+            sample.timeStamp = t
+            sample.sampleValue.uiVal = v
+        return NVML_SUCCESS
+
+    ## Events
+
+    @simulated
+    def nvmlEventSetCreate(self, event_set):
+        _set_handle(event_set, 0)
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlEventSetFree(self, event_set):
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceGetSupportedEventTypes(self, handle, event_types):
+        event_types._obj.value = self.supported_event_types
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlDeviceRegisterEvents(self, handle, event_types, event_set):
+        if event_types.value & ~self.supported_event_types:
+            return NVML_ERROR_NOT_SUPPORTED
+        index = self._device(handle).index
+        self.registered_events[index] = (
+            self.registered_events.get(index, 0) | event_types.value
+        )
+        return NVML_SUCCESS
+
+    @simulated
+    def nvmlEventSetWait(self, event_set, data, timeout_ms):
+        with self._events_changed:
+            if not self._events_changed.wait_for(
+                lambda: self._events, timeout_ms.value / 1000
+            ):
+                return NVML_ERROR_TIMEOUT
+            index, event_type, event_data = self._events.popleft()
+        data._obj.device = cast(c_void_p(index + 1), c_nvmlDevice_t)
+        data._obj.eventType = event_type
+        data._obj.eventData = event_data
+        return NVML_SUCCESS
+
+
+@contextlib.contextmanager
+def use_nvml_lib(lib) -> Iterator:
+    """
+    Use lib, e.g. a FakeNvml, as the nvml library of the bindings within the context, and the previous library
+    after. Function pointers resolved from either library are forgotten on the switch.
+    """
+    previous = bindings.nvml_lib
+    bindings.nvml_lib = lib
+    bindings._func_pointer_cache.clear()
+    bindings.nvml_functions.clear()
+    try:
+        yield lib
+    finally:
+        bindings.nvml_lib = previous
+        bindings._func_pointer_cache.clear()
+        bindings.nvml_functions.clear()
@@ -8,29 +8,142 @@ __doc__ = r"""
            """
 
 import time
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 
-import psutil
 from warg import NOD
 
+from heimdallr.configuration.heimdallr_config import (
+    PUBLISHED_PROCESS_ATTRIBUTES,
+    PUBLISH_UTILIZATION_SUMMARIES,
+)
 from heimdallr.utilities.nvidia import bindings
+from heimdallr.utilities.nvidia.sampling import UtilizationSampler
+from heimdallr.utilities.publisher.process_sampling import ProcessCache
+
+__all__ = ["get_nv_info", "DeviceInventory", "NvDevice"]
 
 try:
     bindings.nvmlInit()
 except Exception as e:
     print(e)
 
-
-def get_nv_info(include_graphics_processes: bool = True) -> Tuple[str, List]:
-    """description"""
+PROCESS_CACHE = ProcessCache(PUBLISHED_PROCESS_ATTRIBUTES)
+UTILIZATION_SAMPLER = UtilizationSampler() if PUBLISH_UTILIZATION_SUMMARIES else None
+PROCESS_COLUMNS = (
+    "used_gpu_mem",
+    "device_idx",
+    "name",
+    "username",
+    "memory_percent",
+    "cpu_percent",
+    "cmdline",
+    "device_name",
+    "create_time",
+    "status",
+    "pid",
+)
+
+
+class NvDevice:
+    """A device handle and the properties that do not change while the driver is loaded"""
+
+    __slots__ = ("index", "handle", "name", "uuid", "pci_bus_id", "total_memory")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.handle = bindings.nvmlDeviceGetHandleByIndex(index)
+        self.name = bindings.nvmlDeviceGetName(self.handle).decode()
+        self.uuid = bindings.nvmlDeviceGetUUID(self.handle).decode()
+        self.pci_bus_id = bindings.nvmlDeviceGetPciInfo(self.handle).busId.decode()
+        self.total_memory = bindings.nvmlDeviceGetMemoryInfo(self.handle).total
+
+
+class DeviceInventory:
+    """
+    Device handles and static device properties, built once and re-validated only when needed.
+
+    The inventory is rebuilt after `invalidate` (called on nvml errors) and when a device count check, done at
+    most every `hot_plug_check_interval_sec` seconds, reveals that devices were added or removed.
+    """
+
+    def __init__(self, hot_plug_check_interval_sec: float = 60.0):
+        """
+
+        Args:
+          hot_plug_check_interval_sec: Minimum number of seconds between device count checks
+        """
+        self.hot_plug_check_interval_sec = hot_plug_check_interval_sec
+        self.driver_version: Optional[str] = None
+        self.devices: List[NvDevice] = []
+        self._valid = False
+        self._last_check = 0.0
+
+    def invalidate(self) -> None:
+        """Rebuild the inventory on next use"""
+        self._valid = False
+
+    def refresh(self) -> None:
+        """Rebuild the inventory from nvml, initialising nvml if needed"""
+        self._valid = False
+        try:
+            driver_version = bindings.nvmlSystemGetDriverVersion()
+        except bindings.NVMLError_Uninitialized:
+            bindings.nvmlInit()
+            driver_version = bindings.nvmlSystemGetDriverVersion()
+        self.driver_version = driver_version.decode()
+        self.devices = [NvDevice(i) for i in range(bindings.nvmlDeviceGetCount())]
+        self._last_check = time.monotonic()
+        self._valid = True
+
+    def ensure(self) -> "DeviceInventory":
+        """Refresh the inventory if it was invalidated or devices were hot-plugged"""
+        if not self._valid:
+            self.refresh()
+        elif time.monotonic() - self._last_check > self.hot_plug_check_interval_sec:
+            self._last_check = time.monotonic()
+            if bindings.nvmlDeviceGetCount() != len(self.devices):
+                self.refresh()
+        return self
+
+
+DEVICE_INVENTORY = DeviceInventory()
+
+
+def get_utilization(device: NvDevice) -> Tuple[Optional[int], Optional[int]]:
+    """The gpu and memory utilisation percentages of device, None when not supported"""
+    try:
+        utilization = bindings.nvmlDeviceGetUtilizationRates(device.handle)
+    except bindings.NVMLError_NotSupported:
+        return None, None
+    return utilization.gpu, utilization.memory
+
+
+def get_nv_info(
+    include_graphics_processes: bool = True,
+    process_cache: ProcessCache = PROCESS_CACHE,
+    device_inventory: DeviceInventory = DEVICE_INVENTORY,
+    utilization_sampler: Optional[UtilizationSampler] = UTILIZATION_SAMPLER,
+) -> Tuple[str, List]:
+    """
+
+    Args:
+      include_graphics_processes: Also list the processes using the devices for graphics
+      process_cache: Samples the information of the processes using the devices
+      device_inventory: The device handles and static device properties
+      utilization_sampler: Adds percentile summaries of the utilisation samples since the previous call to
+        each device, e.g. gpu_utilization_p95, None to publish point-in-time utilisation only
+
+    Returns:
+      The driver version and a dict per device
+    """
     devices = []
     try:
-        driver_version = bindings.nvmlSystemGetDriverVersion().decode()
-        device_count = bindings.nvmlDeviceGetCount()
+        device_inventory.ensure()
+        driver_version = device_inventory.driver_version
 
-        for device_i in range(device_count):
-            handle = bindings.nvmlDeviceGetHandleByIndex(device_i)
-            device_name = bindings.nvmlDeviceGetName(handle).decode()
+        device_processes = []
+        for device in device_inventory.devices:
+            handle = device.handle
             gpu_mem_info = bindings.nvmlDeviceGetMemoryInfo(handle)
 
             gpu_processes = bindings.nvmlDeviceGetComputeRunningProcesses(handle)
@@ -40,30 +153,44 @@ def get_nv_info(include_graphics_processes: bool = True) -> Tuple[str, List]:
                     + bindings.nvmlDeviceGetGraphicsRunningProcesses(handle)
                 )
 
+            summary = (
+                utilization_sampler.summary(device.uuid, handle)
+                if utilization_sampler is not None
+                else {}
+            )
+
+            device_processes.append(
+                (device, gpu_mem_info, get_utilization(device), summary, gpu_processes)
+            )
+        if utilization_sampler is not None:
+            utilization_sampler.retain([d.uuid for d in device_inventory.devices])
+
+        process_infos = process_cache.collect(  # One priming sleep for all pids
+            p.pid for *_, gpu_processes in device_processes for p in gpu_processes
+        )
+
+        for (
+            device,
+            gpu_mem_info,
+            utilization,
+            summary,
+            gpu_processes,
+        ) in device_processes:
             processes_info = []
 
-            for p in gpu_processes:
-                pid = p.pid
-                used_gpu_mem = p.usedGpuMemory
-                p = psutil.Process(pid=pid)
-                _ = p.cpu_percent()
-                time.sleep(
-                    0.1
-                )  # Recommended to preprobe and sleep for atleast 0.1 seconds.
+            for gpu_process in gpu_processes:
+                pid = gpu_process.pid
+                if pid not in process_infos:  # Exited or inaccessible since listed
+                    continue
+                info = dict(
+                    used_gpu_mem=gpu_process.usedGpuMemory,
+                    device_idx=device.index,
+                    device_name=device.name,
+                    pid=pid,
+                    **process_infos[pid],
+                )
                 processes_info.append(
-                    NOD(
-                        used_gpu_mem=used_gpu_mem,
-                        device_idx=device_i,
-                        name=p.name(),
-                        username=p.username(),
-                        memory_percent=p.memory_percent(),
-                        cpu_percent=p.cpu_percent(),
-                        cmdline=" ".join(p.cmdline()),
-                        device_name=device_name,
-                        create_time=p.create_time(),
-                        status=p.status(),
-                        pid=pid,
-                    ).as_dict()
+                    {c: info[c] for c in PROCESS_COLUMNS if c in info}
                 )
 
             """
@@ -80,16 +207,24 @@ temperature = pynvml.nvmlDeviceGetTemperature(handle, pynvml.NVML_TEMPERATURE_GP
 
             devices.append(
                 NOD(
-                    id=device_i,
-                    name=device_name,
+                    id=device.index,
+                    name=device.name,
+                    uuid=device.uuid,
+                    pci_bus_id=device.pci_bus_id,
                     free=gpu_mem_info.free,
                     used=gpu_mem_info.used,
-                    total=gpu_mem_info.total,
+                    total=device.total_memory,
+                    gpu_utilization=utilization[0],
+                    memory_utilization=utilization[1],
+                    **summary,
                     processes=processes_info,
                 ).as_dict()
             )
     except Exception as e:
+        if isinstance(e, bindings.NVMLError):
+            device_inventory.invalidate()  # E.g. a lost gpu, rebuild the handles
         print(e)
         driver_version = "No nvidia driver"
+        devices = []
 
     return driver_version, devices
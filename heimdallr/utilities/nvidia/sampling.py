@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Summaries of the utilisation samples the driver buffers between publishes, which point-in-time readings
+           miss short bursts in.
+           """
+
+import math
+from typing import Dict, List, Mapping, Sequence, Set, Tuple
+
+from heimdallr.utilities.nvidia import bindings
+
+__all__ = ["UTILIZATION_SAMPLING_TYPES", "percentile_summary", "UtilizationSampler"]
+
+UTILIZATION_SAMPLING_TYPES = {
+    "gpu_utilization": bindings.NVML_GPU_UTILIZATION_SAMPLES,
+    "memory_utilization": bindings.NVML_MEMORY_UTILIZATION_SAMPLES,
+}
+
+SAMPLE_VALUE_FIELDS = {
+    bindings.NVML_VALUE_TYPE_DOUBLE: "dVal",
+    bindings.NVML_VALUE_TYPE_UNSIGNED_INT: "uiVal",
+    bindings.NVML_VALUE_TYPE_UNSIGNED_LONG: "ulVal",
+    bindings.NVML_VALUE_TYPE_UNSIGNED_LONG_LONG: "ullVal",
+}
+
+
+def percentile_summary(name: str, values: Sequence) -> Dict[str, object]:
+    """
+    The nearest-rank p50 and p95 and the max of values, which are values themselves, so integer samples stay
+    integers on the wire.
+
+    Returns:
+      {name_p50, name_p95, name_max}
+    """
+    ordered = sorted(values)
+    n = len(ordered)
+    return {
+        f"{name}_p50": ordered[math.ceil(0.5 * n) - 1],
+        f"{name}_p95": ordered[math.ceil(0.95 * n) - 1],
+        f"{name}_max": ordered[-1],
+    }
+
+
+class UtilizationSampler:
+    """
+    Reads the sample buffers of the devices since the previous read and reduces them to percentile summaries.
+
+    The driver samples utilisation several times a second, so the summaries of a publish interval catch bursts
+    that a single reading every interval misses, without publishing more often. The timestamp of the last
+    sample read is kept per device and sampling type, devices that do not support a sampling type are not
+    asked again.
+    """
+
+    def __init__(self, sampling_types: Mapping[str, int] = UTILIZATION_SAMPLING_TYPES):
+        """
+
+        Args:
+          sampling_types: Name -> NVML_*_SAMPLES, the name prefixes the published summary keys
+        """
+        self.sampling_types = sampling_types
+        self._last_timestamps: Dict[Tuple[str, int], int] = {}
+        self._unsupported: Set[Tuple[str, int]] = set()
+
+    def samples(self, uuid: str, handle, sampling_type: int) -> List:
+        """The sample values of the device since the previous call"""
+        key = (uuid, sampling_type)
+        if key in self._unsupported:
+            return []
+        try:
+            value_type, samples = bindings.nvmlDeviceGetSamples(
+                handle, sampling_type, self._last_timestamps.get(key, 0)
+            )
+        except bindings.NVMLError_NotFound:  # No samples since the timestamp
+            return []
+        except bindings.NVMLError_NotSupported:
+            self._unsupported.add(key)
+            return []
+        if not samples:
+            return []
+        self._last_timestamps[key] = max(s.timeStamp for s in samples)
+        field = SAMPLE_VALUE_FIELDS[value_type]
+        return [getattr(s.sampleValue, field) for s in samples]
+
+    def summary(self, uuid: str, handle) -> Dict[str, object]:
+        """The percentile summaries of every sampling type the device has new samples of"""
+        out = {}
+        for name, sampling_type in self.sampling_types.items():
+            values = self.samples(uuid, handle, sampling_type)
+            if values:
+                out.update(percentile_summary(name, values))
+        return out
+
+    def retain(self, uuids: Sequence[str]) -> None:
+        """Forget the devices not in uuids, e.g. after a hot-unplug"""
+        keep = set(uuids)
+        self._last_timestamps = {
+            k: v for k, v in self._last_timestamps.items() if k[0] in keep
+        }
+        self._unsupported = {k for k in self._unsupported if k[0] in keep}
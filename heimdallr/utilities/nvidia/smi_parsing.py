@@ -338,6 +338,12 @@ NVSMI_BRAND_NAMES = {
     NVML_BRAND_GEFORCE: "GeForce",
 }
 
+# The NVSMI_* values a filter selects, whether the pci info of each device is read and the sections filling in
+# the device results, in output order
+DeviceQueryPlan = collections.namedtuple(
+    "DeviceQueryPlan", ("wanted", "readsPciInfo", "sections")
+)
+
 
 ## ========================================================================== ##
 ##                                                                            ##
@@ -355,6 +361,8 @@ class NvidiaSMI:
 
     __instance = None
     __handles = None
+    __sections = None
+    __plans = {}  # Filter -> DeviceQueryPlan
 
     class loop_async:
         """description"""
@@ -2341,1030 +2349,1202 @@ class NvidiaSMI:
 
         return strResult
 
-    @classmethod
-    def DeviceQuery(self, filter=None):
-        """
-        Provides a Python interface to GPU management and monitoring functions.
+    @staticmethod
+    def __queryId(handle, pciInfo, wanted, gpuResults):
+        gpuResults["id"] = NvidiaSMI.__toString(pciInfo.busId)
 
-        This is a wrapper around the NVML library.
-        For information about the NVML library, see the NVML developer page
-        http://developer.nvidia.com/nvidia-management-library-nvml
+    @staticmethod
+    def __queryName(handle, pciInfo, wanted, gpuResults):
+        gpuResults["product_name"] = NvidiaSMI.__toString(nvmlDeviceGetName(handle))
 
-        Examples:
-        ---------------------------------------------------------------------------
-        For all elements as a list of dictionaries.  Similiar to nvisia-smi -q -x
+        try:
+            # if nvmlDeviceGetBrand() succeeds it is guaranteed to be in the dictionary
+            brandName = NVSMI_BRAND_NAMES[nvmlDeviceGetBrand(handle)]
+        except NVMLError as err:
+            brandName = NvidiaSMI.__handleError(err)
 
-        $ DeviceQuery()
+        gpuResults["product_brand"] = brandName
 
-        ---------------------------------------------------------------------------
-        For a list of filtered dictionary elements by string name.
-        Similiar ot nvidia-smi --query-gpu=pci.bus_id,memory.total,memory.free
-        See help_query_gpu.txt or DeviceQuery("--help_query_gpu") for available filter elements
+    @staticmethod
+    def __queryDisplayMode(handle, pciInfo, wanted, gpuResults):
+        try:
+            state = "Enabled" if (nvmlDeviceGetDisplayMode(handle) != 0) else "Disabled"
+        except NVMLError as err:
+            state = NvidiaSMI.__handleError(err)
 
-        $ DeviceQuery("pci.bus_id,memory.total,memory.free")
+        gpuResults["display_mode"] = state
 
-        ---------------------------------------------------------------------------
-        For a list of filtered dictionary elements by enumeration value.
-        See help_query_gpu.txt or DeviceQuery("--help_query_gpu") for available filter elements
+    @staticmethod
+    def __queryDisplayActive(handle, pciInfo, wanted, gpuResults):
+        try:
+            state = (
+                "Enabled" if (nvmlDeviceGetDisplayActive(handle) != 0) else "Disabled"
+            )
+        except NVMLError as err:
+            state = NvidiaSMI.__handleError(err)
 
-        $ DeviceQuery([NVSMI_PCI_BUS_ID, NVSMI_MEMORY_TOTAL, NVSMI_MEMORY_FREE])
+        gpuResults["display_active"] = state
 
-        """
+    @staticmethod
+    def __queryPersistenceMode(handle, pciInfo, wanted, gpuResults):
+        try:
+            mode = (
+                "Enabled" if (nvmlDeviceGetPersistenceMode(handle) != 0) else "Disabled"
+            )
+        except NVMLError as err:
+            mode = NvidiaSMI.__handleError(err)
 
-        if filter is None:
-            filter = [NVSMI_ALL]
-        elif isinstance(filter, str):
-            if (filter == "--help") or (filter == "-h"):
-                return NvidiaSMI.DeviceQuery.__doc__
-            elif filter == "--help-query-gpu":
-                with open("help_query_gpu.txt", "r") as fin:
-                    return fin.read()
-            else:
-                filter = NvidiaSMI.__fromDeviceQueryString(filter)
-        else:
-            filter = list(filter)
+        gpuResults["persistence_mode"] = mode
 
-        nvidia_smi_results = {}
-        dictResult = []
+    @staticmethod
+    def __queryAccountingMode(handle, pciInfo, wanted, gpuResults):
         try:
-            if NVSMI_ALL in filter or NVSMI_TIMESTAMP in filter:
-                nvidia_smi_results["timestamp"] = NvidiaSMI.__toString(
-                    datetime.date.today()
-                )
-            if NVSMI_ALL in filter or NVSMI_DRIVER_VERSION in filter:
-                nvidia_smi_results["driver_version"] = NvidiaSMI.__toString(
-                    nvmlSystemGetDriverVersion()
-                )
+            mode = (
+                "Enabled" if (nvmlDeviceGetAccountingMode(handle) != 0) else "Disabled"
+            )
+        except NVMLError as err:
+            mode = NvidiaSMI.__handleError(err)
 
-            deviceCount = nvmlDeviceGetCount()
-            if NVSMI_ALL in filter or NVSMI_COUNT in filter:
-                nvidia_smi_results["count"] = deviceCount
+        gpuResults["accounting_mode"] = mode
 
-            for i in range(0, deviceCount):
-                gpuResults = {}
-                handle = self.__handles[i]
+    @staticmethod
+    def __queryAccountingBufferSize(handle, pciInfo, wanted, gpuResults):
+        try:
+            bufferSize = NvidiaSMI.__toString(nvmlDeviceGetAccountingBufferSize(handle))
+        except NVMLError as err:
+            bufferSize = NvidiaSMI.__handleError(err)
 
-                pciInfo = nvmlDeviceGetPciInfo(handle)
+        gpuResults["accounting_mode_buffer_size"] = bufferSize
 
-                if NVSMI_ALL in filter or NVSMI_PCI_BUS_ID in filter:
-                    gpuResults["id"] = NvidiaSMI.__toString(pciInfo.busId)
-                if NVSMI_ALL in filter or NVSMI_NAME in filter:
-                    gpuResults["product_name"] = NvidiaSMI.__toString(
-                        nvmlDeviceGetName(handle)
-                    )
+    @staticmethod
+    def __queryDriverModel(handle, pciInfo, wanted, gpuResults):
+        driverModel = {}
+        includeDriverModel = False
+        if NVSMI_DRIVER_MODEL_CUR in wanted:
+            try:
+                current = (
+                    "WDDM"
+                    if (nvmlDeviceGetCurrentDriverModel(handle) == NVML_DRIVER_WDDM)
+                    else "TCC"
+                )
+            except NVMLError as err:
+                current = NvidiaSMI.__handleError(err)
+            driverModel["current_dm"] = current
+            includeDriverModel = True
 
-                    try:
-                        # if nvmlDeviceGetBrand() succeeds it is guaranteed to be in the dictionary
-                        brandName = NVSMI_BRAND_NAMES[nvmlDeviceGetBrand(handle)]
-                    except NVMLError as err:
-                        brandName = NvidiaSMI.__handleError(err)
+        if NVSMI_DRIVER_MODEL_PENDING in wanted:
+            try:
+                pending = (
+                    "WDDM"
+                    if (nvmlDeviceGetPendingDriverModel(handle) == NVML_DRIVER_WDDM)
+                    else "TCC"
+                )
+            except NVMLError as err:
+                pending = NvidiaSMI.__handleError(err)
 
-                    gpuResults["product_brand"] = brandName
+            driverModel["pending_dm"] = pending
+            includeDriverModel = True
 
-                if NVSMI_ALL in filter or NVSMI_DISPLAY_MODE in filter:
-                    try:
-                        state = (
-                            "Enabled"
-                            if (nvmlDeviceGetDisplayMode(handle) != 0)
-                            else "Disabled"
-                        )
-                    except NVMLError as err:
-                        state = NvidiaSMI.__handleError(err)
+        if includeDriverModel:
+            gpuResults["driver_model"] = driverModel
 
-                    gpuResults["display_mode"] = state
+    @staticmethod
+    def __querySerial(handle, pciInfo, wanted, gpuResults):
+        try:
+            serial = nvmlDeviceGetSerial(handle)
+        except NVMLError as err:
+            serial = NvidiaSMI.__handleError(err)
 
-                if NVSMI_ALL in filter or NVSMI_DISPLAY_ACTIVE in filter:
-                    try:
-                        state = (
-                            "Enabled"
-                            if (nvmlDeviceGetDisplayActive(handle) != 0)
-                            else "Disabled"
-                        )
-                    except NVMLError as err:
-                        state = NvidiaSMI.__handleError(err)
+        gpuResults["serial"] = NvidiaSMI.__toString(serial)
 
-                    gpuResults["display_active"] = state
+    @staticmethod
+    def __queryUuid(handle, pciInfo, wanted, gpuResults):
+        try:
+            uuid = nvmlDeviceGetUUID(handle)
+        except NVMLError as err:
+            uuid = NvidiaSMI.__handleError(err)
 
-                if NVSMI_ALL in filter or NVSMI_PERSISTENCE_MODE in filter:
-                    try:
-                        mode = (
-                            "Enabled"
-                            if (nvmlDeviceGetPersistenceMode(handle) != 0)
-                            else "Disabled"
-                        )
-                    except NVMLError as err:
-                        mode = NvidiaSMI.__handleError(err)
+        gpuResults["uuid"] = NvidiaSMI.__toString(uuid)
 
-                    gpuResults["persistence_mode"] = mode
+    @staticmethod
+    def __queryMinorNumber(handle, pciInfo, wanted, gpuResults):
+        try:
+            minor_number = nvmlDeviceGetMinorNumber(handle)
+        except NVMLError as err:
+            minor_number = NvidiaSMI.__handleError(err)
 
-                if NVSMI_ALL in filter or NVSMI_ACCT_MODE in filter:
-                    try:
-                        mode = (
-                            "Enabled"
-                            if (nvmlDeviceGetAccountingMode(handle) != 0)
-                            else "Disabled"
-                        )
-                    except NVMLError as err:
-                        mode = NvidiaSMI.__handleError(err)
+        gpuResults["minor_number"] = NvidiaSMI.__toString(minor_number)
 
-                    gpuResults["accounting_mode"] = mode
+    @staticmethod
+    def __queryVbios(handle, pciInfo, wanted, gpuResults):
+        if NVSMI_VBIOS_VER in wanted:
+            try:
+                vbios = nvmlDeviceGetVbiosVersion(handle)
+            except NVMLError as err:
+                vbios = NvidiaSMI.__handleError(err)
 
-                if NVSMI_ALL in filter or NVSMI_ACCT_BUFFER_SIZE in filter:
-                    try:
-                        bufferSize = NvidiaSMI.__toString(
-                            nvmlDeviceGetAccountingBufferSize(handle)
-                        )
-                    except NVMLError as err:
-                        bufferSize = NvidiaSMI.__handleError(err)
+            gpuResults["vbios_version"] = NvidiaSMI.__toString(vbios)
 
-                    gpuResults["accounting_mode_buffer_size"] = bufferSize
+        if NVSMI_VBIOS_VER in wanted:
+            try:
+                multiGpuBool = nvmlDeviceGetMultiGpuBoard(handle)
+            except NVMLError as err:
+                multiGpuBool = NvidiaSMI.__handleError(err)
 
-                driverModel = {}
-                includeDriverModel = False
-                if NVSMI_ALL in filter or NVSMI_DRIVER_MODEL_CUR in filter:
-                    try:
-                        current = (
-                            "WDDM"
-                            if (
-                                nvmlDeviceGetCurrentDriverModel(handle)
-                                == NVML_DRIVER_WDDM
-                            )
-                            else "TCC"
-                        )
-                    except NVMLError as err:
-                        current = NvidiaSMI.__handleError(err)
-                    driverModel["current_dm"] = current
-                    includeDriverModel = True
+            if multiGpuBool == "N/A":
+                gpuResults["multigpu_board"] = "N/A"
+            elif multiGpuBool:
+                gpuResults["multigpu_board"] = "Yes"
+            else:
+                gpuResults["multigpu_board"] = "No"
 
-                if NVSMI_ALL in filter or NVSMI_DRIVER_MODEL_PENDING in filter:
-                    try:
-                        pending = (
-                            "WDDM"
-                            if (
-                                nvmlDeviceGetPendingDriverModel(handle)
-                                == NVML_DRIVER_WDDM
-                            )
-                            else "TCC"
-                        )
-                    except NVMLError as err:
-                        pending = NvidiaSMI.__handleError(err)
+    @staticmethod
+    def __queryBoardId(handle, pciInfo, wanted, gpuResults):
+        try:
+            boardId = nvmlDeviceGetBoardId(handle)
+        except NVMLError as err:
+            boardId = NvidiaSMI.__handleError(err)
 
-                    driverModel["pending_dm"] = pending
-                    includeDriverModel = True
+        try:
+            hexBID = "0x%x" % boardId
+        except:
+            hexBID = boardId
 
-                if includeDriverModel:
-                    gpuResults["driver_model"] = driverModel
+        gpuResults["board_id"] = hexBID
 
-                if NVSMI_ALL in filter or NVSMI_SERIALNUMBER in filter:
-                    try:
-                        serial = nvmlDeviceGetSerial(handle)
-                    except NVMLError as err:
-                        serial = NvidiaSMI.__handleError(err)
+    @staticmethod
+    def __queryInforom(handle, pciInfo, wanted, gpuResults):
+        inforomVersion = {}
+        includeInforom = False
+        if NVSMI_INFOROM_IMG in wanted:
+            try:
+                img = nvmlDeviceGetInforomImageVersion(handle)
+            except NVMLError as err:
+                img = NvidiaSMI.__handleError(err)
 
-                    gpuResults["serial"] = NvidiaSMI.__toString(serial)
+            inforomVersion["img_version"] = NvidiaSMI.__toString(img)
+            includeInforom = True
 
-                if NVSMI_ALL in filter or NVSMI_UUID in filter:
-                    try:
-                        uuid = nvmlDeviceGetUUID(handle)
-                    except NVMLError as err:
-                        uuid = NvidiaSMI.__handleError(err)
+        if NVSMI_INFOROM_OEM in wanted:
+            try:
+                oem = nvmlDeviceGetInforomVersion(handle, NVML_INFOROM_OEM)
+            except NVMLError as err:
+                oem = NvidiaSMI.__handleError(err)
 
-                    gpuResults["uuid"] = NvidiaSMI.__toString(uuid)
+            inforomVersion["oem_object"] = NvidiaSMI.__toString(oem)
+            includeInforom = True
 
-                if NVSMI_ALL in filter or NVSMI_INDEX in filter:
-                    try:
-                        minor_number = nvmlDeviceGetMinorNumber(handle)
-                    except NVMLError as err:
-                        minor_number = NvidiaSMI.__handleError(err)
+        if NVSMI_INFOROM_ECC in wanted:
+            try:
+                ecc = nvmlDeviceGetInforomVersion(handle, NVML_INFOROM_ECC)
+            except NVMLError as err:
+                ecc = NvidiaSMI.__handleError(err)
 
-                    gpuResults["minor_number"] = NvidiaSMI.__toString(minor_number)
+            inforomVersion["ecc_object"] = NvidiaSMI.__toString(ecc)
+            includeInforom = True
 
-                if NVSMI_ALL in filter or NVSMI_VBIOS_VER in filter:
-                    try:
-                        vbios = nvmlDeviceGetVbiosVersion(handle)
-                    except NVMLError as err:
-                        vbios = NvidiaSMI.__handleError(err)
+        if NVSMI_INFOROM_PWR in wanted:
+            try:
+                pwr = nvmlDeviceGetInforomVersion(handle, NVML_INFOROM_POWER)
+            except NVMLError as err:
+                pwr = NvidiaSMI.__handleError(err)
 
-                    gpuResults["vbios_version"] = NvidiaSMI.__toString(vbios)
+            inforomVersion["pwr_object"] = NvidiaSMI.__toString(pwr)
+            includeInforom = True
 
-                if NVSMI_ALL in filter or NVSMI_VBIOS_VER in filter:
-                    try:
-                        multiGpuBool = nvmlDeviceGetMultiGpuBoard(handle)
-                    except NVMLError as err:
-                        multiGpuBool = NvidiaSMI.__handleError(err)
+        if includeInforom:
+            gpuResults["inforom_version"] = inforomVersion
 
-                    if multiGpuBool == "N/A":
-                        gpuResults["multigpu_board"] = "N/A"
-                    elif multiGpuBool:
-                        gpuResults["multigpu_board"] = "Yes"
-                    else:
-                        gpuResults["multigpu_board"] = "No"
+    @staticmethod
+    def __queryGpuOperationMode(handle, pciInfo, wanted, gpuResults):
+        gpuOperationMode = {}
+        includeGOM = False
+        if NVSMI_INFOROM_PWR in wanted:
+            try:
+                current = NvidiaSMI.__toStrGOM(
+                    nvmlDeviceGetCurrentGpuOperationMode(handle)
+                )
+            except NVMLError as err:
+                current = NvidiaSMI.__handleError(err)
+            gpuOperationMode["current_gom"] = NvidiaSMI.__toString(current)
+            includeGOM = True
 
-                if NVSMI_ALL in filter or NVSMI_BOARD_ID in filter:
-                    try:
-                        boardId = nvmlDeviceGetBoardId(handle)
-                    except NVMLError as err:
-                        boardId = NvidiaSMI.__handleError(err)
+        if NVSMI_INFOROM_PWR in wanted:
+            try:
+                pending = NvidiaSMI.__toStrGOM(
+                    nvmlDeviceGetPendingGpuOperationMode(handle)
+                )
+            except NVMLError as err:
+                pending = NvidiaSMI.__handleError(err)
 
-                    try:
-                        hexBID = "0x%x" % boardId
-                    except:
-                        hexBID = boardId
+            gpuOperationMode["pending_gom"] = NvidiaSMI.__toString(pending)
+            includeGOM = True
 
-                    gpuResults["board_id"] = hexBID
+        if includeGOM:
+            gpuResults["gpu_operation_mode"] = gpuOperationMode
 
-                inforomVersion = {}
-                includeInforom = False
-                if NVSMI_ALL in filter or NVSMI_INFOROM_IMG in filter:
-                    try:
-                        img = nvmlDeviceGetInforomImageVersion(handle)
-                    except NVMLError as err:
-                        img = NvidiaSMI.__handleError(err)
+    @staticmethod
+    def __queryPci(handle, pciInfo, wanted, gpuResults):
+        pci = {}
+        includePci = False
 
-                    inforomVersion["img_version"] = NvidiaSMI.__toString(img)
-                    includeInforom = True
+        if NVSMI_PCI_BUS in wanted:
+            pci["pci_bus"] = "%02X" % pciInfo.bus
+            includePci = True
 
-                if NVSMI_ALL in filter or NVSMI_INFOROM_OEM in filter:
-                    try:
-                        oem = nvmlDeviceGetInforomVersion(handle, NVML_INFOROM_OEM)
-                    except NVMLError as err:
-                        oem = NvidiaSMI.__handleError(err)
+        if NVSMI_PCI_DEVICE in wanted:
+            pci["pci_device"] = "%02X" % pciInfo.device
+            includePci = True
 
-                    inforomVersion["oem_object"] = NvidiaSMI.__toString(oem)
-                    includeInforom = True
+        if NVSMI_PCI_DOMAIN in wanted:
+            pci["pci_domain"] = "%04X" % pciInfo.domain
+            includePci = True
 
-                if NVSMI_ALL in filter or NVSMI_INFOROM_ECC in filter:
-                    try:
-                        ecc = nvmlDeviceGetInforomVersion(handle, NVML_INFOROM_ECC)
-                    except NVMLError as err:
-                        ecc = NvidiaSMI.__handleError(err)
+        if NVSMI_PCI_DEVICE_ID in wanted:
+            pci["pci_device_id"] = "%08X" % (pciInfo.pciDeviceId)
+            includePci = True
 
-                    inforomVersion["ecc_object"] = NvidiaSMI.__toString(ecc)
-                    includeInforom = True
+        if NVSMI_PCI_BUS_ID in wanted:
+            pci["pci_bus_id"] = NvidiaSMI.__toString(pciInfo.busId)
+            includePci = True
 
-                if NVSMI_ALL in filter or NVSMI_INFOROM_PWR in filter:
-                    try:
-                        pwr = nvmlDeviceGetInforomVersion(handle, NVML_INFOROM_POWER)
-                    except NVMLError as err:
-                        pwr = NvidiaSMI.__handleError(err)
+        if NVSMI_PCI_SUBDEVICE_ID in wanted:
+            pci["pci_sub_system_id"] = "%08X" % (pciInfo.pciSubSystemId)
+            includePci = True
 
-                    inforomVersion["pwr_object"] = NvidiaSMI.__toString(pwr)
-                    includeInforom = True
+        pciGpuLinkInfo = {}
+        includeLinkInfo = False
+        pciGen = {}
+        includeGen = False
 
-                if includeInforom:
-                    gpuResults["inforom_version"] = inforomVersion
+        if NVSMI_PCI_LINK_GEN_MAX in wanted:
+            try:
+                gen = NvidiaSMI.__toString(nvmlDeviceGetMaxPcieLinkGeneration(handle))
+            except NVMLError as err:
+                gen = NvidiaSMI.__handleError(err)
 
-                gpuOperationMode = {}
-                includeGOM = False
-                if NVSMI_ALL in filter or NVSMI_INFOROM_PWR in filter:
-                    try:
-                        current = NvidiaSMI.__toStrGOM(
-                            nvmlDeviceGetCurrentGpuOperationMode(handle)
-                        )
-                    except NVMLError as err:
-                        current = NvidiaSMI.__handleError(err)
-                    gpuOperationMode["current_gom"] = NvidiaSMI.__toString(current)
-                    includeGOM = True
+            pciGen["max_link_gen"] = gen
+            includeGen = True
 
-                if NVSMI_ALL in filter or NVSMI_INFOROM_PWR in filter:
-                    try:
-                        pending = NvidiaSMI.__toStrGOM(
-                            nvmlDeviceGetPendingGpuOperationMode(handle)
-                        )
-                    except NVMLError as err:
-                        pending = NvidiaSMI.__handleError(err)
+        if NVSMI_PCI_LINK_GEN_CUR in wanted:
+            try:
+                gen = NvidiaSMI.__toString(nvmlDeviceGetCurrPcieLinkGeneration(handle))
+            except NVMLError as err:
+                gen = NvidiaSMI.__handleError(err)
 
-                    gpuOperationMode["pending_gom"] = NvidiaSMI.__toString(pending)
-                    includeGOM = True
+            pciGen["current_link_gen"] = gen
+            includeGen = True
 
-                if includeGOM:
-                    gpuResults["gpu_operation_mode"] = gpuOperationMode
+        if includeGen:
+            pciGpuLinkInfo["pcie_gen"] = pciGen
+            includeLinkInfo = True
 
-                pci = {}
-                includePci = False
+        pciLinkWidths = {}
+        includeLinkWidths = False
 
-                if NVSMI_ALL in filter or NVSMI_PCI_BUS in filter:
-                    pci["pci_bus"] = "%02X" % pciInfo.bus
-                    includePci = True
+        if NVSMI_PCI_LINK_WIDTH_MAX in wanted:
+            try:
+                width = (
+                    NvidiaSMI.__toString(nvmlDeviceGetMaxPcieLinkWidth(handle)) + "x"
+                )
+            except NVMLError as err:
+                width = NvidiaSMI.__handleError(err)
 
-                if NVSMI_ALL in filter or NVSMI_PCI_DEVICE in filter:
-                    pci["pci_device"] = "%02X" % pciInfo.device
-                    includePci = True
+            pciLinkWidths["max_link_width"] = width
+            includeLinkWidths = True
 
-                if NVSMI_ALL in filter or NVSMI_PCI_DOMAIN in filter:
-                    pci["pci_domain"] = "%04X" % pciInfo.domain
-                    includePci = True
+        if NVSMI_PCI_LINK_WIDTH_CUR in wanted:
+            try:
+                width = (
+                    NvidiaSMI.__toString(nvmlDeviceGetCurrPcieLinkWidth(handle)) + "x"
+                )
+            except NVMLError as err:
+                width = NvidiaSMI.__handleError(err)
 
-                if NVSMI_ALL in filter or NVSMI_PCI_DEVICE_ID in filter:
-                    pci["pci_device_id"] = "%08X" % (pciInfo.pciDeviceId)
-                    includePci = True
+            pciLinkWidths["current_link_width"] = width
+            includeLinkWidths = True
 
-                if NVSMI_ALL in filter or NVSMI_PCI_BUS_ID in filter:
-                    pci["pci_bus_id"] = NvidiaSMI.__toString(pciInfo.busId)
-                    includePci = True
+        if includeLinkWidths:
+            pciGpuLinkInfo["link_widths"] = pciLinkWidths
+            includeLinkInfo = True
 
-                if NVSMI_ALL in filter or NVSMI_PCI_SUBDEVICE_ID in filter:
-                    pci["pci_sub_system_id"] = "%08X" % (pciInfo.pciSubSystemId)
-                    includePci = True
+        if includeLinkInfo:
+            pci["pci_gpu_link_info"] = pciGpuLinkInfo
+            includePci = True
 
-                pciGpuLinkInfo = {}
-                includeLinkInfo = False
-                pciGen = {}
-                includeGen = False
+        pciBridgeChip = {}
+        includeBridgeChip = False
 
-                if NVSMI_ALL in filter or NVSMI_PCI_LINK_GEN_MAX in filter:
-                    try:
-                        gen = NvidiaSMI.__toString(
-                            nvmlDeviceGetMaxPcieLinkGeneration(handle)
-                        )
-                    except NVMLError as err:
-                        gen = NvidiaSMI.__handleError(err)
+        if NVSMI_ALL in wanted:
+            try:
+                bridgeHierarchy = nvmlDeviceGetBridgeChipInfo(handle)
+                bridge_type = ""
+                if bridgeHierarchy.bridgeChipInfo[0].type == 0:
+                    bridge_type += "PLX"
+                else:
+                    bridge_type += "BR04"
+                pciBridgeChip["bridge_chip_type"] = bridge_type
 
-                    pciGen["max_link_gen"] = gen
-                    includeGen = True
+                if bridgeHierarchy.bridgeChipInfo[0].fwVersion == 0:
+                    strFwVersion = "N/A"
+                else:
+                    strFwVersion = "%08X" % (
+                        bridgeHierarchy.bridgeChipInfo[0].fwVersion
+                    )
+                pciBridgeChip["bridge_chip_fw"] = NvidiaSMI.__toString(strFwVersion)
+            except NVMLError as err:
+                pciBridgeChip["bridge_chip_type"] = NvidiaSMI.__handleError(err)
+                pciBridgeChip["bridge_chip_fw"] = NvidiaSMI.__handleError(err)
 
-                if NVSMI_ALL in filter or NVSMI_PCI_LINK_GEN_CUR in filter:
-                    try:
-                        gen = NvidiaSMI.__toString(
-                            nvmlDeviceGetCurrPcieLinkGeneration(handle)
-                        )
-                    except NVMLError as err:
-                        gen = NvidiaSMI.__handleError(err)
+            includeBridgeChip = True
 
-                    pciGen["current_link_gen"] = gen
-                    includeGen = True
+        if includeBridgeChip:
+            pci["pci_bridge_chip"] = pciBridgeChip
+            includePci = True
 
-                if includeGen:
-                    pciGpuLinkInfo["pcie_gen"] = pciGen
-                    includeLinkInfo = True
+        if NVSMI_ALL in wanted:
+            try:
+                replay = nvmlDeviceGetPcieReplayCounter(handle)
+                pci["replay_counter"] = NvidiaSMI.__toString(replay)
+            except NVMLError as err:
+                pci["replay_counter"] = NvidiaSMI.__handleError(err)
+            includePci = True
 
-                pciLinkWidths = {}
-                includeLinkWidths = False
+        if NVSMI_ALL in wanted:
+            try:
+                tx_bytes = nvmlDeviceGetPcieThroughput(handle, NVML_PCIE_UTIL_TX_BYTES)
+                pci["tx_util"] = tx_bytes
+                pci["tx_util_unit"] = "KB/s"
+            except NVMLError as err:
+                pci["tx_util"] = NvidiaSMI.__handleError(err)
+            includePci = True
 
-                if NVSMI_ALL in filter or NVSMI_PCI_LINK_WIDTH_MAX in filter:
-                    try:
-                        width = (
-                            NvidiaSMI.__toString(nvmlDeviceGetMaxPcieLinkWidth(handle))
-                            + "x"
-                        )
-                    except NVMLError as err:
-                        width = NvidiaSMI.__handleError(err)
+        if NVSMI_ALL in wanted:
+            try:
+                rx_bytes = nvmlDeviceGetPcieThroughput(handle, NVML_PCIE_UTIL_RX_BYTES)
+                pci["rx_util"] = rx_bytes
+                pci["rx_util_unit"] = "KB/s"
+            except NVMLError as err:
+                pci["rx_util"] = NvidiaSMI.__handleError(err)
+            includePci = True
 
-                    pciLinkWidths["max_link_width"] = width
-                    includeLinkWidths = True
+        if includePci:
+            gpuResults["pci"] = pci
 
-                if NVSMI_ALL in filter or NVSMI_PCI_LINK_WIDTH_CUR in filter:
-                    try:
-                        width = (
-                            NvidiaSMI.__toString(nvmlDeviceGetCurrPcieLinkWidth(handle))
-                            + "x"
-                        )
-                    except NVMLError as err:
-                        width = NvidiaSMI.__handleError(err)
+    @staticmethod
+    def __queryFanSpeed(handle, pciInfo, wanted, gpuResults):
+        try:
+            fan = nvmlDeviceGetFanSpeed(handle)
+        except NVMLError as err:
+            fan = NvidiaSMI.__handleError(err)
+        gpuResults["fan_speed"] = fan
+        gpuResults["fan_speed_unit"] = "%"
 
-                    pciLinkWidths["current_link_width"] = width
-                    includeLinkWidths = True
+    @staticmethod
+    def __queryPerformanceState(handle, pciInfo, wanted, gpuResults):
+        try:
+            perfState = nvmlDeviceGetPowerState(handle)
+            perfStateStr = "P%s" % perfState
+        except NVMLError as err:
+            perfStateStr = NvidiaSMI.__handleError(err)
+        gpuResults["performance_state"] = perfStateStr
 
-                if includeLinkWidths:
-                    pciGpuLinkInfo["link_widths"] = pciLinkWidths
-                    includeLinkInfo = True
+    @staticmethod
+    def __queryClocksThrottle(handle, pciInfo, wanted, gpuResults):
+        gpuResults["clocks_throttle"] = NvidiaSMI.__GetClocksThrottleReasons(handle)
 
-                if includeLinkInfo:
-                    pci["pci_gpu_link_info"] = pciGpuLinkInfo
-                    includePci = True
+    @staticmethod
+    def __queryFbMemoryUsage(handle, pciInfo, wanted, gpuResults):
+        fbMemoryUsage = {}
+        includeMemoryUsage = False
+        if (
+            NVSMI_MEMORY_TOTAL in wanted
+            or NVSMI_MEMORY_USED in wanted
+            or NVSMI_MEMORY_FREE in wanted
+        ):
 
-                pciBridgeChip = {}
-                includeBridgeChip = False
+            includeMemoryUsage = True
+            try:
+                memInfo = nvmlDeviceGetMemoryInfo(handle)
+                mem_total = memInfo.total / 1024 / 1024
+                mem_used = memInfo.used / 1024 / 1024
+                mem_free = memInfo.total / 1024 / 1024 - memInfo.used / 1024 / 1024
+            except NVMLError as err:
+                error = NvidiaSMI.__handleError(err)
+                mem_total = error
+                mem_used = error
+                mem_free = error
 
-                if NVSMI_ALL in filter:
-                    try:
-                        bridgeHierarchy = nvmlDeviceGetBridgeChipInfo(handle)
-                        bridge_type = ""
-                        if bridgeHierarchy.bridgeChipInfo[0].type == 0:
-                            bridge_type += "PLX"
-                        else:
-                            bridge_type += "BR04"
-                        pciBridgeChip["bridge_chip_type"] = bridge_type
+            if NVSMI_MEMORY_TOTAL in wanted:
+                fbMemoryUsage["total"] = mem_total
 
-                        if bridgeHierarchy.bridgeChipInfo[0].fwVersion == 0:
-                            strFwVersion = "N/A"
-                        else:
-                            strFwVersion = "%08X" % (
-                                bridgeHierarchy.bridgeChipInfo[0].fwVersion
-                            )
-                        pciBridgeChip["bridge_chip_fw"] = NvidiaSMI.__toString(
-                            strFwVersion
-                        )
-                    except NVMLError as err:
-                        pciBridgeChip["bridge_chip_type"] = NvidiaSMI.__handleError(err)
-                        pciBridgeChip["bridge_chip_fw"] = NvidiaSMI.__handleError(err)
+            if NVSMI_MEMORY_USED in wanted:
+                fbMemoryUsage["used"] = mem_used
 
-                    includeBridgeChip = True
+            if NVSMI_MEMORY_FREE in wanted:
+                fbMemoryUsage["free"] = mem_free
 
-                if includeBridgeChip:
-                    pci["pci_bridge_chip"] = pciBridgeChip
-                    includePci = True
+        if includeMemoryUsage:
+            fbMemoryUsage["unit"] = "MiB"
+            gpuResults["fb_memory_usage"] = fbMemoryUsage
 
-                if NVSMI_ALL in filter:
-                    try:
-                        replay = nvmlDeviceGetPcieReplayCounter(handle)
-                        pci["replay_counter"] = NvidiaSMI.__toString(replay)
-                    except NVMLError as err:
-                        pci["replay_counter"] = NvidiaSMI.__handleError(err)
-                    includePci = True
+    @staticmethod
+    def __queryBar1MemoryUsage(handle, pciInfo, wanted, gpuResults):
+        try:
+            memInfo = nvmlDeviceGetBAR1MemoryInfo(handle)
+            mem_total = memInfo.bar1Total / 1024 / 1024
+            mem_used = memInfo.bar1Used / 1024 / 1024
+            mem_free = memInfo.bar1Total / 1024 / 1024 - memInfo.bar1Used / 1024 / 1024
+        except NVMLError as err:
+            error = NvidiaSMI.__handleError(err)
+            mem_total = error
+            mem_used = error
+            mem_free = error
 
-                if NVSMI_ALL in filter:
-                    try:
-                        tx_bytes = nvmlDeviceGetPcieThroughput(
-                            handle, NVML_PCIE_UTIL_TX_BYTES
-                        )
-                        pci["tx_util"] = tx_bytes
-                        pci["tx_util_unit"] = "KB/s"
-                    except NVMLError as err:
-                        pci["tx_util"] = NvidiaSMI.__handleError(err)
-                    includePci = True
+        bar1MemoryUsage = {}
+        bar1MemoryUsage["total"] = mem_total
+        bar1MemoryUsage["used"] = mem_used
+        bar1MemoryUsage["free"] = mem_free
+        bar1MemoryUsage["unit"] = "MiB"
+        gpuResults["bar1_memory_usage"] = bar1MemoryUsage
 
-                if NVSMI_ALL in filter:
-                    try:
-                        rx_bytes = nvmlDeviceGetPcieThroughput(
-                            handle, NVML_PCIE_UTIL_RX_BYTES
-                        )
-                        pci["rx_util"] = rx_bytes
-                        pci["rx_util_unit"] = "KB/s"
-                    except NVMLError as err:
-                        pci["rx_util"] = NvidiaSMI.__handleError(err)
-                    includePci = True
+    @staticmethod
+    def __queryComputeMode(handle, pciInfo, wanted, gpuResults):
+        try:
+            mode = nvmlDeviceGetComputeMode(handle)
+            if mode == NVML_COMPUTEMODE_DEFAULT:
+                modeStr = "Default"
+            elif mode == NVML_COMPUTEMODE_EXCLUSIVE_THREAD:
+                modeStr = "Exclusive Thread"
+            elif mode == NVML_COMPUTEMODE_PROHIBITED:
+                modeStr = "Prohibited"
+            elif mode == NVML_COMPUTEMODE_EXCLUSIVE_PROCESS:
+                modeStr = "Exclusive_Process"
+            else:
+                modeStr = "Unknown"
+        except NVMLError as err:
+            modeStr = NvidiaSMI.__handleError(err)
 
-                if includePci:
-                    gpuResults["pci"] = pci
+        gpuResults["compute_mode"] = modeStr
 
-                if NVSMI_ALL in filter or NVSMI_FAN_SPEED in filter:
-                    try:
-                        fan = nvmlDeviceGetFanSpeed(handle)
-                    except NVMLError as err:
-                        fan = NvidiaSMI.__handleError(err)
-                    gpuResults["fan_speed"] = fan
-                    gpuResults["fan_speed_unit"] = "%"
+    @staticmethod
+    def __queryUtilization(handle, pciInfo, wanted, gpuResults):
+        utilization = {}
+        includeUtilization = False
+        if NVSMI_UTILIZATION_GPU in wanted or NVSMI_UTILIZATION_MEM in wanted:
 
-                if NVSMI_ALL in filter or NVSMI_PSTATE in filter:
-                    try:
-                        perfState = nvmlDeviceGetPowerState(handle)
-                        perfStateStr = "P%s" % perfState
-                    except NVMLError as err:
-                        perfStateStr = NvidiaSMI.__handleError(err)
-                    gpuResults["performance_state"] = perfStateStr
+            try:
+                util = nvmlDeviceGetUtilizationRates(handle)
+                gpu_util = util.gpu
+                mem_util = util.memory
+            except NVMLError as err:
+                error = NvidiaSMI.__handleError(err)
+                gpu_util = error
+                mem_util = error
 
-                if (
-                    NVSMI_ALL in filter
-                    or NVSMI_CLOCK_THROTTLE_REASONS_SUPPORTED in filter
-                    or NVSMI_CLOCK_THROTTLE_REASONS_ACTIVE in filter
-                    or NVSMI_CLOCK_THROTTLE_REASONS_IDLE in filter
-                    or NVSMI_CLOCK_THROTTLE_REASONS_APP_SETTING in filter
-                    or NVSMI_CLOCK_THROTTLE_REASONS_SW_PWR_CAP in filter
-                    or NVSMI_CLOCK_THROTTLE_REASONS_HW_SLOWDOWN in filter
-                    or NVSMI_CLOCK_THROTTLE_REASONS_HW_THERMAL_SLOWDOWN in filter
-                    or NVSMI_CLOCK_THROTTLE_REASONS_HW_PWR_BRAKE_SLOWDOWN in filter
-                    or NVSMI_CLOCK_THROTTLE_REASONS_SW_THERMAL_SLOWDOWN in filter
-                    or NVSMI_CLOCK_THROTTLE_REASONS_SYNC_BOOST in filter
-                ):
-                    gpuResults[
-                        "clocks_throttle"
-                    ] = NvidiaSMI.__GetClocksThrottleReasons(handle)
+            if NVSMI_UTILIZATION_GPU in wanted:
+                utilization["gpu_util"] = gpu_util
 
-                fbMemoryUsage = {}
-                includeMemoryUsage = False
-                if (
-                    NVSMI_ALL in filter
-                    or NVSMI_MEMORY_TOTAL in filter
-                    or NVSMI_MEMORY_USED in filter
-                    or NVSMI_MEMORY_FREE in filter
-                ):
+            if NVSMI_UTILIZATION_MEM in wanted:
+                utilization["memory_util"] = mem_util
 
-                    includeMemoryUsage = True
-                    try:
-                        memInfo = nvmlDeviceGetMemoryInfo(handle)
-                        mem_total = memInfo.total / 1024 / 1024
-                        mem_used = memInfo.used / 1024 / 1024
-                        mem_free = (
-                            memInfo.total / 1024 / 1024 - memInfo.used / 1024 / 1024
-                        )
-                    except NVMLError as err:
-                        error = NvidiaSMI.__handleError(err)
-                        mem_total = error
-                        mem_used = error
-                        mem_free = error
+            includeUtilization = True
 
-                    if NVSMI_ALL in filter or NVSMI_MEMORY_TOTAL in filter:
-                        fbMemoryUsage["total"] = mem_total
+        if NVSMI_UTILIZATION_ENCODER in wanted:
+            try:
+                util_int, ssize = nvmlDeviceGetEncoderUtilization(handle)
+                encoder_util = util_int
+            except NVMLError as err:
+                error = NvidiaSMI.__handleError(err)
+                encoder_util = error
 
-                    if NVSMI_ALL in filter or NVSMI_MEMORY_USED in filter:
-                        fbMemoryUsage["used"] = mem_used
+            utilization["encoder_util"] = encoder_util
+            includeUtilization = True
 
-                    if NVSMI_ALL in filter or NVSMI_MEMORY_FREE in filter:
-                        fbMemoryUsage["free"] = mem_free
+        if NVSMI_UTILIZATION_DECODER in wanted:
+            try:
+                util_int, ssize = nvmlDeviceGetDecoderUtilization(handle)
+                decoder_util = util_int
+            except NVMLError as err:
+                error = NvidiaSMI.__handleError(err)
+                decoder_util = error
 
-                if includeMemoryUsage:
-                    fbMemoryUsage["unit"] = "MiB"
-                    gpuResults["fb_memory_usage"] = fbMemoryUsage
+            utilization["decoder_util"] = decoder_util
+            includeUtilization = True
 
-                if NVSMI_ALL in filter or NVSMI_MEMORY_BAR1 in filter:
-                    try:
-                        memInfo = nvmlDeviceGetBAR1MemoryInfo(handle)
-                        mem_total = memInfo.bar1Total / 1024 / 1024
-                        mem_used = memInfo.bar1Used / 1024 / 1024
-                        mem_free = (
-                            memInfo.bar1Total / 1024 / 1024
-                            - memInfo.bar1Used / 1024 / 1024
-                        )
-                    except NVMLError as err:
-                        error = NvidiaSMI.__handleError(err)
-                        mem_total = error
-                        mem_used = error
-                        mem_free = error
+        if includeUtilization:
+            utilization["unit"] = "%"
+            gpuResults["utilization"] = utilization
 
-                    bar1MemoryUsage = {}
-                    bar1MemoryUsage["total"] = mem_total
-                    bar1MemoryUsage["used"] = mem_used
-                    bar1MemoryUsage["free"] = mem_free
-                    bar1MemoryUsage["unit"] = "MiB"
-                    gpuResults["bar1_memory_usage"] = bar1MemoryUsage
+    @staticmethod
+    def __queryEccMode(handle, pciInfo, wanted, gpuResults):
+        try:
+            current, pending = nvmlDeviceGetEccMode(handle)
+            curr_str = "Enabled" if (current != 0) else "Disabled"
+            pend_str = "Enabled" if (pending != 0) else "Disabled"
+        except NVMLError as err:
+            error = NvidiaSMI.__handleError(err)
+            curr_str = error
+            pend_str = error
 
-                if NVSMI_ALL in filter or NVSMI_COMPUTE_MODE in filter:
-                    try:
-                        mode = nvmlDeviceGetComputeMode(handle)
-                        if mode == NVML_COMPUTEMODE_DEFAULT:
-                            modeStr = "Default"
-                        elif mode == NVML_COMPUTEMODE_EXCLUSIVE_THREAD:
-                            modeStr = "Exclusive Thread"
-                        elif mode == NVML_COMPUTEMODE_PROHIBITED:
-                            modeStr = "Prohibited"
-                        elif mode == NVML_COMPUTEMODE_EXCLUSIVE_PROCESS:
-                            modeStr = "Exclusive_Process"
-                        else:
-                            modeStr = "Unknown"
-                    except NVMLError as err:
-                        modeStr = NvidiaSMI.__handleError(err)
+        eccMode = {}
+        if NVSMI_ECC_MODE_CUR in wanted:
+            eccMode["current_ecc"] = curr_str
 
-                    gpuResults["compute_mode"] = modeStr
+        if NVSMI_ECC_MODE_PENDING in wanted:
+            eccMode["pending_ecc"] = pend_str
 
-                utilization = {}
-                includeUtilization = False
-                if (
-                    NVSMI_ALL in filter
-                    or NVSMI_UTILIZATION_GPU in filter
-                    or NVSMI_UTILIZATION_MEM in filter
-                ):
+        gpuResults["ecc_mode"] = eccMode
 
-                    try:
-                        util = nvmlDeviceGetUtilizationRates(handle)
-                        gpu_util = util.gpu
-                        mem_util = util.memory
-                    except NVMLError as err:
-                        error = NvidiaSMI.__handleError(err)
-                        gpu_util = error
-                        mem_util = error
+    @staticmethod
+    def __queryEccErrors(handle, pciInfo, wanted, gpuResults):
+        eccErrors, includeEccErrors = NvidiaSMI.__GetEcc(handle, wanted)
+        if includeEccErrors:
+            gpuResults["ecc_errors"] = eccErrors
 
-                    if NVSMI_ALL in filter or NVSMI_UTILIZATION_GPU in filter:
-                        utilization["gpu_util"] = gpu_util
+    @staticmethod
+    def __queryRetiredPages(handle, pciInfo, wanted, gpuResults):
+        retiredPages, includeRetiredPages = NvidiaSMI.__GetRetiredPages(handle, wanted)
+        if includeRetiredPages:
+            gpuResults["retired_pages"] = retiredPages
 
-                    if NVSMI_ALL in filter or NVSMI_UTILIZATION_MEM in filter:
-                        utilization["memory_util"] = mem_util
+    @staticmethod
+    def __queryTemperature(handle, pciInfo, wanted, gpuResults):
+        temperature = {}
+        includeTemperature = False
 
-                    includeUtilization = True
+        if NVSMI_TEMPERATURE_GPU in wanted:
+            try:
+                temp = nvmlDeviceGetTemperature(handle, NVML_TEMPERATURE_GPU)
+            except NVMLError as err:
+                temp = NvidiaSMI.__handleError(err)
 
-                if NVSMI_ALL in filter or NVSMI_UTILIZATION_ENCODER in filter:
-                    try:
-                        (util_int, ssize) = nvmlDeviceGetEncoderUtilization(handle)
-                        encoder_util = util_int
-                    except NVMLError as err:
-                        error = NvidiaSMI.__handleError(err)
-                        encoder_util = error
+            temperature["gpu_temp"] = temp
+            includeTemperature = True
 
-                    utilization["encoder_util"] = encoder_util
-                    includeUtilization = True
-
-                if NVSMI_ALL in filter or NVSMI_UTILIZATION_DECODER in filter:
-                    try:
-                        (util_int, ssize) = nvmlDeviceGetDecoderUtilization(handle)
-                        decoder_util = util_int
-                    except NVMLError as err:
-                        error = NvidiaSMI.__handleError(err)
-                        decoder_util = error
+            try:
+                temp = nvmlDeviceGetTemperatureThreshold(
+                    handle, NVML_TEMPERATURE_THRESHOLD_SHUTDOWN
+                )
+            except NVMLError as err:
+                temp = NvidiaSMI.__handleError(err)
 
-                    utilization["decoder_util"] = decoder_util
-                    includeUtilization = True
+            temperature["gpu_temp_max_threshold"] = temp
+            includeTemperature = True
 
-                if includeUtilization:
-                    utilization["unit"] = "%"
-                    gpuResults["utilization"] = utilization
+            try:
+                temp = nvmlDeviceGetTemperatureThreshold(
+                    handle, NVML_TEMPERATURE_THRESHOLD_SLOWDOWN
+                )
+            except NVMLError as err:
+                temp = NvidiaSMI.__handleError(err)
 
-                if (
-                    NVSMI_ALL in filter
-                    or NVSMI_ECC_MODE_CUR in filter
-                    or NVSMI_ECC_MODE_PENDING in filter
-                ):
-                    try:
-                        (current, pending) = nvmlDeviceGetEccMode(handle)
-                        curr_str = "Enabled" if (current != 0) else "Disabled"
-                        pend_str = "Enabled" if (pending != 0) else "Disabled"
-                    except NVMLError as err:
-                        error = NvidiaSMI.__handleError(err)
-                        curr_str = error
-                        pend_str = error
+            temperature["gpu_temp_slow_threshold"] = temp
+            includeTemperature = True
 
-                    eccMode = {}
-                    if NVSMI_ALL in filter or NVSMI_ECC_MODE_CUR in filter:
-                        eccMode["current_ecc"] = curr_str
+        if includeTemperature:
+            temperature["unit"] = "C"
+            gpuResults["temperature"] = temperature
 
-                    if NVSMI_ALL in filter or NVSMI_ECC_MODE_PENDING in filter:
-                        eccMode["pending_ecc"] = pend_str
+    @staticmethod
+    def __queryPowerReadings(handle, pciInfo, wanted, gpuResults):
+        power_readings = {}
+        includePowerReadings = False
+        if NVSMI_POWER_MGMT in wanted:
+            try:
+                powMan = nvmlDeviceGetPowerManagementMode(handle)
+                powManStr = "Supported" if powMan != 0 else "N/A"
+            except NVMLError as err:
+                powManStr = NvidiaSMI.__handleError(err)
+            power_readings["power_management"] = powManStr
+            includePowerReadings = True
 
-                    gpuResults["ecc_mode"] = eccMode
+        if NVSMI_POWER_DRAW in wanted:
+            try:
+                powDraw = nvmlDeviceGetPowerUsage(handle) / 1000.0
+                powDrawStr = powDraw
+            except NVMLError as err:
+                powDrawStr = NvidiaSMI.__handleError(err)
+            power_readings["power_draw"] = powDrawStr
+            includePowerReadings = True
 
-                eccErrors, includeEccErrors = NvidiaSMI.__GetEcc(handle, filter)
-                if includeEccErrors:
-                    gpuResults["ecc_errors"] = eccErrors
+        if NVSMI_POWER_LIMIT in wanted:
+            try:
+                powLimit = nvmlDeviceGetPowerManagementLimit(handle) / 1000.0
+                powLimitStr = powLimit
+            except NVMLError as err:
+                powLimitStr = NvidiaSMI.__handleError(err)
+            power_readings["power_limit"] = powLimitStr
+            includePowerReadings = True
 
-                retiredPages, includeRetiredPages = NvidiaSMI.__GetRetiredPages(
-                    handle, filter
-                )
-                if includeRetiredPages:
-                    gpuResults["retired_pages"] = retiredPages
+        if NVSMI_POWER_LIMIT_DEFAULT in wanted:
+            try:
+                powLimit = nvmlDeviceGetPowerManagementDefaultLimit(handle) / 1000.0
+                powLimitStr = powLimit
+            except NVMLError as err:
+                powLimitStr = NvidiaSMI.__handleError(err)
+            power_readings["default_power_limit"] = powLimitStr
+            includePowerReadings = True
 
-                temperature = {}
-                includeTemperature = False
+        if NVSMI_POWER_LIMIT_ENFORCED in wanted:
+            try:
+                enforcedPowLimit = nvmlDeviceGetEnforcedPowerLimit(handle) / 1000.0
+                enforcedPowLimitStr = enforcedPowLimit
+            except NVMLError as err:
+                enforcedPowLimitStr = NvidiaSMI.__handleError(err)
 
-                if NVSMI_ALL in filter or NVSMI_TEMPERATURE_GPU in filter:
-                    try:
-                        temp = nvmlDeviceGetTemperature(handle, NVML_TEMPERATURE_GPU)
-                    except NVMLError as err:
-                        temp = NvidiaSMI.__handleError(err)
+            power_readings["enforced_power_limit"] = enforcedPowLimitStr
+            includePowerReadings = True
 
-                    temperature["gpu_temp"] = temp
-                    includeTemperature = True
+        if NVSMI_POWER_LIMIT_MIN in wanted or NVSMI_POWER_LIMIT_MAX in wanted:
+            try:
+                powLimit = nvmlDeviceGetPowerManagementLimitConstraints(handle)
+                powLimitStrMin = powLimit[0] / 1000.0
+                powLimitStrMax = powLimit[1] / 1000.0
+            except NVMLError as err:
+                error = NvidiaSMI.__handleError(err)
+                powLimitStrMin = error
+                powLimitStrMax = error
 
-                    try:
-                        temp = nvmlDeviceGetTemperatureThreshold(
-                            handle, NVML_TEMPERATURE_THRESHOLD_SHUTDOWN
-                        )
-                    except NVMLError as err:
-                        temp = NvidiaSMI.__handleError(err)
+            if NVSMI_POWER_LIMIT_MIN in wanted:
+                power_readings["min_power_limit"] = powLimitStrMin
+            if NVSMI_POWER_LIMIT_MAX in wanted:
+                power_readings["max_power_limit"] = powLimitStrMax
+            includePowerReadings = True
 
-                    temperature["gpu_temp_max_threshold"] = temp
-                    includeTemperature = True
+        if includePowerReadings:
+            try:
+                perfState = "P" + NvidiaSMI.__toString(nvmlDeviceGetPowerState(handle))
+            except NVMLError as err:
+                perfState = NvidiaSMI.__handleError(err)
+            power_readings["power_state"] = perfState
 
-                    try:
-                        temp = nvmlDeviceGetTemperatureThreshold(
-                            handle, NVML_TEMPERATURE_THRESHOLD_SLOWDOWN
-                        )
-                    except NVMLError as err:
-                        temp = NvidiaSMI.__handleError(err)
+            power_readings["unit"] = "W"
+            gpuResults["power_readings"] = power_readings
 
-                    temperature["gpu_temp_slow_threshold"] = temp
-                    includeTemperature = True
+    @staticmethod
+    def __queryClocks(handle, pciInfo, wanted, gpuResults):
+        clocks = {}
+        includeClocks = False
+        if NVSMI_CLOCKS_GRAPHICS_CUR in wanted:
+            try:
+                graphics = nvmlDeviceGetClockInfo(handle, NVML_CLOCK_GRAPHICS)
+            except NVMLError as err:
+                graphics = NvidiaSMI.__handleError(err)
+            clocks["graphics_clock"] = graphics
+            includeClocks = True
 
-                if includeTemperature:
-                    temperature["unit"] = "C"
-                    gpuResults["temperature"] = temperature
+        if NVSMI_CLOCKS_GRAPHICS_CUR in wanted:
+            try:
+                sm = nvmlDeviceGetClockInfo(handle, NVML_CLOCK_SM)
+            except NVMLError as err:
+                sm = NvidiaSMI.__handleError(err)
+            clocks["sm_clock"] = sm
+            includeClocks = True
 
-                power_readings = {}
-                includePowerReadings = False
-                if NVSMI_ALL in filter or NVSMI_POWER_MGMT in filter:
-                    try:
-                        powMan = nvmlDeviceGetPowerManagementMode(handle)
-                        powManStr = "Supported" if powMan != 0 else "N/A"
-                    except NVMLError as err:
-                        powManStr = NvidiaSMI.__handleError(err)
-                    power_readings["power_management"] = powManStr
-                    includePowerReadings = True
+        if NVSMI_CLOCKS_MEMORY_CUR in wanted:
+            try:
+                mem = nvmlDeviceGetClockInfo(handle, NVML_CLOCK_MEM)
+            except NVMLError as err:
+                mem = NvidiaSMI.__handleError(err)
+            clocks["mem_clock"] = mem
+            includeClocks = True
 
-                if NVSMI_ALL in filter or NVSMI_POWER_DRAW in filter:
-                    try:
-                        powDraw = nvmlDeviceGetPowerUsage(handle) / 1000.0
-                        powDrawStr = powDraw
-                    except NVMLError as err:
-                        powDrawStr = NvidiaSMI.__handleError(err)
-                    power_readings["power_draw"] = powDrawStr
-                    includePowerReadings = True
+        if includeClocks:
+            clocks["unit"] = "MHz"
+            gpuResults["clocks"] = clocks
 
-                if NVSMI_ALL in filter or NVSMI_POWER_LIMIT in filter:
-                    try:
-                        powLimit = nvmlDeviceGetPowerManagementLimit(handle) / 1000.0
-                        powLimitStr = powLimit
-                    except NVMLError as err:
-                        powLimitStr = NvidiaSMI.__handleError(err)
-                    power_readings["power_limit"] = powLimitStr
-                    includePowerReadings = True
-
-                if NVSMI_ALL in filter or NVSMI_POWER_LIMIT_DEFAULT in filter:
-                    try:
-                        powLimit = (
-                            nvmlDeviceGetPowerManagementDefaultLimit(handle) / 1000.0
-                        )
-                        powLimitStr = powLimit
-                    except NVMLError as err:
-                        powLimitStr = NvidiaSMI.__handleError(err)
-                    power_readings["default_power_limit"] = powLimitStr
-                    includePowerReadings = True
+    @staticmethod
+    def __queryApplicationsClocks(handle, pciInfo, wanted, gpuResults):
+        applicationClocks = {}
+        includeAppClocks = False
+        if NVSMI_CLOCKS_APPL_GRAPHICS in wanted:
+            try:
+                graphics = nvmlDeviceGetApplicationsClock(handle, NVML_CLOCK_GRAPHICS)
+            except NVMLError as err:
+                graphics = NvidiaSMI.__handleError(err)
+            applicationClocks["graphics_clock"] = graphics
+            includeAppClocks = True
 
-                if NVSMI_ALL in filter or NVSMI_POWER_LIMIT_ENFORCED in filter:
-                    try:
-                        enforcedPowLimit = (
-                            nvmlDeviceGetEnforcedPowerLimit(handle) / 1000.0
-                        )
-                        enforcedPowLimitStr = enforcedPowLimit
-                    except NVMLError as err:
-                        enforcedPowLimitStr = NvidiaSMI.__handleError(err)
+        if NVSMI_CLOCKS_APPL_MEMORY in wanted:
+            try:
+                mem = nvmlDeviceGetApplicationsClock(handle, NVML_CLOCK_MEM)
+            except NVMLError as err:
+                mem = NvidiaSMI.__handleError(err)
+            applicationClocks["mem_clock"] = mem
+            includeAppClocks = True
 
-                    power_readings["enforced_power_limit"] = enforcedPowLimitStr
-                    includePowerReadings = True
+        if includeAppClocks:
+            applicationClocks["unit"] = "MHz"
+            gpuResults["applications_clocks"] = applicationClocks
 
-                if (
-                    NVSMI_ALL in filter
-                    or NVSMI_POWER_LIMIT_MIN in filter
-                    or NVSMI_POWER_LIMIT_MAX in filter
-                ):
-                    try:
-                        powLimit = nvmlDeviceGetPowerManagementLimitConstraints(handle)
-                        powLimitStrMin = powLimit[0] / 1000.0
-                        powLimitStrMax = powLimit[1] / 1000.0
-                    except NVMLError as err:
-                        error = NvidiaSMI.__handleError(err)
-                        powLimitStrMin = error
-                        powLimitStrMax = error
+    @staticmethod
+    def __queryDefaultApplicationsClocks(handle, pciInfo, wanted, gpuResults):
+        defaultApplicationClocks = {}
+        includeDefaultAppClocks = False
 
-                    if NVSMI_ALL in filter or NVSMI_POWER_LIMIT_MIN in filter:
-                        power_readings["min_power_limit"] = powLimitStrMin
-                    if NVSMI_ALL in filter or NVSMI_POWER_LIMIT_MAX in filter:
-                        power_readings["max_power_limit"] = powLimitStrMax
-                    includePowerReadings = True
+        if NVSMI_CLOCKS_APPL_GRAPHICS_DEFAULT in wanted:
+            try:
+                graphics = nvmlDeviceGetDefaultApplicationsClock(
+                    handle, NVML_CLOCK_GRAPHICS
+                )
+            except NVMLError as err:
+                graphics = NvidiaSMI.__handleError(err)
+            defaultApplicationClocks["graphics_clock"] = graphics
+            includeDefaultAppClocks = True
 
-                if includePowerReadings:
-                    try:
-                        perfState = "P" + NvidiaSMI.__toString(
-                            nvmlDeviceGetPowerState(handle)
-                        )
-                    except NVMLError as err:
-                        perfState = NvidiaSMI.__handleError(err)
-                    power_readings["power_state"] = perfState
+        if NVSMI_CLOCKS_APPL_MEMORY_DEFAULT in wanted:
+            try:
+                mem = nvmlDeviceGetDefaultApplicationsClock(handle, NVML_CLOCK_MEM)
+            except NVMLError as err:
+                mem = NvidiaSMI.__handleError(err)
+            defaultApplicationClocks["mem_clock"] = mem
+            includeDefaultAppClocks = True
 
-                    power_readings["unit"] = "W"
-                    gpuResults["power_readings"] = power_readings
+        if includeDefaultAppClocks:
+            defaultApplicationClocks["unit"] = "MHz"
+            gpuResults["default_applications_clocks"] = defaultApplicationClocks
 
-                clocks = {}
-                includeClocks = False
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_GRAPHICS_CUR in filter:
-                    try:
-                        graphics = nvmlDeviceGetClockInfo(handle, NVML_CLOCK_GRAPHICS)
-                    except NVMLError as err:
-                        graphics = NvidiaSMI.__handleError(err)
-                    clocks["graphics_clock"] = graphics
-                    includeClocks = True
+    @staticmethod
+    def __queryMaxClocks(handle, pciInfo, wanted, gpuResults):
+        maxClocks = {}
+        includeMaxClocks = False
+        if NVSMI_CLOCKS_GRAPHICS_MAX in wanted:
+            try:
+                graphics = nvmlDeviceGetMaxClockInfo(handle, NVML_CLOCK_GRAPHICS)
+            except NVMLError as err:
+                graphics = NvidiaSMI.__handleError(err)
+            maxClocks["graphics_clock"] = graphics
+            includeMaxClocks = True
 
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_GRAPHICS_CUR in filter:
-                    try:
-                        sm = nvmlDeviceGetClockInfo(handle, NVML_CLOCK_SM)
-                    except NVMLError as err:
-                        sm = NvidiaSMI.__handleError(err)
-                    clocks["sm_clock"] = sm
-                    includeClocks = True
+        if NVSMI_CLOCKS_SM_MAX in wanted:
+            try:
+                sm = nvmlDeviceGetMaxClockInfo(handle, NVML_CLOCK_SM)
+            except NVMLError as err:
+                sm = NvidiaSMI.__handleError(err)
+            maxClocks["sm_clock"] = sm
+            includeMaxClocks = True
 
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_MEMORY_CUR in filter:
-                    try:
-                        mem = nvmlDeviceGetClockInfo(handle, NVML_CLOCK_MEM)
-                    except NVMLError as err:
-                        mem = NvidiaSMI.__handleError(err)
-                    clocks["mem_clock"] = mem
-                    includeClocks = True
+        if NVSMI_CLOCKS_MEMORY_MAX in wanted:
+            try:
+                mem = nvmlDeviceGetMaxClockInfo(handle, NVML_CLOCK_MEM)
+            except NVMLError as err:
+                mem = NvidiaSMI.__handleError(err)
+            maxClocks["mem_clock"] = mem
+            includeMaxClocks = True
 
-                if includeClocks:
-                    clocks["unit"] = "MHz"
-                    gpuResults["clocks"] = clocks
+        if includeMaxClocks:
+            maxClocks["unit"] = "MHz"
+            gpuResults["max_clocks"] = maxClocks
 
-                applicationClocks = {}
-                includeAppClocks = False
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_APPL_GRAPHICS in filter:
-                    try:
-                        graphics = nvmlDeviceGetApplicationsClock(
-                            handle, NVML_CLOCK_GRAPHICS
-                        )
-                    except NVMLError as err:
-                        graphics = NvidiaSMI.__handleError(err)
-                    applicationClocks["graphics_clock"] = graphics
-                    includeAppClocks = True
+    @staticmethod
+    def __queryClockPolicy(handle, pciInfo, wanted, gpuResults):
+        clockPolicy = {}
+        try:
+            (
+                boostedState,
+                boostedDefaultState,
+            ) = nvmlDeviceGetAutoBoostedClocksEnabled(handle)
+            if boostedState == NVML_FEATURE_DISABLED:
+                autoBoostStr = "Off"
+            else:
+                autoBoostStr = "On"
 
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_APPL_MEMORY in filter:
-                    try:
-                        mem = nvmlDeviceGetApplicationsClock(handle, NVML_CLOCK_MEM)
-                    except NVMLError as err:
-                        mem = NvidiaSMI.__handleError(err)
-                    applicationClocks["mem_clock"] = mem
-                    includeAppClocks = True
+            if boostedDefaultState == NVML_FEATURE_DISABLED:
+                autoBoostDefaultStr = "Off"
+            else:
+                autoBoostDefaultStr = "On"
 
-                if includeAppClocks:
-                    applicationClocks["unit"] = "MHz"
-                    gpuResults["applications_clocks"] = applicationClocks
+        except NVMLError_NotSupported:
+            autoBoostStr = "N/A"
+            autoBoostDefaultStr = "N/A"
+        except NVMLError as err:
+            autoBoostStr = NvidiaSMI.__handleError(err)
+            autoBoostDefaultStr = NvidiaSMI.__handleError(err)
 
-                defaultApplicationClocks = {}
-                includeDefaultAppClocks = False
+        clockPolicy["auto_boost"] = autoBoostStr
+        clockPolicy["auto_boost_default"] = autoBoostDefaultStr
+        gpuResults["clock_policy"] = clockPolicy
 
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_APPL_GRAPHICS_DEFAULT in filter:
-                    try:
-                        graphics = nvmlDeviceGetDefaultApplicationsClock(
-                            handle, NVML_CLOCK_GRAPHICS
-                        )
-                    except NVMLError as err:
-                        graphics = NvidiaSMI.__handleError(err)
-                    defaultApplicationClocks["graphics_clock"] = graphics
-                    includeDefaultAppClocks = True
+    @staticmethod
+    def __querySupportedClocks(handle, pciInfo, wanted, gpuResults):
+        supportedClocks = []
+        try:
+            memClocks = nvmlDeviceGetSupportedMemoryClocks(handle)
+            #                     jj = 1
+            for m in memClocks:
+                supportMemClock = {}
+                supportMemClock["current"] = m
+                supportMemClock["unit"] = "MHz"
+
+                supportedGraphicsClocks = []
+                try:
+                    clocks = nvmlDeviceGetSupportedGraphicsClocks(handle, m)
+                    for c in clocks:
+                        supportedGraphicsClocks.append(c)
+                except NVMLError as err:
+                    supportedGraphicsClocks = NvidiaSMI.__handleError(err)
+
+                supportMemClock["supported_graphics_clock"] = supportedGraphicsClocks
+
+                supportedClocks.append(supportMemClock)
+        #                         jj+=1
 
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_APPL_MEMORY_DEFAULT in filter:
-                    try:
-                        mem = nvmlDeviceGetDefaultApplicationsClock(
-                            handle, NVML_CLOCK_MEM
-                        )
-                    except NVMLError as err:
-                        mem = NvidiaSMI.__handleError(err)
-                    defaultApplicationClocks["mem_clock"] = mem
-                    includeDefaultAppClocks = True
+        except NVMLError as err:
+            supportedClocks = NvidiaSMI.__handleError(err)
 
-                if includeDefaultAppClocks:
-                    defaultApplicationClocks["unit"] = "MHz"
-                    gpuResults["default_applications_clocks"] = defaultApplicationClocks
+        gpuResults["supported_clocks"] = (
+            supportedClocks if len(supportedClocks) > 0 else None
+        )
 
-                maxClocks = {}
-                includeMaxClocks = False
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_GRAPHICS_MAX in filter:
-                    try:
-                        graphics = nvmlDeviceGetMaxClockInfo(
-                            handle, NVML_CLOCK_GRAPHICS
-                        )
-                    except NVMLError as err:
-                        graphics = NvidiaSMI.__handleError(err)
-                    maxClocks["graphics_clock"] = graphics
-                    includeMaxClocks = True
+    @staticmethod
+    def __queryComputeApps(handle, pciInfo, wanted, gpuResults):
+        processes = []
+        try:
+            procs = nvmlDeviceGetComputeRunningProcesses(handle)
+
+            #                     ii = 1
+            for p in procs:
+                try:
+                    name = NvidiaSMI.__toString(nvmlSystemGetProcessName(p.pid))
+                except NVMLError as err:
+                    if err.value == NVML_ERROR_NOT_FOUND:
+                        # probably went away
+                        continue
+                    else:
+                        name = NvidiaSMI.__handleError(err)
+                processInfo = {}
+                processInfo["pid"] = p.pid
+                processInfo["process_name"] = name
 
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_SM_MAX in filter:
-                    try:
-                        sm = nvmlDeviceGetMaxClockInfo(handle, NVML_CLOCK_SM)
-                    except NVMLError as err:
-                        sm = NvidiaSMI.__handleError(err)
-                    maxClocks["sm_clock"] = sm
-                    includeMaxClocks = True
+                if p.usedGpuMemory == None:
+                    mem = 0
+                else:
+                    mem = int(p.usedGpuMemory / 1024 / 1024)
+                processInfo["used_memory"] = mem
+                processInfo["unit"] = "MiB"
+                processes.append(processInfo)
+        #                          ii+=1
 
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_MEMORY_MAX in filter:
-                    try:
-                        mem = nvmlDeviceGetMaxClockInfo(handle, NVML_CLOCK_MEM)
-                    except NVMLError as err:
-                        mem = NvidiaSMI.__handleError(err)
-                    maxClocks["mem_clock"] = mem
-                    includeMaxClocks = True
+        except NVMLError as err:
+            processes = NvidiaSMI.__handleError(err)
 
-                if includeMaxClocks:
-                    maxClocks["unit"] = "MHz"
-                    gpuResults["max_clocks"] = maxClocks
+        gpuResults["processes"] = processes if len(processes) > 0 else None
 
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_POLICY in filter:
-                    clockPolicy = {}
-                    try:
-                        (
-                            boostedState,
-                            boostedDefaultState,
-                        ) = nvmlDeviceGetAutoBoostedClocksEnabled(handle)
-                        if boostedState == NVML_FEATURE_DISABLED:
-                            autoBoostStr = "Off"
-                        else:
-                            autoBoostStr = "On"
+    @staticmethod
+    def __queryAccountedApps(handle, pciInfo, wanted, gpuResults):
+        try:
+            pids = nvmlDeviceGetAccountingPids(handle)
+
+            accountProcess = []
+            #                      ii = 1
+            for pid in pids:
+                try:
+                    stats = nvmlDeviceGetAccountingStats(handle, pid)
+                    gpuUtilization = "%d %%" % stats.gpuUtilization
+                    memoryUtilization = "%d %%" % stats.memoryUtilization
+                    if stats.maxMemoryUsage == None:
+                        maxMemoryUsage = "N/A"
+                    else:
+                        maxMemoryUsage = "%d MiB" % (stats.maxMemoryUsage / 1024 / 1024)
+                    time = "%d ms" % stats.time
+                    is_running = "%d" % stats.isRunning
+                except NVMLError as err:
+                    if err.value == NVML_ERROR_NOT_FOUND:
+                        # probably went away
+                        continue
+                    err = NvidiaSMI.__handleError(err)
+                    gpuUtilization = err
+                    memoryUtilization = err
+                    maxMemoryUsage = err
+                    time = err
+                    is_running = err
+
+                accountProcessInfo = {}
+                accountProcessInfo["pid"] = "%d" % pid
+                accountProcessInfo["gpu_util"] = gpuUtilization
+                accountProcessInfo["memory_util"] = memoryUtilization
+                accountProcessInfo["max_memory_usage"] = maxMemoryUsage
+                accountProcessInfo["time"] = time
+                accountProcessInfo["is_running"] = is_running
+
+                accountProcess.append(accountProcessInfo)
+
+            gpuResults["accounted_processes"] = (
+                accountProcess if len(accountProcess) > 0 else None
+            )
+        #                          ii+=1
+        except NVMLError as err:
+            gpuResults["accounted_processes"] = NvidiaSMI.__handleError(err)
 
-                        if boostedDefaultState == NVML_FEATURE_DISABLED:
-                            autoBoostDefaultStr = "Off"
-                        else:
-                            autoBoostDefaultStr = "On"
+    @staticmethod
+    def __deviceQuerySections():
+        """
+        The device query sections in output order, with the NVSMI_* values selecting each and whether it reads
+        the pci info of the device
+        """
+        if NvidiaSMI.__sections is None:
+            NvidiaSMI.__sections = (
+                ({NVSMI_PCI_BUS_ID}, NvidiaSMI.__queryId, True),
+                ({NVSMI_NAME}, NvidiaSMI.__queryName, False),
+                ({NVSMI_DISPLAY_MODE}, NvidiaSMI.__queryDisplayMode, False),
+                ({NVSMI_DISPLAY_ACTIVE}, NvidiaSMI.__queryDisplayActive, False),
+                ({NVSMI_PERSISTENCE_MODE}, NvidiaSMI.__queryPersistenceMode, False),
+                ({NVSMI_ACCT_MODE}, NvidiaSMI.__queryAccountingMode, False),
+                (
+                    {NVSMI_ACCT_BUFFER_SIZE},
+                    NvidiaSMI.__queryAccountingBufferSize,
+                    False,
+                ),
+                (
+                    {NVSMI_DRIVER_MODEL_CUR, NVSMI_DRIVER_MODEL_PENDING},
+                    NvidiaSMI.__queryDriverModel,
+                    False,
+                ),
+                ({NVSMI_SERIALNUMBER}, NvidiaSMI.__querySerial, False),
+                ({NVSMI_UUID}, NvidiaSMI.__queryUuid, False),
+                ({NVSMI_INDEX}, NvidiaSMI.__queryMinorNumber, False),
+                ({NVSMI_VBIOS_VER}, NvidiaSMI.__queryVbios, False),
+                ({NVSMI_BOARD_ID}, NvidiaSMI.__queryBoardId, False),
+                (
+                    {
+                        NVSMI_INFOROM_IMG,
+                        NVSMI_INFOROM_OEM,
+                        NVSMI_INFOROM_ECC,
+                        NVSMI_INFOROM_PWR,
+                    },
+                    NvidiaSMI.__queryInforom,
+                    False,
+                ),
+                ({NVSMI_INFOROM_PWR}, NvidiaSMI.__queryGpuOperationMode, False),
+                (
+                    {
+                        NVSMI_ALL,  # Bridge chip, replay counter and throughput
+                        NVSMI_PCI_BUS,
+                        NVSMI_PCI_DEVICE,
+                        NVSMI_PCI_DOMAIN,
+                        NVSMI_PCI_DEVICE_ID,
+                        NVSMI_PCI_BUS_ID,
+                        NVSMI_PCI_SUBDEVICE_ID,
+                        NVSMI_PCI_LINK_GEN_MAX,
+                        NVSMI_PCI_LINK_GEN_CUR,
+                        NVSMI_PCI_LINK_WIDTH_MAX,
+                        NVSMI_PCI_LINK_WIDTH_CUR,
+                    },
+                    NvidiaSMI.__queryPci,
+                    True,
+                ),
+                ({NVSMI_FAN_SPEED}, NvidiaSMI.__queryFanSpeed, False),
+                ({NVSMI_PSTATE}, NvidiaSMI.__queryPerformanceState, False),
+                (
+                    {
+                        NVSMI_CLOCK_THROTTLE_REASONS_SUPPORTED,
+                        NVSMI_CLOCK_THROTTLE_REASONS_ACTIVE,
+                        NVSMI_CLOCK_THROTTLE_REASONS_IDLE,
+                        NVSMI_CLOCK_THROTTLE_REASONS_APP_SETTING,
+                        NVSMI_CLOCK_THROTTLE_REASONS_SW_PWR_CAP,
+                        NVSMI_CLOCK_THROTTLE_REASONS_HW_SLOWDOWN,
+                        NVSMI_CLOCK_THROTTLE_REASONS_HW_THERMAL_SLOWDOWN,
+                        NVSMI_CLOCK_THROTTLE_REASONS_HW_PWR_BRAKE_SLOWDOWN,
+                        NVSMI_CLOCK_THROTTLE_REASONS_SW_THERMAL_SLOWDOWN,
+                        NVSMI_CLOCK_THROTTLE_REASONS_SYNC_BOOST,
+                    },
+                    NvidiaSMI.__queryClocksThrottle,
+                    False,
+                ),
+                (
+                    {NVSMI_MEMORY_TOTAL, NVSMI_MEMORY_USED, NVSMI_MEMORY_FREE},
+                    NvidiaSMI.__queryFbMemoryUsage,
+                    False,
+                ),
+                ({NVSMI_MEMORY_BAR1}, NvidiaSMI.__queryBar1MemoryUsage, False),
+                ({NVSMI_COMPUTE_MODE}, NvidiaSMI.__queryComputeMode, False),
+                (
+                    {
+                        NVSMI_UTILIZATION_GPU,
+                        NVSMI_UTILIZATION_MEM,
+                        NVSMI_UTILIZATION_ENCODER,
+                        NVSMI_UTILIZATION_DECODER,
+                    },
+                    NvidiaSMI.__queryUtilization,
+                    False,
+                ),
+                (
+                    {NVSMI_ECC_MODE_CUR, NVSMI_ECC_MODE_PENDING},
+                    NvidiaSMI.__queryEccMode,
+                    False,
+                ),
+                (
+                    set(
+                        range(
+                            NVSMI_ECC_ERROR_CORRECTED_VOLATILE_DEV_MEM,
+                            NVSMI_ECC_ERROR_UNCORRECTED_AGGREGATE_TOTAL + 1,
+                        )
+                    ),
+                    NvidiaSMI.__queryEccErrors,
+                    False,
+                ),
+                (
+                    {
+                        NVSMI_RETIREDPAGES_SINGLE_BIT_ECC_COUNT,
+                        NVSMI_RETIREDPAGES_DOUBLE_BIT_ECC_COUNT,
+                        NVSMI_RETIREDPAGES_PENDING,
+                    },
+                    NvidiaSMI.__queryRetiredPages,
+                    False,
+                ),
+                ({NVSMI_TEMPERATURE_GPU}, NvidiaSMI.__queryTemperature, False),
+                (
+                    {
+                        NVSMI_POWER_MGMT,
+                        NVSMI_POWER_DRAW,
+                        NVSMI_POWER_LIMIT,
+                        NVSMI_POWER_LIMIT_ENFORCED,
+                        NVSMI_POWER_LIMIT_DEFAULT,
+                        NVSMI_POWER_LIMIT_MIN,
+                        NVSMI_POWER_LIMIT_MAX,
+                    },
+                    NvidiaSMI.__queryPowerReadings,
+                    False,
+                ),
+                (
+                    {NVSMI_CLOCKS_GRAPHICS_CUR, NVSMI_CLOCKS_MEMORY_CUR},
+                    NvidiaSMI.__queryClocks,
+                    False,
+                ),
+                (
+                    {NVSMI_CLOCKS_APPL_GRAPHICS, NVSMI_CLOCKS_APPL_MEMORY},
+                    NvidiaSMI.__queryApplicationsClocks,
+                    False,
+                ),
+                (
+                    {
+                        NVSMI_CLOCKS_APPL_GRAPHICS_DEFAULT,
+                        NVSMI_CLOCKS_APPL_MEMORY_DEFAULT,
+                    },
+                    NvidiaSMI.__queryDefaultApplicationsClocks,
+                    False,
+                ),
+                (
+                    {
+                        NVSMI_CLOCKS_GRAPHICS_MAX,
+                        NVSMI_CLOCKS_SM_MAX,
+                        NVSMI_CLOCKS_MEMORY_MAX,
+                    },
+                    NvidiaSMI.__queryMaxClocks,
+                    False,
+                ),
+                ({NVSMI_CLOCKS_POLICY}, NvidiaSMI.__queryClockPolicy, False),
+                ({NVSMI_CLOCKS_SUPPORTED}, NvidiaSMI.__querySupportedClocks, False),
+                ({NVSMI_COMPUTE_APPS}, NvidiaSMI.__queryComputeApps, False),
+                ({NVSMI_ACCOUNTED_APPS}, NvidiaSMI.__queryAccountedApps, False),
+            )
+        return NvidiaSMI.__sections
 
-                    except NVMLError_NotSupported:
-                        autoBoostStr = "N/A"
-                        autoBoostDefaultStr = "N/A"
-                    except NVMLError as err:
-                        autoBoostStr = NvidiaSMI.__handleError(err)
-                        autoBoostDefaultStr = NvidiaSMI.__handleError(err)
+    @staticmethod
+    def __compileDeviceQuery(filter):
+        """
+        Compile the NVSMI_* values of a filter to a DeviceQueryPlan with only the sections the filter selects.
+        NVSMI_ALL selects every value, so the sections test membership of single values in wanted.
+        """
+        sections = NvidiaSMI.__deviceQuerySections()
+        if NVSMI_ALL in filter:
+            wanted = {NVSMI_ALL, NVSMI_TIMESTAMP, NVSMI_DRIVER_VERSION, NVSMI_COUNT}
+            for triggers, _, _ in sections:
+                wanted.update(triggers)
+        else:
+            wanted = set(filter)
+        selected = [s for s in sections if not wanted.isdisjoint(s[0])]
+        return DeviceQueryPlan(
+            frozenset(wanted),
+            any(readsPciInfo for _, _, readsPciInfo in selected),
+            tuple(section for _, section, _ in selected),
+        )
 
-                    clockPolicy["auto_boost"] = autoBoostStr
-                    clockPolicy["auto_boost_default"] = autoBoostDefaultStr
-                    gpuResults["clock_policy"] = clockPolicy
+    @staticmethod
+    def __deviceQueryPlan(filter):
+        """The cached plan of a filter, string filters are parsed once"""
+        key = filter if filter is None or isinstance(filter, str) else tuple(filter)
+        try:
+            return NvidiaSMI.__plans[key]
+        except KeyError:
+            pass
+        if filter is None:
+            values = [NVSMI_ALL]
+        elif isinstance(filter, str):
+            values = NvidiaSMI.__fromDeviceQueryString(filter)
+        else:
+            values = key
+        plan = NvidiaSMI.__plans[key] = NvidiaSMI.__compileDeviceQuery(values)
+        return plan
 
-                if NVSMI_ALL in filter or NVSMI_CLOCKS_SUPPORTED in filter:
-                    supportedClocks = []
-                    try:
-                        memClocks = nvmlDeviceGetSupportedMemoryClocks(handle)
-                        #                     jj = 1
-                        for m in memClocks:
-                            supportMemClock = {}
-                            supportMemClock["current"] = m
-                            supportMemClock["unit"] = "MHz"
+    @classmethod
+    def DeviceQuery(self, filter=None):
+        """
+        Provides a Python interface to GPU management and monitoring functions.
 
-                            supportedGraphicsClocks = []
-                            try:
-                                clocks = nvmlDeviceGetSupportedGraphicsClocks(handle, m)
-                                for c in clocks:
-                                    supportedGraphicsClocks.append(c)
-                            except NVMLError as err:
-                                supportedGraphicsClocks = NvidiaSMI.__handleError(err)
+        This is a wrapper around the NVML library.
+        For information about the NVML library, see the NVML developer page
+        http://developer.nvidia.com/nvidia-management-library-nvml
 
-                            supportMemClock[
-                                "supported_graphics_clock"
-                            ] = supportedGraphicsClocks
+        Examples:
+        ---------------------------------------------------------------------------
+        For all elements as a list of dictionaries.  Similiar to nvisia-smi -q -x
 
-                            supportedClocks.append(supportMemClock)
-                    #                         jj+=1
+        $ DeviceQuery()
 
-                    except NVMLError as err:
-                        supportedClocks["Error"] = NvidiaSMI.__handleError(err)
+        ---------------------------------------------------------------------------
+        For a list of filtered dictionary elements by string name.
+        Similiar ot nvidia-smi --query-gpu=pci.bus_id,memory.total,memory.free
+        See help_query_gpu.txt or DeviceQuery("--help_query_gpu") for available filter elements
 
-                    gpuResults["supported_clocks"] = (
-                        supportedClocks if len(supportedClocks) > 0 else None
-                    )
+        $ DeviceQuery("pci.bus_id,memory.total,memory.free")
 
-                if NVSMI_ALL in filter or NVSMI_COMPUTE_APPS in filter:
-                    processes = []
-                    try:
-                        procs = nvmlDeviceGetComputeRunningProcesses(handle)
+        ---------------------------------------------------------------------------
+        For a list of filtered dictionary elements by enumeration value.
+        See help_query_gpu.txt or DeviceQuery("--help_query_gpu") for available filter elements
 
-                        #                     ii = 1
-                        for p in procs:
-                            try:
-                                name = NvidiaSMI.__toString(
-                                    nvmlSystemGetProcessName(p.pid)
-                                )
-                            except NVMLError as err:
-                                if err.value == NVML_ERROR_NOT_FOUND:
-                                    # probably went away
-                                    continue
-                                else:
-                                    name = NvidiaSMI.__handleError(err)
-                            processInfo = {}
-                            processInfo["pid"] = p.pid
-                            processInfo["process_name"] = name
+        $ DeviceQuery([NVSMI_PCI_BUS_ID, NVSMI_MEMORY_TOTAL, NVSMI_MEMORY_FREE])
 
-                            if p.usedGpuMemory == None:
-                                mem = 0
-                            else:
-                                mem = int(p.usedGpuMemory / 1024 / 1024)
-                            processInfo["used_memory"] = mem
-                            processInfo["unit"] = "MiB"
-                            processes.append(processInfo)
-                    #                          ii+=1
+        ---------------------------------------------------------------------------
+        Filters are compiled to a plan of the nvml getters they need once, repeated
+        queries with the same filter only make those calls.
 
-                    except NVMLError as err:
-                        processes = NvidiaSMI.__handleError(err)
+        """
 
-                    gpuResults["processes"] = processes if len(processes) > 0 else None
+        if isinstance(filter, str):
+            if (filter == "--help") or (filter == "-h"):
+                return NvidiaSMI.DeviceQuery.__doc__
+            elif filter == "--help-query-gpu":
+                with open("help_query_gpu.txt", "r") as fin:
+                    return fin.read()
 
-                if NVSMI_ALL in filter or NVSMI_ACCOUNTED_APPS in filter:
-                    try:
-                        pids = nvmlDeviceGetAccountingPids(handle)
+        plan = NvidiaSMI.__deviceQueryPlan(filter)
+        wanted = plan.wanted
 
-                        accountProcess = []
-                        #                      ii = 1
-                        for pid in pids:
-                            try:
-                                stats = nvmlDeviceGetAccountingStats(handle, pid)
-                                gpuUtilization = "%d %%" % stats.gpuUtilization
-                                memoryUtilization = "%d %%" % stats.memoryUtilization
-                                if stats.maxMemoryUsage == None:
-                                    maxMemoryUsage = "N/A"
-                                else:
-                                    maxMemoryUsage = "%d MiB" % (
-                                        stats.maxMemoryUsage / 1024 / 1024
-                                    )
-                                time = "%d ms" % stats.time
-                                is_running = "%d" % stats.isRunning
-                            except NVMLError as err:
-                                if err.value == NVML_ERROR_NOT_FOUND:
-                                    # probably went away
-                                    continue
-                                err = NvidiaSMI.__handleError(err)
-                                gpuUtilization = err
-                                memoryUtilization = err
-                                maxMemoryUsage = err
-                                time = err
-                                is_running = err
+        nvidia_smi_results = {}
+        dictResult = []
+        try:
+            if NVSMI_TIMESTAMP in wanted:
+                nvidia_smi_results["timestamp"] = NvidiaSMI.__toString(
+                    datetime.date.today()
+                )
+            if NVSMI_DRIVER_VERSION in wanted:
+                nvidia_smi_results["driver_version"] = NvidiaSMI.__toString(
+                    nvmlSystemGetDriverVersion()
+                )
 
-                            accountProcessInfo = {}
-                            accountProcessInfo["pid"] = "%d" % pid
-                            accountProcessInfo["gpu_util"] = gpuUtilization
-                            accountProcessInfo["memory_util"] = memoryUtilization
-                            accountProcessInfo["max_memory_usage"] = maxMemoryUsage
-                            accountProcessInfo["time"] = time
-                            accountProcessInfo["is_running"] = is_running
+            deviceCount = nvmlDeviceGetCount()
+            if NVSMI_COUNT in wanted:
+                nvidia_smi_results["count"] = deviceCount
 
-                            accountProcess.append(accountProcessInfo)
+            for i in range(0, deviceCount):
+                gpuResults = {}
+                handle = self.__handles[i]
 
-                        gpuResults["accounted_processes"] = (
-                            accountProcess if len(accountProcess) > 0 else None
-                        )
-                    #                          ii+=1
-                    except NVMLError as err:
-                        gpuResults["accounted_processes"] = NvidiaSMI.__handleError(err)
+                pciInfo = nvmlDeviceGetPciInfo(handle) if plan.readsPciInfo else None
+                for section in plan.sections:
+                    section(handle, pciInfo, wanted, gpuResults)
 
                 if len(gpuResults) > 0:
                     dictResult.append(gpuResults)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Asyncio publisher loop, due collectors run on a bounded thread pool and publishes happen on a drift-free
+           monotonic timer.
+           """
+
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from heimdallr.utilities.publisher.collectors import Collector, CollectorRegistry
+
+__all__ = ["AsyncPublisher", "drift_free_ticks"]
+
+
+async def _woken(wake: asyncio.Event, timeout: float) -> bool:
+    """Wait for wake to be set, clearing it, or for timeout seconds"""
+    try:
+        await asyncio.wait_for(wake.wait(), timeout)
+    except asyncio.TimeoutError:
+        return False
+    wake.clear()
+    return True
+
+
+async def drift_free_ticks(
+    interval_sec: float, wake: Optional[asyncio.Event] = None
+) -> AsyncIterator[int]:
+    """
+    Yield tick numbers at start + n * interval_sec on the event loop's monotonic clock.
+
+    Ticks are scheduled from the start time rather than from the previous tick, so time spent by the consumer
+    does not accumulate as drift. Ticks that were missed entirely, because the consumer overran, are skipped.
+
+    Args:
+      interval_sec: Seconds between ticks
+      wake: Setting it yields an extra tick immediately, numbered like the previous tick, without moving the
+        schedule
+    """
+    loop = asyncio.get_event_loop()  # The running loop, get_running_loop is 3.7+
+    start = loop.time()
+    tick = 0
+    while True:
+        yield tick
+        now = loop.time()
+        next_tick = max(tick + 1, int((now - start) // interval_sec) + 1)
+        delay = start + next_tick * interval_sec - now
+        if wake is None:
+            await asyncio.sleep(delay)
+        elif await _woken(wake, delay):
+            continue
+        tick = next_tick
+
+
+class AsyncPublisher:
+    """
+    Runs the due collectors concurrently every tick and publishes the latest values of all collectors together.
+
+    Each collector is awaited with its own timeout, a collector that does not finish in time contributes its
+    previous value instead of delaying the payload. A collector is never submitted again while a previous call
+    is still running, so the executor queue is bounded by the number of collectors. `wake` publishes out of
+    band, e.g. on an nvml event.
+    """
+
+    def __init__(
+        self,
+        collectors: CollectorRegistry,
+        publish: Callable[[Dict[str, Any]], None],
+        interval_sec: float,
+        collector_timeout_sec: float,
+        max_workers: int = 2,
+    ):
+        """
+
+        Args:
+          collectors: The collectors, sampled at their own periods
+          publish: Called with the collected values every tick
+          interval_sec: Seconds between publishes
+          collector_timeout_sec: Seconds each collector is waited for every tick
+          max_workers: Number of threads running collectors
+        """
+        self.collectors = collectors
+        self.publish = publish
+        self.interval_sec = interval_sec
+        self.collector_timeout_sec = collector_timeout_sec
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="collector"
+        )
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    def __enter__(self) -> "AsyncPublisher":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Stop the executor, abandoning queued collector calls from python 3.9"""
+        if sys.version_info >= (3, 9):
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        else:  # At most one queued call per collector runs before the threads exit
+            self._executor.shutdown(wait=False)
+
+    @staticmethod
+    def _store(collector: Collector, future: asyncio.Future) -> None:
+        """Done callback, also keeps results of calls that finish after their timeout"""
+        if future.cancelled():
+            return
+        e = future.exception()
+        if e is not None:
+            print(
+                f"Collector {collector.name} failed, publishing its previous value: {e}"
+            )
+        else:
+            collector.store(future.result())
+
+    async def collect(self) -> Dict[str, Any]:
+        """Latest value of every collector, after giving each a timeout to produce a fresh one"""
+        loop = asyncio.get_event_loop()
+        now = loop.time()
+        for collector in self.collectors.due(now, slack_sec=self.interval_sec / 2):
+            future = self._in_flight.get(collector.name)
+            if future is None or future.done():
+                collector.started(now)
+                future = self._in_flight[collector.name] = loop.run_in_executor(
+                    self._executor, collector.func
+                )
+                future.add_done_callback(partial(self._store, collector))
+        futures = {
+            name: future
+            for name, future in self._in_flight.items()
+            if not future.done()
+        }
+
+        timeout = self.collector_timeout_sec
+        results = await asyncio.gather(
+            *(asyncio.wait((future,), timeout=timeout) for future in futures.values())
+        )
+        for name, (_, not_done) in zip(futures, results):
+            if not_done:
+                print(f"Collector {name} timed out, publishing its previous value")
+        return self.collectors.latest()
+
+    def wake(self) -> None:
+        """Collect and publish now instead of at the next tick, callable from any thread"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    async def run(self) -> None:
+        """Collect and publish every interval_sec and when woken, forever"""
+        self._wake = asyncio.Event()
+        self._loop = asyncio.get_event_loop()
+        async for _ in drift_free_ticks(self.interval_sec, self._wake):
+            self.publish(await self.collect())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Registry of publisher collectors, each sampled at its own period and merged from cache into every
+           published message.
+           """
+
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+__all__ = ["Collector", "CollectorRegistry"]
+
+
+class Collector:
+    """A named callable producing one key of the published payload, and its latest value"""
+
+    __slots__ = ("name", "func", "period_sec", "cost", "value", "has_value", "next_due")
+
+    def __init__(
+        self, name: str, func: Callable[[], Any], period_sec: float, cost: float = 1.0
+    ):
+        """
+
+        Args:
+          name: Key of the value in the published payload
+          func: Blocking callable producing the value
+          period_sec: Minimum seconds between calls of func
+          cost: Relative cost of a call, weighed against the registry cost budget
+        """
+        self.name = name
+        self.func = func
+        self.period_sec = period_sec
+        self.cost = cost
+        self.value = None
+        self.has_value = False
+        self.next_due = float("-inf")
+
+    def started(self, now: float) -> None:
+        """Mark a call of func started at now"""
+        self.next_due = now + self.period_sec
+
+    def expire(self) -> None:
+        """Make the collector due now, e.g. when its value is known to be stale"""
+        self.next_due = float("-inf")
+
+    def store(self, value: Any) -> None:
+        """Cache the result of a call"""
+        self.value = value
+        self.has_value = True
+
+    def run(self, now: float) -> None:
+        """Call func and cache its result"""
+        self.started(now)
+        self.store(self.func())
+
+
+class CollectorRegistry:
+    """
+    Collectors with independent sampling periods.
+
+    Every publish tick only the collectors that are due are called, the message merges the latest cached value
+    of every collector. With a cost budget, the most overdue collectors are run first and the remaining due ones
+    are deferred to a later tick once the budget of the tick is spent, so expensive collectors that happen to
+    be due together are spread over ticks.
+    """
+
+    def __init__(self, cost_budget: Optional[float] = None):
+        """
+
+        Args:
+          cost_budget: Maximum summed cost of collectors run per tick, None for no limit. The most overdue due
+            collector always runs.
+        """
+        self.cost_budget = cost_budget
+        self._collectors: Dict[str, Collector] = {}
+
+    def register(
+        self, name: str, func: Callable[[], Any], period_sec: float, cost: float = 1.0
+    ) -> Collector:
+        """Register func as the producer of the payload key name, see Collector"""
+        collector = self._collectors[name] = Collector(name, func, period_sec, cost)
+        return collector
+
+    def __getitem__(self, name: str) -> Collector:
+        return self._collectors[name]
+
+    def __iter__(self) -> Iterator[Collector]:
+        return iter(self._collectors.values())
+
+    def __len__(self) -> int:
+        return len(self._collectors)
+
+    def due(
+        self, now: Optional[float] = None, slack_sec: float = 0.0
+    ) -> List[Collector]:
+        """
+        Collectors to run this tick, most overdue first.
+
+        Args:
+          now: Monotonic time of the tick, time.monotonic() by default
+          slack_sec: Collectors due within slack_sec after now are due now, e.g. half the tick interval so
+            jitter of the publish timer does not postpone a collector a whole tick
+
+        Returns:
+          The due collectors within the cost budget
+        """
+        if now is None:
+            now = time.monotonic()
+        due = sorted(
+            (c for c in self._collectors.values() if c.next_due <= now + slack_sec),
+            key=lambda c: c.next_due,
+        )
+        if self.cost_budget is None:
+            return due
+        selected = []
+        spent = 0.0
+        for collector in due:
+            if selected and spent + collector.cost > self.cost_budget:
+                continue
+            spent += collector.cost
+            selected.append(collector)
+        return selected
+
+    def latest(self) -> Dict[str, Any]:
+        """The latest value of every collector that has produced one"""
+        return {c.name: c.value for c in self._collectors.values() if c.has_value}
+
+    def collect(self, slack_sec: float = 0.0) -> Dict[str, Any]:
+        """Run the due collectors in the calling thread, then return the latest values of all"""
+        now = time.monotonic()
+        for collector in self.due(now, slack_sec):
+            try:
+                collector.run(now)
+            except Exception as e:
+                print(
+                    f"Collector {collector.name} failed, publishing its previous value: {e}"
+                )
+        return self.latest()
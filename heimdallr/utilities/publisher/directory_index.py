@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Incremental size index of large directory trees, e.g. shared dataset and checkpoint volumes, totalled
+           per top-level directory and per user.
+           """
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence
+
+try:
+    import pwd
+except ImportError:  # Windows
+    pwd = None
+
+__all__ = ["DirectoryIndex", "DirectoryIndexer"]
+
+
+@lru_cache(maxsize=None)
+def username(uid: int) -> str:
+    """The name of uid, the uid itself if it has no passwd entry"""
+    if pwd is not None:
+        try:
+            return pwd.getpwuid(uid).pw_name
+        except KeyError:
+            pass
+    return str(uid)
+
+
+class DirectoryNode:
+    """One indexed directory, its mtime when scanned, its subdirectories and the usage of its own files per uid"""
+
+    __slots__ = ("mtime_ns", "subdirs", "sizes", "files")
+
+    def __init__(self, mtime_ns: int, subdirs: List[str], sizes: Dict, files: Dict):
+        self.mtime_ns = mtime_ns
+        self.subdirs = subdirs
+        self.sizes = sizes
+        self.files = files
+
+
+def scan_directory(path: str) -> DirectoryNode:
+    """
+    One scandir pass over path, not following symlinks.
+
+    Sizes are allocated bytes, like du, where the platform reports them and apparent sizes elsewhere.
+    """
+    mtime_ns = os.stat(
+        path
+    ).st_mtime_ns  # Before listing, so changes during the scan trigger a rescan
+    subdirs = []
+    sizes = {}
+    files = {}
+    with os.scandir(path) as entries:
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file(follow_symlinks=False):
+                    st = entry.stat(follow_symlinks=False)
+                    size = (
+                        st.st_blocks * 512 if hasattr(st, "st_blocks") else st.st_size
+                    )
+                    sizes[st.st_uid] = sizes.get(st.st_uid, 0) + size
+                    files[st.st_uid] = files.get(st.st_uid, 0) + 1
+            except OSError:  # Removed while scanning
+                continue
+    return DirectoryNode(mtime_ns, subdirs, sizes, files)
+
+
+def stat_mtime_ns(path: str) -> int:
+    """The mtime of path, -1 if it no longer exists"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+class DirectoryIndex:
+    """
+    Size index of the tree under root, kept up to date by mtime diffing instead of rescanning.
+
+    The first `refresh` walks the whole tree, scanning directories concurrently on the executor. Later refreshes
+    only stat every indexed directory and rescan those whose mtime changed, meaning entries were added, removed
+    or renamed in them, walking new subdirectories and dropping removed ones. Writes to existing files do not
+    change the mtime of their directory, so directories modified within `hot_window_sec` are rescanned on every
+    refresh too, which catches e.g. checkpoints that are still being written.
+    """
+
+    def __init__(
+        self, root: Path, executor: ThreadPoolExecutor, hot_window_sec: float = 600.0
+    ):
+        """
+
+        Args:
+          root: The directory to index
+          executor: Runs the stat and scandir calls
+          hot_window_sec: Directories modified this recently are rescanned on every refresh
+        """
+        self.root = str(root)
+        self.executor = executor
+        self.hot_window_sec = hot_window_sec
+        self._nodes: Dict[str, DirectoryNode] = {}
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def _drop(self, path: str) -> None:
+        """Remove path and everything indexed below it"""
+        stack = [path]
+        while stack:
+            node = self._nodes.pop(stack.pop(), None)
+            if node is not None:
+                stack.extend(node.subdirs)
+
+    def _walk(self, paths: Iterable[str]) -> None:
+        """(Re)scan paths, and walk the subdirectories that are not indexed yet"""
+        pending = {self.executor.submit(scan_directory, p): p for p in paths}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    node = future.result()
+                except OSError:
+                    self._drop(path)
+                    continue
+                previous = self._nodes.get(path)
+                self._nodes[path] = node
+                if previous is not None:
+                    for removed in set(previous.subdirs).difference(node.subdirs):
+                        self._drop(removed)
+                for subdir in node.subdirs:
+                    if subdir not in self._nodes:
+                        pending[self.executor.submit(scan_directory, subdir)] = subdir
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the tree"""
+        if not self._nodes:
+            self._walk([self.root])
+            return
+        paths = list(self._nodes)
+        hot_ns = int((time.time() - self.hot_window_sec) * 1e9)  # time_ns is 3.7+
+        changed = []
+        for path, mtime_ns in zip(paths, self.executor.map(stat_mtime_ns, paths)):
+            node = self._nodes.get(path)
+            if node is None:  # Dropped with its parent
+                continue
+            if mtime_ns < 0:
+                self._drop(path)
+            elif mtime_ns != node.mtime_ns or mtime_ns > hot_ns:
+                changed.append(path)
+        self._walk(p for p in changed if p in self._nodes)
+
+    def top_level(self, path: str) -> str:
+        """The top-level directory under root containing path, root itself for root"""
+        relative = os.path.relpath(path, self.root)
+        if relative == os.curdir:
+            return self.root
+        return os.path.join(self.root, relative.split(os.sep, 1)[0])
+
+    def totals(self) -> Dict[str, List[Dict]]:
+        """
+        Returns:
+          A dict with the keys directories, the size and number of files under each top-level directory, and
+          users, the size and number of files each user owns under root
+        """
+        directories = {}
+        users = {}
+        for path, node in list(self._nodes.items()):
+            directory = directories.setdefault(
+                self.top_level(path), {"size": 0, "files": 0}
+            )
+            for uid, size in node.sizes.items():
+                user = users.setdefault(uid, {"size": 0, "files": 0})
+                user["size"] += size
+                user["files"] += node.files[uid]
+                directory["size"] += size
+                directory["files"] += node.files[uid]
+        return {
+            "directories": [{"path": p, **t} for p, t in directories.items()],
+            "users": [
+                {"user": username(uid), "path": self.root, **t}
+                for uid, t in users.items()
+            ],
+        }
+
+
+class DirectoryIndexer(threading.Thread):
+    """
+    Keeps a DirectoryIndex of each directory up to date in a background daemon thread.
+
+    Collectors read the totals of the last completed refresh, they never wait on the file system.
+    """
+
+    def __init__(
+        self,
+        directories: Sequence[Path],
+        interval_sec: float = 60.0,
+        max_workers: int = 4,
+        hot_window_sec: float = 600.0,
+    ):
+        """
+
+        Args:
+          directories: The directories to index
+          interval_sec: Seconds between the starts of consecutive refreshes
+          max_workers: Number of threads running stat and scandir calls
+          hot_window_sec: See DirectoryIndex
+        """
+        super().__init__(name="directory-indexer", daemon=True)
+        self.interval_sec = interval_sec
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="directory-scan"
+        )
+        self.indices = [
+            DirectoryIndex(d, self._executor, hot_window_sec) for d in directories
+        ]
+        self._totals = {"directories": [], "users": []}
+        self._stop_event = threading.Event()
+
+    def refresh(self) -> None:
+        """Refresh all indices and publish their totals"""
+        totals = {"directories": [], "users": []}
+        updated = time.time()
+        for index in self.indices:
+            index.refresh()
+            for k, v in index.totals().items():
+                totals[k].extend({**t, "updated": updated} for t in v)
+        self._totals = totals
+
+    def run(self) -> None:
+        """description"""
+        try:
+            while not self._stop_event.is_set():
+                start = time.monotonic()
+                self.refresh()
+                self._stop_event.wait(
+                    max(0.0, self.interval_sec - (time.monotonic() - start))
+                )
+        finally:
+            if sys.version_info >= (3, 9):
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            else:
+                self._executor.shutdown(wait=False)
+
+    def stop(self) -> None:
+        """Stop after the current refresh"""
+        self._stop_event.set()
+
+    def totals(self) -> Dict[str, List[Dict]]:
+        """The per top-level directory and per user totals of the last completed refresh"""
+        return self._totals
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Disk usage of the mounted filesystems.
+           """
+
+import os
+import re
+import select
+import time
+from typing import Dict, List, Optional, Sequence
+
+import psutil
+
+__all__ = [
+    "Mount",
+    "MountTable",
+    "PSEUDO_FILESYSTEMS",
+    "parse_mountinfo",
+    "partition_usage",
+]
+
+MOUNTINFO_PATH = "/proc/self/mountinfo"
+
+PSEUDO_FILESYSTEMS = frozenset(
+    (
+        "autofs",
+        "binfmt_misc",
+        "bpf",
+        "cgroup",
+        "cgroup2",
+        "configfs",
+        "debugfs",
+        "devpts",
+        "devtmpfs",
+        "efivarfs",
+        "fusectl",
+        "hugetlbfs",
+        "mqueue",
+        "nsfs",
+        "proc",
+        "pstore",
+        "ramfs",
+        "rpc_pipefs",
+        "securityfs",
+        "squashfs",
+        "sysfs",
+        "tmpfs",
+        "tracefs",
+    )
+)
+
+OCTAL_ESCAPE = re.compile(r"\\([0-7]{3})")
+
+
+def unescape_mount_field(field: str) -> str:
+    """Mountinfo escapes space, tab, newline and backslash as octal, e.g. \\040"""
+    return OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), field)
+
+
+class Mount:
+    """A mounted filesystem"""
+
+    __slots__ = ("device", "mountpoint", "fstype", "device_id")
+
+    def __init__(self, device: str, mountpoint: str, fstype: str, device_id: str):
+        self.device = device
+        self.mountpoint = mountpoint
+        self.fstype = fstype
+        self.device_id = device_id
+
+    def __repr__(self) -> str:
+        return f"Mount({self.device!r}, {self.mountpoint!r}, {self.fstype!r})"
+
+
+def parse_mountinfo(
+    lines: Sequence[str], pseudo_filesystems=PSEUDO_FILESYSTEMS
+) -> List[Mount]:
+    """
+    The real filesystems of a mountinfo table, each filesystem once.
+
+    A filesystem mounted more than once, e.g. by bind mounts, is identified by its major:minor device id and
+    only its first mountpoint is kept, so its usage is not reported twice.
+
+    Args:
+      lines: Lines of /proc/<pid>/mountinfo
+      pseudo_filesystems: Filesystem types to leave out
+
+    Returns:
+      The mounts in mount order
+    """
+    mounts = []
+    seen = set()
+    for line in lines:
+        fields, separator, tail = line.partition(" - ")
+        if not separator:
+            continue
+        fields = fields.split()
+        fstype, source, *_ = tail.split()
+        device_id = fields[2]
+        if fstype in pseudo_filesystems or device_id in seen:
+            continue
+        seen.add(device_id)
+        mounts.append(
+            Mount(
+                unescape_mount_field(source),
+                unescape_mount_field(fields[4]),
+                fstype,
+                device_id,
+            )
+        )
+    return mounts
+
+
+class MountTable:
+    """
+    Cached list of mounted real filesystems.
+
+    On Linux the table is re-read only when the kernel signals a change of /proc/self/mountinfo, by POLLPRI on
+    an open handle of the file. Elsewhere psutil.disk_partitions is re-read at most every
+    `fallback_refresh_interval_sec` seconds.
+    """
+
+    def __init__(self, fallback_refresh_interval_sec: float = 60.0):
+        """
+
+        Args:
+          fallback_refresh_interval_sec: Seconds between re-reads when mount changes cannot be polled
+        """
+        self.fallback_refresh_interval_sec = fallback_refresh_interval_sec
+        self._mounts: Optional[List[Mount]] = None
+        self._last_refresh = 0.0
+        self._file = None
+        self._poll = None
+        if hasattr(select, "poll") and os.path.exists(MOUNTINFO_PATH):
+            self._file = open(MOUNTINFO_PATH)
+            self._poll = select.poll()
+            self._poll.register(self._file, select.POLLPRI | select.POLLERR)
+
+    def _changed(self) -> bool:
+        if self._mounts is None:
+            return True
+        if self._poll is not None:
+            return bool(self._poll.poll(0))
+        return (
+            time.monotonic() - self._last_refresh > self.fallback_refresh_interval_sec
+        )
+
+    def _read(self) -> List[Mount]:
+        if self._file is not None:
+            self._file.seek(0)  # Also re-arms the change notification
+            return parse_mountinfo(self._file.read().splitlines())
+        return [
+            Mount(p.device, p.mountpoint, p.fstype, p.device)
+            for p in psutil.disk_partitions(all=False)
+            if p.fstype not in PSEUDO_FILESYSTEMS
+        ]
+
+    @property
+    def mounts(self) -> List[Mount]:
+        """The current mounts, re-read only if the table changed"""
+        if self._changed():
+            self._mounts = self._read()
+            self._last_refresh = time.monotonic()
+        return self._mounts
+
+
+def partition_usage(mounts: Sequence[Mount]) -> List[Dict]:
+    """
+    statvfs every mount in one pass, mounts that cannot be stat'ed (e.g. unreachable network filesystems or
+    missing permissions) are left out.
+
+    Used, free and percent follow psutil.disk_usage and df, free is what is available to unprivileged users.
+    """
+    partitions = []
+    for mount in mounts:
+        try:
+            st = os.statvfs(mount.mountpoint)
+        except OSError:
+            continue
+        if not st.f_blocks:
+            continue
+        total = st.f_blocks * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        partitions.append(
+            {
+                "mountpoint": mount.mountpoint,
+                "device": mount.device,
+                "fstype": mount.fstype,
+                "total": total,
+                "used": used,
+                "free": free,
+                "percent": round(used / (used + free) * 100, 1) if used + free else 0.0,
+            }
+        )
+    return partitions
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Watches nvml events on a dedicated thread, so the publisher can publish important changes immediately
+           and otherwise publish rarely.
+           """
+
+import threading
+import time
+from ctypes import c_void_p, cast
+from typing import Callable, Dict, Optional
+
+from heimdallr.utilities.nvidia import bindings
+
+__all__ = ["IMPORTANT_EVENT_TYPES", "NvmlEventWatcher"]
+
+IMPORTANT_EVENT_TYPES = (
+    bindings.nvmlEventTypeXidCriticalError
+    | bindings.nvmlEventTypeDoubleBitEccError
+    | bindings.nvmlEventTypePState  # Work starting or stopping on a device
+    | bindings.nvmlEventTypeClock
+)
+
+
+class NvmlEventWatcher(threading.Thread):
+    """
+    Blocks in nvmlEventSetWait for events of the devices and calls `on_event` when one arrives.
+
+    Calls are spaced at least `min_interval_sec` apart, events arriving in between are coalesced into one call
+    made when the interval has passed, so a device changing clocks rapidly does not flood the publisher. nvml
+    has no event for processes starting or exiting, performance state changes are the closest signal.
+    """
+
+    def __init__(
+        self,
+        on_event: Callable[[int, int, int], None],
+        event_types: int = IMPORTANT_EVENT_TYPES,
+        min_interval_sec: float = 2.0,
+        wait_timeout_ms: int = 1000,
+    ):
+        """
+
+        Args:
+          on_event: Called on the watcher thread with the device index, event type and event data of the first
+            of the coalesced events, e.g. the xid of an xid error
+          event_types: Bit mask of the nvmlEventType* to watch, devices not supporting a type skip it
+          min_interval_sec: Minimum seconds between calls of on_event
+          wait_timeout_ms: Milliseconds each wait blocks, the watcher stops at most this late
+        """
+        super().__init__(name="nvml-events", daemon=True)
+        self.on_event = on_event
+        self.event_types = event_types
+        self.min_interval_sec = min_interval_sec
+        self.wait_timeout_ms = wait_timeout_ms
+        self.events = 0
+        self.notified = 0
+        self._event_set = None
+        self._devices: Dict[int, int] = {}  # Handle address -> device index
+        self._stop_event = threading.Event()
+
+    def register(self) -> int:
+        """
+        Create the event set and register the devices, initialising nvml if needed.
+
+        Returns:
+          The number of devices registered, 0 when there is no driver or no device supports the event types
+        """
+        try:
+            try:
+                count = bindings.nvmlDeviceGetCount()
+            except bindings.NVMLError_Uninitialized:
+                bindings.nvmlInit()
+                count = bindings.nvmlDeviceGetCount()
+            self._event_set = bindings.nvmlEventSetCreate()
+        except bindings.NVMLError as e:
+            print(f"nvml events unavailable: {e}")
+            return 0
+
+        for index in range(count):
+            try:
+                handle = bindings.nvmlDeviceGetHandleByIndex(index)
+                supported = bindings.nvmlDeviceGetSupportedEventTypes(handle)
+                if supported & self.event_types:
+                    bindings.nvmlDeviceRegisterEvents(
+                        handle, supported & self.event_types, self._event_set
+                    )
+                    self._devices[cast(handle, c_void_p).value] = index
+            except bindings.NVMLError as e:
+                print(f"nvml events unavailable for device {index}: {e}")
+        return len(self._devices)
+
+    def _wait(self, timeout_ms: int) -> Optional[bindings.c_nvmlEventData_t]:
+        try:
+            return bindings.nvmlEventSetWait(self._event_set, timeout_ms)
+        except bindings.NVMLError_Timeout:
+            return None
+
+    def run(self) -> None:
+        """description"""
+        if self._event_set is None and not self.register():
+            return
+        pending = None  # First event since the last call of on_event
+        last_notified = float("-inf")
+        try:
+            while not self._stop_event.is_set():
+                timeout_ms = self.wait_timeout_ms
+                if pending is not None:  # Wake when the pending events may be passed on
+                    due_ms = (
+                        last_notified + self.min_interval_sec - time.monotonic()
+                    ) * 1000
+                    timeout_ms = max(1, min(timeout_ms, int(due_ms) + 1))
+                data = self._wait(timeout_ms)
+                if data is not None:
+                    self.events += 1
+                    if pending is None:
+                        pending = (
+                            self._devices.get(cast(data.device, c_void_p).value, -1),
+                            data.eventType,
+                            data.eventData,
+                        )
+                if pending is not None:
+                    now = time.monotonic()
+                    if now - last_notified >= self.min_interval_sec:
+                        last_notified = now
+                        self.notified += 1
+                        try:
+                            self.on_event(*pending)
+                        except Exception as e:
+                            print(f"Failed to handle nvml event {pending}: {e}")
+                        pending = None
+        except bindings.NVMLError as e:  # E.g. a lost gpu, routine publishes continue
+            print(f"Stopped watching nvml events: {e}")
+        finally:
+            try:
+                bindings.nvmlEventSetFree(self._event_set)
+            except bindings.NVMLError:
+                pass
+
+    def stop(self) -> None:
+        """Stop after the current wait"""
+        self._stop_event.set()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Cached, batched sampling of process information for the publisher.
+           """
+
+import time
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+import psutil
+
+__all__ = ["ProcessCache", "STATIC_PROCESS_ATTRIBUTES"]
+
+PSUTIL_ERRORS = (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess)
+
+STATIC_PROCESS_ATTRIBUTES = ("name", "username", "cmdline", "create_time")
+
+ATTRIBUTE_READERS: Dict[str, Callable[[psutil.Process], object]] = {
+    "cmdline": lambda process: " ".join(process.cmdline()),
+}
+
+
+class CachedProcess:
+    """A tracked process, its attributes that are immutable for the life of the pid and the tick it was last seen"""
+
+    __slots__ = ("process", "static", "last_seen")
+
+    def __init__(self, process: psutil.Process, static: Dict, last_seen: int):
+        self.process = process
+        self.static = static
+        self.last_seen = last_seen
+
+
+class ProcessCache:
+    """
+    Pid keyed cache of psutil.Process objects and their static attributes.
+
+    Only the attributes in the attribute plan are read, each batch of reads happening inside
+    Process.oneshot() so /proc/<pid>/stat and friends are parsed once. Entries are keyed on (pid, create_time)
+    so a reused pid is never mistaken for the process that previously held it. Static attributes (name,
+    username, cmdline, create_time) are read once, volatile ones (memory percent, cpu percent, status) are read
+    on every tick. Entries not seen for `max_idle_ticks` ticks are evicted.
+
+    psutil computes cpu_percent as the cpu time delta since the previous call on the same Process object,
+    so keeping the objects between ticks reuses the delta since the previous publish tick. Only processes not
+    seen before are primed, all at once, followed by a single sleep of `cpu_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        attributes: Sequence[str] = (
+            *STATIC_PROCESS_ATTRIBUTES,
+            "memory_percent",
+            "cpu_percent",
+            "status",
+        ),
+        max_idle_ticks: int = 5,
+        cpu_interval: float = 0.1,
+    ):
+        """
+
+        Args:
+          attributes: The attribute plan, names of psutil.Process accessors to read for every process
+          max_idle_ticks: Number of ticks an entry may go unseen before it is evicted
+          cpu_interval: Seconds to sleep after priming newly seen processes, 0.1 is recommended by psutil
+        """
+        self.static_attributes = tuple(
+            a for a in attributes if a in STATIC_PROCESS_ATTRIBUTES
+        )
+        self.volatile_attributes = tuple(
+            a for a in attributes if a not in STATIC_PROCESS_ATTRIBUTES
+        )
+        self.sample_cpu = "cpu_percent" in self.volatile_attributes
+        self.max_idle_ticks = max_idle_ticks
+        self.cpu_interval = cpu_interval
+        self._tick = 0
+        self._entries: Dict[Tuple[int, float], CachedProcess] = {}
+        self._keys: Dict[int, Tuple[int, float]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self._keys
+
+    def _entry(self, pid: int) -> CachedProcess:
+        """The live entry of pid, replacing entries whose pid has been reused by another process"""
+        key = self._keys.get(pid)
+        if key is not None:
+            entry = self._entries[key]
+            # is_running compares create_time, so pid reuse is detected
+            if entry.process.is_running():
+                return entry
+            self._evict(key)
+
+        process = psutil.Process(pid=pid)
+        with process.oneshot():
+            static = self._read(process, self.static_attributes)
+            if self.sample_cpu:
+                process.cpu_percent()  # Prime, the first call always returns 0.0
+        key = (pid, process.create_time())  # Cached by psutil.Process on construction
+        entry = self._entries[key] = CachedProcess(process, static, self._tick)
+        self._keys[pid] = key
+        return entry
+
+    @staticmethod
+    def _read(process: psutil.Process, attributes: Sequence[str]) -> Dict:
+        return {
+            a: (
+                ATTRIBUTE_READERS[a](process)
+                if a in ATTRIBUTE_READERS
+                else getattr(process, a)()
+            )
+            for a in attributes
+        }
+
+    def _evict(self, key: Tuple[int, float]) -> None:
+        del self._entries[key]
+        if self._keys.get(key[0]) == key:
+            del self._keys[key[0]]
+
+    def collect(self, pids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Read the information of all pids in one pass, advancing the cache by one tick.
+
+        Pids that have exited or are inaccessible are left out of the result.
+
+        Args:
+          pids: The pids to collect
+
+        Returns:
+          Mapping from pid to a dict of the planned attributes
+        """
+        self._tick += 1
+        entries = {}
+        primed = False
+        for pid in set(pids):
+            try:
+                entry = self._entry(pid)
+            except PSUTIL_ERRORS:
+                continue
+            primed |= entry.last_seen == self._tick  # Only new entries are this fresh
+            entry.last_seen = self._tick
+            entries[pid] = entry
+
+        if primed and self.sample_cpu and self.cpu_interval:
+            time.sleep(self.cpu_interval)
+
+        infos = {}
+        for pid, entry in entries.items():
+            process = entry.process
+            try:
+                with process.oneshot():
+                    infos[pid] = {
+                        **entry.static,
+                        **self._read(process, self.volatile_attributes),
+                    }
+            except PSUTIL_ERRORS:
+                self._evict(self._keys[pid])
+
+        for key in [
+            key
+            for key, entry in self._entries.items()
+            if self._tick - entry.last_seen > self.max_idle_ticks
+        ]:
+            self._evict(key)
+
+        return infos
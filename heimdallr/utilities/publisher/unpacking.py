@@ -1,6 +1,19 @@
+from typing import Optional
+
 from warg import NOD
 
+from heimdallr.configuration.heimdallr_config import (
+    DU_DIRECTORIES,
+    DU_DIRECTORY_HOT_WINDOW_SEC,
+    DU_DIRECTORY_INTERVAL_SEC,
+    DU_DIRECTORY_WORKERS,
+)
 from heimdallr.utilities.nvidia.packing import get_nv_info
+from heimdallr.utilities.publisher.directory_index import DirectoryIndexer
+from heimdallr.utilities.publisher.disk_usage import MountTable, partition_usage
+
+MOUNT_TABLE = MountTable()
+DIRECTORY_INDEXER: Optional[DirectoryIndexer] = None
 
 
 def pull_gpu_info(include_graphics_processes: bool = True) -> dict:
@@ -24,10 +37,33 @@ def pull_gpu_info(include_graphics_processes: bool = True) -> dict:
     return info.as_dict()
 
 
-def pull_disk_usage_info() -> dict:
-    """
+def pull_disk_usage_info(
+    mount_table: MountTable = MOUNT_TABLE, directories=DU_DIRECTORIES
+) -> dict:
+    """Get the usage of all mounted real filesystems and of the configured directories.
+
+    Returns:
+      dict: With 3 keys, partitions, directories and users:
+          partitions: A list of dicts with mountpoint, device, fstype, total, used, free (bytes) and percent
+          directories: A list of dicts with path, size (bytes), files and updated (timestamp of the index
+          refresh), one for every top-level directory of the configured directories
+          users: A list of dicts with user, path, size, files and updated, one for every user owning files in
+          each configured directory
+          The directories are indexed in a background thread started on the first call, so directories and
+          users are empty until the first walk completes"""
+    global DIRECTORY_INDEXER
+    if directories and DIRECTORY_INDEXER is None:
+        DIRECTORY_INDEXER = DirectoryIndexer(
+            directories,
+            interval_sec=DU_DIRECTORY_INTERVAL_SEC,
+            max_workers=DU_DIRECTORY_WORKERS,
+            hot_window_sec=DU_DIRECTORY_HOT_WINDOW_SEC,
+        )
+        DIRECTORY_INDEXER.start()
 
-    :return:
-    :rtype:
-    """
-    return {"disk_usage": {"total": 0, "used": 0, "free": 0}}
+    directory_totals = (
+        DIRECTORY_INDEXER.totals()
+        if DIRECTORY_INDEXER
+        else {"directories": [], "users": []}
+    )
+    return {"partitions": partition_usage(mount_table.mounts), **directory_totals}
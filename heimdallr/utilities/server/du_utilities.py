@@ -12,51 +12,53 @@ import numpy
 import pandas
 from pandas import DataFrame
 
-from heimdallr.configuration.heimdallr_config import (
-    DROP_COLUMNS,
-    INT_COLUMNS,
-    MB_COLUMNS,
-    PERCENT_COLUMNS,
-)
-from heimdallr.utilities.date_tools import timestamp_to_datetime
+from heimdallr.utilities.date_tools import timestamps_to_datetimes
 
-MB_DIVISOR = int(1024**2)
+GB_DIVISOR = int(1024**3)
+GB_COLUMNS = ["used", "free", "total", "size"]
 
 __all__ = [
     "to_overall_du_process_df",
+    "to_overall_du_directory_df",
+    "to_overall_du_user_df",
 ]
 
 
-def to_overall_du_process_df(gpu_stats: Mapping) -> DataFrame:
-    """description"""
+def to_machine_df(du_stats: Mapping, key: str, sort_by_key: str) -> DataFrame:
+    """One row per entry of du_stats[machine][key] of every machine, sizes in GB"""
     resulta = []
-    columns = []
-    if len(gpu_stats):
-        for k2, v2 in gpu_stats.items():
-            if "partitions" in v2:
-                for part_i in v2["partitions"]:
-                    df = pandas.DataFrame(data=part_i)
-                    resulta.append(df)
-        if len(resulta):
-            out_df = pandas.concat(resulta, sort=False)
-            out_df.sort_values(by="used_gpu_mem", axis=0, ascending=False, inplace=True)
-            if len(out_df) == 0:
-                return pandas.DataFrame()
-
-            k = columns
-            idx = ["machine", *k]
-            out_df = out_df[idx]
-            out_df.create_time = out_df.create_time.map(timestamp_to_datetime)
-
-            for c in INT_COLUMNS:
-                out_df[c] = out_df[c].astype(int)
-            for c in PERCENT_COLUMNS:
-                out_df[c] = numpy.round(out_df[c], 2)
-            for c in MB_COLUMNS:
-                out_df[c] = numpy.round(out_df[c] // MB_DIVISOR, 2)
-
-            out_cols = [c for c in out_df.columns if c not in DROP_COLUMNS]
-            out_df = out_df[out_cols]
-
-            return out_df
-    return pandas.DataFrame(data=["no data"], columns=["no data"])
+    for k2, v2 in du_stats.items():
+        if v2.get(key):
+            df = pandas.DataFrame(data=v2[key])
+            df.insert(0, "machine", k2)
+            resulta.append(df)
+    if not len(resulta):
+        return pandas.DataFrame(data=["no data"], columns=["no data"])
+
+    out_df = pandas.concat(resulta, sort=False)
+    out_df.sort_values(by=sort_by_key, axis=0, ascending=False, inplace=True)
+    for c in GB_COLUMNS:
+        if c in out_df:
+            out_df[c] = numpy.round(out_df[c] / GB_DIVISOR, 2)
+    return out_df
+
+
+def to_overall_du_process_df(du_stats: Mapping) -> DataFrame:
+    """Partitions of all machines, fullest first"""
+    return to_machine_df(du_stats, "partitions", sort_by_key="percent")
+
+
+def to_overall_du_directory_df(du_stats: Mapping) -> DataFrame:
+    """Top-level indexed directories of all machines, largest first"""
+    out_df = to_machine_df(du_stats, "directories", sort_by_key="size")
+    if "updated" in out_df:
+        out_df["updated"] = timestamps_to_datetimes(out_df["updated"])
+    return out_df
+
+
+def to_overall_du_user_df(du_stats: Mapping) -> DataFrame:
+    """Usage per user of the indexed directories of all machines, largest first"""
+    out_df = to_machine_df(du_stats, "users", sort_by_key="size")
+    if "updated" in out_df:
+        out_df["updated"] = timestamps_to_datetimes(out_df["updated"])
+    return out_df
@@ -8,76 +8,68 @@ __doc__ = r"""
            Function to get GPU information.
 """
 
-from typing import List, Mapping, Sequence
+from typing import List, Mapping, Tuple
 
-import numpy
-import pandas
-from dash import html
+from dash import Patch, html
 from dash.dcc import Graph
 from dash.html import Div, H3
 from pandas import DataFrame
 from plotly import graph_objs
 from warg import Number
 
-from heimdallr.configuration.heimdallr_config import (
-    DROP_COLUMNS,
-    INT_COLUMNS,
-    MB_COLUMNS,
-    PERCENT_COLUMNS,
-)
-from heimdallr.utilities.date_tools import timestamp_to_datetime
 from heimdallr.utilities.publisher.unpacking import pull_gpu_info
-
-MB_DIVISOR = int(1024**2)
+from heimdallr.utilities.server.process_table import MB_DIVISOR, gpu_process_columns
 
 __all__ = [
     "to_overall_gpu_process_df",
     "per_machine_per_device_pie_charts",
+    "pie_charts_signature",
+    "patch_pie_charts",
 ]
 
 
 def to_overall_gpu_process_df(
     gpu_stats: Mapping, sort_by_key="used_gpu_mem"
 ) -> DataFrame:
-    """description"""
-    resulta = []
-    columns = []
-    if len(gpu_stats):
-        for k2, v2 in gpu_stats.items():
-            device_info = v2["devices"]
-            for device_i in device_info:
-                processes = device_i["processes"]
-                if len(processes) > 0:
-                    columns = list(processes[0].keys())
-                df = pandas.DataFrame(data=processes)
-                df["machine"] = [k2] * len(processes)
-                resulta.append(df)
-
-    out_df = pandas.concat(resulta, sort=False)
+    """One row per gpu process of all machines, largest first, built once from gpu_process_columns"""
+    columns = gpu_process_columns(gpu_stats)
+    if sort_by_key not in columns:
+        return DataFrame()
+    out_df = DataFrame(columns)
     out_df.sort_values(by=sort_by_key, axis=0, ascending=False, inplace=True)
-    if len(out_df) == 0:
-        return pandas.DataFrame()
+    return out_df
 
-    k = columns
-    idx = ["machine", *k]
-    out_df = out_df[idx]
-    out_df.create_time = out_df.create_time.map(timestamp_to_datetime)
 
-    for c in INT_COLUMNS:
-        out_df[c] = out_df[c].astype(int)
-    for c in PERCENT_COLUMNS:
-        out_df[c] = numpy.round(out_df[c], 2)
-    for c in MB_COLUMNS:
-        out_df[c] = numpy.round(out_df[c] // MB_DIVISOR, 2)
+def pie_charts_signature(gpu_stats: Mapping) -> List:
+    """
+    The machines and devices of the pie charts, the component tree only has to be rebuilt when this changes.
+    A json compatible list, so it can be compared to the copy kept in the browser.
+    """
+    return [
+        [machine_name, [[d["id"], d["name"]] for d in machine["devices"]]]
+        for machine_name, machine in gpu_stats.items()
+    ]
 
-    out_cols = [c for c in out_df.columns if c not in DROP_COLUMNS]
-    out_df = out_df[out_cols]
 
-    return out_df
+def device_pie_values(device: Mapping) -> Tuple[List[float], List[str]]:
+    """The used ratio and hover text of the pie chart of device"""
+    used = device["used"] // MB_DIVISOR
+    total = device["total"] // MB_DIVISOR
+
+    used_ratio = used / total
+    used_ratio = [used_ratio] + [1.0 - used_ratio]
+
+    hover_text = [f"used:{used:.0f}mb", f"free:{total - used:.0f}mb"]
+    return used_ratio, hover_text
+
+
+def machine_title(machine_name: str, keep_alive: Mapping[str, Number]) -> str:
+    """description"""
+    return f"{machine_name}: {keep_alive[machine_name]} sec ago"
 
 
 def per_machine_per_device_pie_charts(
-    gpu_stats: Mapping, keep_alive: Sequence[Number]
+    gpu_stats: Mapping, keep_alive: Mapping[str, Number]
 ) -> List[html.Div]:
     """description"""
     compute_machines = []
@@ -86,13 +78,7 @@ def per_machine_per_device_pie_charts(
         devices = machine["devices"]
 
         for i, d in enumerate(devices):
-            used = d["used"] // MB_DIVISOR
-            total = d["total"] // MB_DIVISOR
-
-            used_ratio = used / total
-            used_ratio = [used_ratio] + [1.0 - used_ratio]
-
-            hover_text = [f"used:{used:.0f}mb", f"free:{total - used:.0f}mb"]
+            used_ratio, hover_text = device_pie_values(d)
 
             machine_devices.append(
                 Div(
@@ -126,7 +112,7 @@ def per_machine_per_device_pie_charts(
             Div(
                 [
                     H3(
-                        f"{machine_name}: {keep_alive[machine_name]} sec ago",
+                        machine_title(machine_name, keep_alive),
                         className="text-monospace",
                         style={"text-decoration": "underline"},
                     ),
@@ -141,6 +127,25 @@ def per_machine_per_device_pie_charts(
     return compute_machines
 
 
+def patch_pie_charts(gpu_stats: Mapping, keep_alive: Mapping[str, Number]) -> Patch:
+    """
+    Partial update of the children built by per_machine_per_device_pie_charts for the same signature, setting
+    only the titles and the pie values, so the browser neither re-creates the components nor re-lays out the
+    charts.
+    """
+    patch = Patch()
+    for machine_i, (machine_name, machine) in enumerate(gpu_stats.items()):
+        title, devices = (patch[machine_i]["props"]["children"][j] for j in (0, 1))
+        title["props"]["children"] = machine_title(machine_name, keep_alive)
+        for i, d in enumerate(machine["devices"]):
+            used_ratio, hover_text = device_pie_values(d)
+            graph = devices["props"]["children"][i]["props"]["children"][0]
+            pie = graph["props"]["figure"]["data"][0]
+            pie["values"] = used_ratio
+            pie["text"] = hover_text
+    return patch
+
+
 if __name__ == "__main__":
     infos = pull_gpu_info()
     print(infos)
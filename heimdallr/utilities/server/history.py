@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Fixed-size history of the gpu utilisation and memory of every device, with windowed aggregates.
+           """
+
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy
+
+__all__ = [
+    "DEVICE_METRICS",
+    "AGGREGATES",
+    "RingBuffer",
+    "aggregate",
+    "TelemetryHistory",
+    "history_rows",
+]
+
+
+def _memory_used(device: Mapping) -> Optional[float]:
+    total = device.get("total")
+    return 100 * device["used"] / total if total else None
+
+
+def _peak(metric: str) -> Callable[[Mapping], Optional[float]]:
+    """The max of the driver samples since the previous publish, the point reading when it sent none"""
+    summary = f"{metric}_max"
+    return lambda d: d.get(summary, d.get(metric))
+
+
+DEVICE_METRICS: Mapping[str, Callable[[Mapping], Optional[float]]] = {
+    "gpu_utilization": lambda d: d.get("gpu_utilization"),
+    "memory_utilization": lambda d: d.get("memory_utilization"),
+    "memory_used": _memory_used,
+    "gpu_utilization_peak": _peak("gpu_utilization"),
+    "memory_utilization_peak": _peak("memory_utilization"),
+}  # Percentages, None when a device does not report the metric
+AGGREGATES = ("min", "mean", "max", "p95")
+
+
+class RingBuffer:
+    """
+    The latest `capacity` samples of a fixed shaped array, e.g. every metric of every device of a host, with
+    their times. Appends overwrite the oldest sample in O(1), windows are selected and aggregated vectorised.
+    """
+
+    def __init__(self, capacity: int, shape: Sequence[int] = (), dtype=numpy.float32):
+        self.capacity = capacity
+        self.times = numpy.full(capacity, -numpy.inf)
+        self.values = numpy.full((capacity, *shape), numpy.nan, dtype=dtype)
+        self.head = 0  # Index of the next sample
+        self.count = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, t: float, value) -> None:
+        """Append the sample value taken at time t, times must be non-decreasing"""
+        self.times[self.head] = t
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def window(self, since: float) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """Copies of the times and values of the samples taken at or after since, oldest first"""
+        order = (self.head - self.count + numpy.arange(self.count)) % self.capacity
+        order = order[self.times[order] >= since]
+        return self.times[order], self.values[order]
+
+
+def aggregate(values: numpy.ndarray, shape: Sequence[int]) -> Dict[str, numpy.ndarray]:
+    """
+    min, mean, max and p95 over the first axis of values, ignoring nan, nan where there are no samples.
+
+    One sort gives min, max and p95, the latter interpolated between the closest ranks like numpy.nanpercentile
+    which is several times slower.
+    """
+    if not len(values):
+        empty = numpy.full(shape, numpy.nan)
+        return {k: empty for k in AGGREGATES}
+    ordered = numpy.sort(values, axis=0)  # nan last
+    missing = numpy.isnan(values)
+    n = numpy.count_nonzero(~missing, axis=0)
+    last = numpy.maximum(n - 1, 0)
+    rank = 0.95 * last
+    below = numpy.floor(rank).astype(numpy.intp)
+    above = numpy.minimum(below + 1, last)
+
+    def at(i: numpy.ndarray) -> numpy.ndarray:
+        return numpy.take_along_axis(ordered, i[None], axis=0)[0].astype(numpy.float64)
+
+    none = n == 0
+    total = numpy.where(missing, 0, values).sum(axis=0, dtype=numpy.float64)
+    return {
+        "min": numpy.where(none, numpy.nan, at(numpy.zeros_like(last))),
+        "mean": numpy.where(none, numpy.nan, total / numpy.maximum(n, 1)),
+        "max": numpy.where(none, numpy.nan, at(last)),
+        "p95": numpy.where(
+            none, numpy.nan, at(below) + (at(above) - at(below)) * (rank - below)
+        ),
+    }
+
+
+def to_json_values(a: numpy.ndarray) -> List:
+    """Nested lists of a rounded to 2 decimals, None for nan"""
+    out = numpy.round(a, 2).astype(object)
+    out[numpy.isnan(a)] = None
+    return out.tolist()
+
+
+class HostHistory:
+    """The device metrics of one host, the buffer is replaced when the devices of the host change"""
+
+    __slots__ = ("devices", "buffer")
+
+    def __init__(self, devices: List, buffer: RingBuffer):
+        self.devices = devices
+        self.buffer = buffer
+
+
+class TelemetryHistory:
+    """
+    The history of every metric of every device of every host, as one RingBuffer of shape (devices, metrics)
+    per host, filled as telemetry is ingested.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        windows_sec: Mapping[str, float],
+        metrics: Mapping[str, Callable[[Mapping], Optional[float]]] = DEVICE_METRICS,
+    ):
+        """
+
+        Args:
+          capacity: Samples kept per host, should cover the longest window at the publish interval
+          windows_sec: Name -> length in seconds of the windows aggregated over, e.g. {"5m": 300}
+          metrics: Name -> extracts the metric from the stats of a device
+        """
+        self.capacity = capacity
+        self.windows_sec = windows_sec
+        self.metrics = metrics
+        self._hosts: Dict[str, HostHistory] = {}
+        self._lock = threading.Lock()
+
+    def record(self, host: str, gpu_stats: Mapping, t: Optional[float] = None) -> None:
+        """Append the device metrics of gpu_stats, received at monotonic time t"""
+        if t is None:
+            t = time.monotonic()
+        devices = gpu_stats.get("devices", ())
+        ids = [(d["id"], d["name"]) for d in devices]
+        sample = [
+            [
+                numpy.nan if v is None else v
+                for v in (m(d) for m in self.metrics.values())
+            ]
+            for d in devices
+        ]
+        with self._lock:
+            history = self._hosts.get(host)
+            if history is None or history.devices != ids:  # New host or hot-plugged
+                history = self._hosts[host] = HostHistory(
+                    ids, RingBuffer(self.capacity, (len(ids), len(self.metrics)))
+                )
+            history.buffer.append(t, sample)
+
+    def forget(self, hosts: Sequence[str]) -> None:
+        """Remove the history of hosts"""
+        with self._lock:
+            for host in hosts:
+                self._hosts.pop(host, None)
+
+    def aggregates(self, now: Optional[float] = None) -> Dict[str, Dict]:
+        """
+        Returns:
+          host -> device id -> {"name", metric -> window -> aggregate -> value, None when there is no sample}
+        """
+        if now is None:
+            now = time.monotonic()
+        since = now - max(self.windows_sec.values())
+        with self._lock:  # Appends modify the buffers in place, copy the samples
+            samples = {
+                host: (h.devices, *h.buffer.window(since))
+                for host, h in self._hosts.items()
+            }
+        out = {}
+        for host, (devices, times, values) in samples.items():
+            shape = (len(devices), len(self.metrics))
+            per_window = {
+                w: {
+                    k: to_json_values(v)
+                    for k, v in aggregate(values[times >= now - sec], shape).items()
+                }
+                for w, sec in self.windows_sec.items()
+            }
+            out[host] = {}
+            for device_i, (device_id, name) in enumerate(devices):
+                device = out[host][device_id] = {"name": name}
+                for metric_i, metric in enumerate(self.metrics):
+                    device[metric] = {
+                        w: {k: a[k][device_i][metric_i] for k in AGGREGATES}
+                        for w, a in per_window.items()
+                    }
+        return out
+
+
+def history_rows(aggregates: Mapping[str, Dict]) -> List[Dict]:
+    """One table row per host, device and metric, with a column per window and aggregate"""
+    rows = []
+    for host, devices in aggregates.items():
+        for device_id, device in devices.items():
+            for metric, windows in device.items():
+                if metric == "name":
+                    continue
+                row = {"machine": host, "device": device_id, "metric": metric}
+                for w, values in windows.items():
+                    for k, v in values.items():
+                        row[f"{w} {k}"] = v
+                rows.append(row)
+    return rows
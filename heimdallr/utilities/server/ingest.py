@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Bounded hand-off of received mqtt payloads from the network thread to a batching ingest thread, and
+           the application of the batches to the server state.
+           """
+
+import collections
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Mapping, Optional, Tuple
+
+from heimdallr.utilities.messaging import DeltaDecoder, decode_payload
+from heimdallr.utilities.server.history import TelemetryHistory
+from heimdallr.utilities.server.process_table import GpuProcessTable
+from heimdallr.utilities.server.telemetry_store import TelemetryStore
+
+__all__ = ["IngestWorker", "PayloadApplier", "host_update"]
+
+
+class PayloadApplier:
+    """
+    Decodes batches of received payloads and applies them to the server state as one update, the `apply_batch`
+    of an IngestWorker.
+
+    Delta encoded host payloads are reconstructed by the delta decoder, the device metrics are recorded in the
+    history, and the process table is updated before the telemetry store, so the table is current once the store
+    version changes and is pushed to dashboards.
+    """
+
+    def __init__(
+        self,
+        telemetry: TelemetryStore,
+        process_table: GpuProcessTable,
+        history: TelemetryHistory,
+        delta_decoder: Optional[DeltaDecoder] = None,
+        log: Callable[[str], None] = print,
+    ):
+        """
+
+        Args:
+          telemetry: The store to apply the batches to
+          process_table: Updated with the gpu stats of the hosts of each batch
+          history: Records the device metrics of every ingested host payload
+          delta_decoder: Reconstructs delta encoded host payloads
+          log: Called with a line per batch and per undecodable payload
+        """
+        self.telemetry = telemetry
+        self.process_table = process_table
+        self.history = history
+        self.delta_decoder = DeltaDecoder() if delta_decoder is None else delta_decoder
+        self.log = log
+
+    def parse(self, payload: bytes) -> Dict[str, Tuple[Mapping, Mapping]]:
+        """
+        The (gpu_stats, du_stats) of the hosts of a payload, reconstructing delta encoded hosts.
+
+        Host entries that are not objects are skipped. Raises if the payload is malformed, in which case the
+        delta decoder forgets its hosts, as their decoded state is not applied.
+        """
+        d = decode_payload(payload)
+        if not isinstance(d, dict):
+            raise ValueError(f"Expected an object of hosts, got {type(d).__name__}")
+        updates = {}
+        try:
+            for key, host_payload in d.items():
+                if not isinstance(host_payload, dict):
+                    continue
+                if "kind" in host_payload:  # Delta encoded
+                    host_payload = self.delta_decoder.decode(key, host_payload)
+                    if host_payload is None:  # Missed a message, wait for a keyframe
+                        continue
+                updates[key] = host_update(host_payload)
+        except Exception:
+            for key in d:
+                self.delta_decoder.forget(key)
+            raise
+        return updates
+
+    def __call__(self, payloads: List[bytes], received: List[float]) -> int:
+        """
+        Apply a batch of payloads and their monotonic receive times, returns the number ingested.
+
+        Each payload is parsed on its own and only applied once it parsed completely, a malformed payload is
+        logged and skipped without affecting the rest of the batch.
+        """
+        updates = {}
+        received_at = {}
+        applied = 0
+        for payload, payload_received in zip(payloads, received):
+            try:
+                payload_updates = self.parse(payload)
+            except Exception as e:
+                self.log(f"malformed payload: {e!r}")
+                continue
+            for key, (gpu_stats, _) in payload_updates.items():
+                self.history.record(key, gpu_stats, payload_received)
+                received_at[key] = payload_received
+            updates.update(payload_updates)
+            applied += bool(payload_updates)  # Not if the decoder dropped every host
+        self.process_table.update(
+            {k: gpu_stats for k, (gpu_stats, _) in updates.items()}
+        )
+        self.telemetry.ingest_many(updates, received_at)
+        self.log(f"applied {applied} of {len(payloads)} payloads for {list(updates)}")
+        return applied
+
+
+def host_update(host_payload: Mapping) -> Tuple[Mapping, Mapping]:
+    """
+    The (gpu_stats, du_stats) of a host payload, {"gpu_stats": ..., "du_stats": ...} or the gpu_stats alone.
+
+    Raises ValueError if the devices or their processes are not lists of objects, or a device lacks its id or name.
+    """
+    if "gpu_stats" in host_payload:
+        gpu_stats = host_payload["gpu_stats"]
+        du_stats = host_payload.get("du_stats", {})
+    else:
+        gpu_stats, du_stats = host_payload, {}
+    if not isinstance(gpu_stats, dict) or not isinstance(du_stats, dict):
+        raise ValueError("gpu_stats and du_stats must be objects")
+    devices = gpu_stats.get("devices", [])
+    if not isinstance(devices, list) or not all(
+        isinstance(device, dict)
+        and "id" in device
+        and "name" in device
+        and isinstance(device.get("processes"), list)
+        and all(isinstance(p, dict) for p in device["processes"])
+        for device in devices
+    ):
+        raise ValueError("Malformed devices")
+    return gpu_stats, du_stats
+
+
+class IngestWorker(threading.Thread):
+    """
+    Applies received payloads in batches on a dedicated daemon thread.
+
+    `put` is called from the mqtt network thread and never blocks, when the queue is full the oldest queued
+    payload is dropped, as newer telemetry supersedes it. The worker drains up to `batch_size` payloads at a
+    time and hands them to `apply_batch` together, so a burst of messages results in one state update. Each
+    payload is passed with the monotonic time `put` received it, so time spent queued does not count towards
+    the age of its telemetry.
+    """
+
+    def __init__(
+        self,
+        apply_batch: Callable[[List[bytes], List[float]], int],
+        maxsize: int = 1000,
+        batch_size: int = 100,
+        rate_window_sec: float = 10.0,
+    ):
+        """
+
+        Args:
+          apply_batch: Applies a batch of payloads and their receive times, returning the number of payloads
+          applied
+          maxsize: Maximum number of queued payloads
+          batch_size: Maximum number of payloads per batch
+          rate_window_sec: Window of the per second rates
+        """
+        super().__init__(name="mqtt-ingest", daemon=True)
+        self.apply_batch = apply_batch
+        self.batch_size = batch_size
+        self.rate_window_sec = rate_window_sec
+        self.received = 0
+        self.dropped = 0
+        self.applied = 0
+        self.failed = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._samples = collections.deque()
+        self._stop_event = threading.Event()
+
+    def put(self, payload: bytes) -> None:
+        """Queue a payload, dropping the oldest queued payload if full"""
+        self.received += 1
+        item = (time.monotonic(), payload)
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _sample(self) -> None:
+        now = time.monotonic()
+        if self._samples and now - self._samples[-1][0] < 1.0:
+            return
+        self._samples.append((now, self.received, self.dropped, self.applied))
+        while now - self._samples[0][0] > self.rate_window_sec:
+            self._samples.popleft()
+
+    def run(self) -> None:
+        """description"""
+        while not self._stop_event.is_set():
+            self._sample()
+            try:
+                batch = [self._queue.get(timeout=1.0)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            received, payloads = zip(*batch)
+            try:
+                self.applied += self.apply_batch(list(payloads), list(received))
+            except Exception as e:
+                self.failed += len(batch)
+                print(f"Failed to ingest {len(batch)} payloads: {e}")
+
+    def stop(self) -> None:
+        """Stop after the current batch"""
+        self._stop_event.set()
+
+    def stats(self) -> Dict[str, float]:
+        """Totals since start, and per second rates over the last rate_window_sec seconds"""
+        totals = {
+            "received": self.received,
+            "dropped": self.dropped,
+            "applied": self.applied,
+            "failed": self.failed,
+            "queued": self._queue.qsize(),
+        }
+        rates = {
+            "received_per_sec": 0.0,
+            "dropped_per_sec": 0.0,
+            "applied_per_sec": 0.0,
+        }
+        if self._samples:
+            since, received, dropped, applied = self._samples[0]
+            elapsed = time.monotonic() - since
+            if elapsed > 0:
+                rates = {
+                    "received_per_sec": (self.received - received) / elapsed,
+                    "dropped_per_sec": (self.dropped - dropped) / elapsed,
+                    "applied_per_sec": (self.applied - applied) / elapsed,
+                }
+        return {**totals, **rates}
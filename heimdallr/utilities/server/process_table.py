@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Fleet gpu process table maintained incrementally from per host row blocks.
+           """
+
+import itertools
+import operator
+import threading
+from typing import Callable, Dict, Iterable, List, Mapping, Tuple
+
+from heimdallr.configuration.heimdallr_config import (
+    DROP_COLUMNS,
+    INT_COLUMNS,
+    MB_COLUMNS,
+    PERCENT_COLUMNS,
+)
+from heimdallr.utilities.date_tools import timestamps_to_datetimes
+
+__all__ = ["gpu_process_columns", "gpu_process_rows", "GpuProcessTable"]
+
+MB_DIVISOR = int(1024**2)
+
+
+def _map_present(func: Callable, column: List, *args) -> List:
+    """func(v, *args) of the values of column that are not None"""
+    if None in column:
+        return [None if v is None else func(v, *args) for v in column]
+    return list(map(func, column, *(itertools.repeat(a, len(column)) for a in args)))
+
+
+def gpu_process_columns(gpu_stats: Mapping) -> Dict[str, List]:
+    """
+    The formatted table columns of the gpu processes of all machines, in the order of gpu_stats.
+
+    The columns are filled in a single traversal of the stats, values a process does not report are None, and
+    the conversions are applied per column, create_time with timestamps_to_datetimes.
+
+    Args:
+      gpu_stats: Mapping from machine to its gpu stats
+
+    Returns:
+      Mapping from column to values, machine first and the rest in order of first appearance, empty if there are
+      no processes
+    """
+    columns = {"machine": []}
+    n = 0
+    for machine, stats in gpu_stats.items():
+        for device in stats.get("devices", ()):
+            for process in device["processes"]:
+                for k, v in process.items():
+                    if k in DROP_COLUMNS:
+                        continue
+                    column = columns.get(k)
+                    if column is None:  # Pad rows of processes without k
+                        column = columns[k] = [None] * n
+                    column.append(v)
+                n += 1
+                columns["machine"].append(machine)
+                for column in columns.values():  # Pad columns this process lacks
+                    if len(column) < n:
+                        column.append(None)
+    if n == 0:
+        return {}
+
+    for k, column in columns.items():
+        if k == "create_time":
+            columns[k] = timestamps_to_datetimes(column).tolist()
+        elif k in INT_COLUMNS:
+            columns[k] = _map_present(int, column)
+        elif k in PERCENT_COLUMNS:
+            columns[k] = _map_present(round, column, 2)
+        elif k in MB_COLUMNS:
+            columns[k] = _map_present(operator.floordiv, column, MB_DIVISOR)
+    return columns
+
+
+def gpu_process_rows(
+    machine: str, gpu_stats: Mapping, sort_by_key: str = "used_gpu_mem"
+) -> List[Dict]:
+    """
+    The formatted table rows of the gpu processes of one machine, largest first, see gpu_process_columns.
+
+    Values a process does not report are left out of its row.
+    """
+    columns = gpu_process_columns({machine: gpu_stats})
+    keys = list(columns)
+    rows = [
+        {k: v for k, v in zip(keys, values) if v is not None}
+        for values in zip(*columns.values())
+    ]
+    rows.sort(key=lambda r: r.get(sort_by_key) or 0, reverse=True)
+    return rows
+
+
+class GpuProcessTable:
+    """
+    The gpu process table of all hosts, kept as one pre-formatted row block per host.
+
+    Blocks are formatted when a host's telemetry is ingested, so a message only costs the formatting of the
+    rows of its own host. The fleet table is a merge of the already sorted blocks, done once per version and
+    shared by all readers. Like the TelemetryStore, writers swap in a new host to block mapping under a lock and
+    readers never wait on a writer.
+    """
+
+    def __init__(self, sort_by_key: str = "used_gpu_mem"):
+        self.sort_by_key = sort_by_key
+        self._lock = threading.Lock()
+        self._blocks: Mapping[str, Tuple[List[Dict], Dict]] = {}
+        self._version = 0
+        self._merged: Tuple[int, List[Dict], List[str]] = (0, [], [])
+
+    @property
+    def version(self) -> int:
+        """Incremented on every change"""
+        return self._version
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def _block(self, host: str, gpu_stats: Mapping) -> Tuple[List[Dict], Dict]:
+        rows = gpu_process_rows(host, gpu_stats, self.sort_by_key)
+        columns = {}
+        for row in rows:
+            columns.update(dict.fromkeys(row))
+        return rows, columns
+
+    def update(self, updates: Mapping[str, Mapping]) -> None:
+        """Replace the row blocks of the hosts in updates, host -> gpu_stats"""
+        if not updates:
+            return
+        blocks = {
+            host: self._block(host, gpu_stats) for host, gpu_stats in updates.items()
+        }  # Formatted outside the lock
+        with self._lock:
+            self._blocks = {**self._blocks, **blocks}
+            self._version += 1
+
+    def remove(self, hosts: Iterable[str]) -> None:
+        """Remove the row blocks of hosts"""
+        hosts = set(hosts)
+        with self._lock:
+            if hosts.isdisjoint(self._blocks):
+                return
+            self._blocks = {k: v for k, v in self._blocks.items() if k not in hosts}
+            self._version += 1
+
+    def _merge(self) -> Tuple[int, List[Dict], List[str]]:
+        with self._lock:
+            version, blocks = self._version, self._blocks
+        merged = self._merged
+        if merged[0] == version:
+            return merged
+        rows = sorted(  # Timsort merges the already sorted blocks as runs
+            itertools.chain.from_iterable(b for b, _ in blocks.values()),
+            key=lambda r: r.get(self.sort_by_key) or 0,
+            reverse=True,
+        )
+        columns = {}
+        for _, block_columns in blocks.values():
+            columns.update(block_columns)
+        merged = (version, rows, list(columns))
+        self._merged = merged  # Concurrent merges of the same version are equal
+        return merged
+
+    def rows(self) -> List[Dict]:
+        """All rows, largest first, must be treated as read-only"""
+        return self._merge()[1]
+
+    def columns(self) -> List[str]:
+        """The columns of the rows in order of first appearance, machine first"""
+        return self._merge()[2]
+
+    def snapshot(self) -> Tuple[int, List[Dict], List[str]]:
+        """A consistent (version, rows, columns)"""
+        return self._merge()
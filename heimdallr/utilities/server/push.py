@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Server-sent events notifying dashboards of telemetry changes, instead of dashboards polling for them.
+           """
+
+import json
+import time
+from typing import Callable, Iterator, Mapping, Optional
+
+__all__ = ["version_events"]
+
+
+def version_events(
+    wait: Callable[[Optional[int], float], int],
+    describe: Callable[[], Mapping],
+    keep_alive_sec: float = 15.0,
+    min_interval_sec: float = 2.0,
+    max_duration_sec: float = 300.0,
+    retry_ms: int = 2000,
+) -> Iterator[str]:
+    """
+    A text/event-stream of version changes, starting with the current version.
+
+    Changes arriving within min_interval_sec of the previous event are coalesced into one event. A comment is
+    sent when nothing changed for keep_alive_sec, which keeps proxies from timing out the stream and lets the
+    server notice disconnected clients. The stream ends after max_duration_sec, the browser then reconnects
+    after retry_ms.
+
+    Args:
+      wait: Blocks until the version differs from the given version or the timeout passed, returns the version
+      describe: The data of an event, e.g. the current versions
+      keep_alive_sec: Seconds between keep-alive comments while nothing changes
+      min_interval_sec: Minimum seconds between events
+      max_duration_sec: Seconds until the stream ends
+      retry_ms: Reconnection delay for the browser
+    """
+    deadline = time.monotonic() + max_duration_sec
+    yield f"retry: {retry_ms}\n\n"
+    version = None
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        current = wait(version, min(keep_alive_sec, remaining))
+        if current == version:
+            yield ": keep-alive\n\n"
+            continue
+        version = current
+        yield f"data: {json.dumps(describe())}\n\n"
+        time.sleep(min_interval_sec)
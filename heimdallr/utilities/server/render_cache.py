@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Render once, serve many cache of dashboard callback outputs.
+           """
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+__all__ = ["RenderCache"]
+
+
+class RenderCache:
+    """
+    The latest output of each named render, keyed on the state it was rendered from, e.g. the telemetry store
+    version.
+
+    Every open browser triggers the dashboard callbacks on its own interval, with the cache the outputs are only
+    computed by the first callback after the state changed and reused by all others. Concurrent callbacks for the
+    same stale output wait for the one rendering it instead of rendering it again.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Hashable, Any]] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _lock(self, name: str) -> threading.Lock:
+        lock = self._locks.get(name)
+        if lock is None:
+            with self._locks_lock:
+                lock = self._locks.setdefault(name, threading.Lock())
+        return lock
+
+    def get(self, name: str, key: Hashable, render: Callable[[], Any]) -> Any:
+        """
+        Args:
+          name: Name of the output
+          key: The state the output is rendered from, the cached output is reused while the key is equal
+          render: Computes the output
+
+        Returns:
+          The output for key
+        """
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry[1]
+        with self._lock(name):
+            entry = self._entries.get(name)
+            if entry is not None and entry[0] == key:  # Rendered while waiting
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            output = render()
+            self._entries[name] = (key, output)
+            return output
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Backend filtering, sorting and paging of DataTable rows, for tables with page_action, sort_action and
+           filter_action "custom".
+           """
+
+import math
+import operator
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+__all__ = [
+    "split_filter_part",
+    "filter_rows",
+    "sort_rows",
+    "query_rows",
+    "page_rows",
+    "table_columns",
+]
+
+FILTER_PART = re.compile(
+    r"^\s*\{(?P<column>[^}]+)\}\s+(?P<op>\S+)\s*(?P<value>.*?)\s*$"
+)
+
+
+def _contains(cell: Any, value: Any) -> bool:
+    return str(value) in str(cell)
+
+
+def _starts_with(cell: Any, value: Any) -> bool:
+    return str(cell).startswith(str(value))
+
+
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "eq": operator.eq,
+    "=": operator.eq,
+    "ne": operator.ne,
+    "!=": operator.ne,
+    "lt": operator.lt,
+    "<": operator.lt,
+    "le": operator.le,
+    "<=": operator.le,
+    "gt": operator.gt,
+    ">": operator.gt,
+    "ge": operator.ge,
+    ">=": operator.ge,
+    "contains": _contains,
+    "datestartswith": _starts_with,
+}
+
+
+def split_filter_part(filter_part: str) -> Tuple[Optional[str], Optional[str], Any]:
+    """
+    One relational term of a DataTable filter_query, e.g. '{pid} > 100' or '{name} icontains "py"'.
+
+    Returns:
+      (column, operator, value), the operator keeps an "i" prefix of case-insensitive terms and loses the "s" of
+      explicitly case-sensitive ones, None for all three if the term is not understood
+    """
+    m = FILTER_PART.match(filter_part)
+    if m is None:
+        return None, None, None
+    column, op, value = m.group("column"), m.group("op"), m.group("value")
+    if op[:1] == "s" and op[1:] in OPERATORS:
+        op = op[1:]
+    if op not in OPERATORS and not (op[:1] == "i" and op[1:] in OPERATORS):
+        return None, None, None
+    if len(value) > 1 and value[0] == value[-1] and value[0] in ("'", '"', "`"):
+        value = value[1:-1].replace("\\" + value[0], value[0])
+    else:
+        try:
+            value = float(value)
+        except ValueError:
+            pass
+    return column, op, value
+
+
+def _predicate(filter_part: str) -> Optional[Callable[[Mapping], bool]]:
+    column, op, value = split_filter_part(filter_part)
+    if column is None:
+        return None
+    case_insensitive = op not in OPERATORS
+    compare = OPERATORS[op[1:] if case_insensitive else op]
+    if case_insensitive and isinstance(value, str):
+        value = value.lower()
+
+    def predicate(row: Mapping) -> bool:
+        cell = row.get(column)
+        if cell is None:
+            return False
+        if case_insensitive and isinstance(cell, str):
+            cell = cell.lower()
+        try:
+            return compare(cell, value)
+        except TypeError:  # E.g. a number compared to text
+            return False
+
+    return predicate
+
+
+def filter_rows(rows: Sequence[Mapping], filter_query: Optional[str]) -> List[Mapping]:
+    """The rows matching all '&&' separated terms of filter_query, terms not understood are ignored"""
+    predicates = [
+        p
+        for p in (_predicate(part) for part in (filter_query or "").split(" && "))
+        if p is not None
+    ]
+    if not predicates:
+        return list(rows)
+    return [r for r in rows if all(p(r) for p in predicates)]
+
+
+def sort_rows(
+    rows: Sequence[Mapping], sort_by: Optional[Sequence[Mapping]]
+) -> List[Mapping]:
+    """Rows sorted by the DataTable sort_by, a list of {"column_id", "direction"}, missing values last"""
+    rows = list(rows)
+    for s in reversed(sort_by or ()):  # Stable sorts, least significant column first
+        column, descending = s["column_id"], s["direction"] == "desc"
+        try:
+            rows.sort(
+                key=lambda r: (
+                    (r.get(column) is not None) == descending,
+                    r.get(column),
+                ),
+                reverse=descending,
+            )
+        except TypeError:  # Mixed types, order as text
+            rows.sort(
+                key=lambda r: (
+                    (r.get(column) is not None) == descending,
+                    str(r.get(column)),
+                ),
+                reverse=descending,
+            )
+    return rows
+
+
+def query_rows(
+    rows: Sequence[Mapping],
+    filter_query: Optional[str],
+    sort_by: Optional[Sequence[Mapping]],
+) -> List[Mapping]:
+    """Filtered then sorted rows"""
+    return sort_rows(filter_rows(rows, filter_query), sort_by)
+
+
+def page_rows(
+    rows: Sequence[Mapping], page_current: Optional[int], page_size: int
+) -> Tuple[List[Mapping], int]:
+    """
+    Returns:
+      The rows of page page_current and the number of pages
+    """
+    page_count = max(1, math.ceil(len(rows) / page_size))
+    page_current = min(page_current or 0, page_count - 1)
+    start = page_current * page_size
+    return list(rows[start : start + page_size]), page_count
+
+
+def table_columns(columns: Sequence[str], rows: Sequence[Mapping]) -> List[Dict]:
+    """DataTable columns, numeric where the first row holds a number, so the filter UI compares numerically"""
+    first = rows[0] if rows else {}
+    return [
+        {
+            "name": c,
+            "id": c,
+            "type": (
+                "numeric"
+                if isinstance(first.get(c), (int, float))
+                and not isinstance(first.get(c), bool)
+                else "text"
+            ),
+        }
+        for c in columns
+    ]
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+__doc__ = r"""
+
+           Created on 18/10/2026
+
+           Store of the latest telemetry of every publishing host, shared between the mqtt ingest thread and the
+           dash callbacks.
+           """
+
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, List, Mapping, Optional, Tuple, Union
+
+__all__ = ["TelemetryStore", "TelemetrySnapshot", "HostSnapshot", "HostEvictor"]
+
+
+class HostSnapshot:
+    """The latest telemetry of one host and the monotonic time it was received"""
+
+    __slots__ = ("host", "gpu_stats", "du_stats", "received")
+
+    def __init__(
+        self, host: str, gpu_stats: Mapping, du_stats: Mapping, received: float
+    ):
+        self.host = host
+        self.gpu_stats = gpu_stats
+        self.du_stats = du_stats
+        self.received = received
+
+
+class TelemetrySnapshot:
+    """
+    An immutable view of all hosts at one version of the store.
+
+    Snapshots are never modified after creation, so readers can hold on to one without copying or locking. The
+    payloads are shared with later snapshots and must be treated as read-only.
+    """
+
+    def __init__(
+        self, version: int, hosts: Mapping[str, HostSnapshot], du_version: int = 0
+    ):
+        self.version = version
+        self.du_version = du_version  # Only incremented when the disk usage changed
+        self.hosts = MappingProxyType(hosts)
+        # Built on first access, functools.cached_property is 3.8+
+        self._gpu_stats = None
+        self._du_stats = None
+
+    def __len__(self) -> int:
+        return len(self.hosts)
+
+    def __bool__(self) -> bool:
+        return bool(self.hosts)
+
+    @property
+    def gpu_stats(self) -> Mapping[str, Mapping]:
+        """host -> gpu_stats"""
+        if self._gpu_stats is None:
+            self._gpu_stats = MappingProxyType(
+                {k: v.gpu_stats for k, v in self.hosts.items()}
+            )
+        return self._gpu_stats
+
+    @property
+    def du_stats(self) -> Mapping[str, Mapping]:
+        """host -> du_stats"""
+        if self._du_stats is None:
+            self._du_stats = MappingProxyType(
+                {k: v.du_stats for k, v in self.hosts.items()}
+            )
+        return self._du_stats
+
+    def keep_alive(self, now: Optional[float] = None) -> Mapping[str, int]:
+        """host -> whole seconds since its latest message"""
+        if now is None:
+            now = time.monotonic()
+        return {k: int(now - v.received) for k, v in self.hosts.items()}
+
+
+class TelemetryStore:
+    """
+    The latest telemetry of every host.
+
+    Writers build a new snapshot with the updated host and swap it in under a lock, copying only the host to
+    snapshot mapping, never the payloads. Readers take the current snapshot by reference, which is atomic, or
+    block in `wait` until the version changes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._snapshot = TelemetrySnapshot(0, {})
+
+    def snapshot(self) -> TelemetrySnapshot:
+        """The current snapshot"""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        """Incremented on every change"""
+        return self._snapshot.version
+
+    def wait(self, version: int, timeout: Optional[float] = None) -> int:
+        """
+        Block until the version differs from version or timeout seconds passed.
+
+        Returns:
+          The current version
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self._snapshot.version != version, timeout)
+            return self._snapshot.version
+
+    def ingest(
+        self,
+        host: str,
+        gpu_stats: Mapping,
+        du_stats: Mapping,
+        received: Optional[float] = None,
+    ) -> None:
+        """Replace the telemetry of host, the payloads must not be modified afterwards"""
+        self.ingest_many({host: (gpu_stats, du_stats)}, received)
+
+    def ingest_many(
+        self,
+        updates: Mapping[str, Tuple[Mapping, Mapping]],
+        received: Union[None, float, Mapping[str, float]] = None,
+    ) -> None:
+        """
+        Replace the telemetry of several hosts at once, host -> (gpu_stats, du_stats), in one new snapshot.
+
+        Args:
+          updates: host -> (gpu_stats, du_stats)
+          received: The monotonic time the telemetry was received, for all hosts or per host, now if None
+        """
+        if not updates:
+            return
+        if received is None:
+            received = time.monotonic()
+        with self._lock:
+            snapshot = self._snapshot
+            hosts = dict(snapshot.hosts)
+            du_changed = False
+            for host, (gpu_stats, du_stats) in updates.items():
+                previous = hosts.get(host)
+                du_changed = (
+                    du_changed or previous is None or previous.du_stats != du_stats
+                )
+                hosts[host] = HostSnapshot(
+                    host,
+                    gpu_stats,
+                    du_stats,
+                    received[host] if isinstance(received, Mapping) else received,
+                )
+            self._snapshot = TelemetrySnapshot(
+                snapshot.version + 1, hosts, snapshot.du_version + du_changed
+            )
+            self._changed.notify_all()
+
+    def evict(self, timeout_sec: float, now: Optional[float] = None) -> List[str]:
+        """
+        Remove hosts that have not been heard from for more than timeout_sec seconds.
+
+        Returns:
+          The removed hosts
+        """
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            snapshot = self._snapshot
+            evicted = [
+                k for k, v in snapshot.hosts.items() if now - v.received > timeout_sec
+            ]
+            if evicted:
+                hosts = {k: v for k, v in snapshot.hosts.items() if k not in evicted}
+                self._snapshot = TelemetrySnapshot(
+                    snapshot.version + 1, hosts, snapshot.du_version + 1
+                )
+                self._changed.notify_all()
+        return evicted
+
+
+class HostEvictor(threading.Thread):
+    """
+    Evicts hosts from a TelemetryStore on a fixed interval in a daemon thread, so hosts time out based on when
+    their messages were received alone, independent of whether and how many dashboards are open.
+    """
+
+    def __init__(
+        self,
+        store: TelemetryStore,
+        timeout_sec: float,
+        on_evict: Optional[Callable[[List[str]], None]] = None,
+        interval_sec: float = 1.0,
+    ):
+        """
+
+        Args:
+          store: The store to evict from
+          timeout_sec: Hosts not heard from for longer are evicted
+          on_evict: Called with the evicted hosts, if any
+          interval_sec: Seconds between evictions, hosts are evicted at most this late
+        """
+        super().__init__(name="host-evictor", daemon=True)
+        self.store = store
+        self.timeout_sec = timeout_sec
+        self.on_evict = on_evict
+        self.interval_sec = interval_sec
+        self._stop_event = threading.Event()
+
+    def evict(self) -> List[str]:
+        """Evict the hosts that timed out now"""
+        evicted = self.store.evict(self.timeout_sec)
+        if evicted and self.on_evict is not None:
+            self.on_evict(evicted)
+        return evicted
+
+    def run(self) -> None:
+        """description"""
+        while not self._stop_event.wait(self.interval_sec):
+            try:
+                self.evict()
+            except Exception as e:
+                print(f"Failed to evict hosts: {e}")
+
+    def stop(self) -> None:
+        """Stop before the next eviction"""
+        self._stop_event.set()
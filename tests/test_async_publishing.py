@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import asyncio
+import time
+
+from heimdallr.utilities.publisher.async_publishing import (
+    AsyncPublisher,
+    drift_free_ticks,
+)
+from heimdallr.utilities.publisher.collectors import CollectorRegistry
+
+
+def run(coroutine):
+    """asyncio.run is 3.7+"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+def test_slow_collector_times_out_individually():
+    def slow():
+        time.sleep(0.5)
+        return "slow"
+
+    async def collect_twice(publisher):
+        first = await publisher.collect()
+        await asyncio.sleep(0.6)
+        return first, await publisher.collect()
+
+    collectors = CollectorRegistry()
+    collectors.register("fast", lambda: "fast", period_sec=0)
+    collectors.register("slow", slow, period_sec=0)
+    with AsyncPublisher(
+        collectors,
+        print,
+        interval_sec=1,
+        collector_timeout_sec=0.1,
+    ) as publisher:
+        start = time.perf_counter()
+        first, second = run(collect_twice(publisher))
+    assert first == {"fast": "fast"}
+    assert second == {"fast": "fast", "slow": "slow"}
+    assert time.perf_counter() - start < 1.0
+
+
+def test_ticks_do_not_drift():
+    async def tick_times():
+        loop = asyncio.get_event_loop()
+        times = []
+        async for tick in drift_free_ticks(0.05):
+            times.append(loop.time())
+            await asyncio.sleep(0.01)  # Work done every tick
+            if tick == 10:
+                return times
+
+    times = run(tick_times())
+    assert abs(times[-1] - times[0] - 0.5) < 0.04
+
+
+def test_wake_yields_extra_tick_on_schedule():
+    async def tick_times():
+        loop = asyncio.get_event_loop()
+        wake = asyncio.Event()
+        loop.call_later(0.05, wake.set)
+        times = []
+        async for tick in drift_free_ticks(0.2, wake):
+            times.append((tick, loop.time()))
+            if len(times) == 3:
+                return times
+
+    (t0, start), (t1, woken), (t2, scheduled) = run(tick_times())
+    assert (t0, t1, t2) == (0, 0, 1)
+    assert abs(woken - start - 0.05) < 0.03
+    assert abs(scheduled - start - 0.2) < 0.03
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import pytest
+
+from heimdallr.utilities.messaging import CODECS, codecs, decode_payload, get_codec
+
+PAYLOAD = {
+    "host": {
+        "gpu_stats": {
+            "driver_version": "535.0",
+            "devices": [
+                {
+                    "id": 0,
+                    "name": "GPU",
+                    "total": 25769803776,
+                    "gpu_utilization": None,
+                    "processes": [
+                        {
+                            "pid": pid,
+                            "used_gpu_mem": 1 << 30,
+                            "device_name": "GPU",
+                            "username": "user",
+                            "memory_percent": 0.5,
+                            "create_time": 1700000000.25,
+                            "negative": -pid,
+                            "flag": True,
+                        }
+                        for pid in range(10)
+                    ],
+                }
+            ],
+        },
+        "du_stats": {},
+    }
+}
+
+
+@pytest.mark.parametrize("name", list(CODECS))
+def test_codec_roundtrip(name):
+    assert decode_payload(get_codec(name).encode(PAYLOAD)) == PAYLOAD
+
+
+def test_compact_is_smaller():
+    assert (
+        len(get_codec("compact").encode(PAYLOAD))
+        < len(get_codec("json").encode(PAYLOAD)) / 3
+    )
+
+
+def test_compact_decodes_previous_versions(monkeypatch):
+    monkeypatch.setattr(codecs, "COMPACT_VERSION", 1)
+    monkeypatch.setattr(codecs, "KEY_TABLE", codecs.KEY_TABLES[1])
+    payload = {"devices": [{"name": "A"}, {"name": "B"}], "gpu_utilization_p95": 1}
+    data = get_codec("compact").encode(payload)
+    assert data[0] == 1
+    assert decode_payload(data) == payload
+
+
+def test_compact_truncated_raises_value_error():
+    data = get_codec("compact").encode(PAYLOAD)
+    for end in range(1, len(data)):
+        with pytest.raises(ValueError):
+            decode_payload(data[:end])
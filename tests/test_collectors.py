@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+from heimdallr.utilities.publisher.collectors import CollectorRegistry
+
+
+def test_collectors_run_at_their_own_period():
+    calls = {"fast": 0, "slow": 0}
+
+    def counter(name):
+        def collect():
+            calls[name] += 1
+            return calls[name]
+
+        return collect
+
+    registry = CollectorRegistry()
+    registry.register("fast", counter("fast"), period_sec=1)
+    registry.register("slow", counter("slow"), period_sec=10)
+    for now in range(20):
+        for collector in registry.due(now):
+            collector.run(now)
+    assert calls == {"fast": 20, "slow": 2}
+    assert registry.latest() == {"fast": 20, "slow": 2}
+
+
+def test_cost_budget_defers_expensive_collectors():
+    registry = CollectorRegistry(cost_budget=5)
+    registry.register("a", lambda: "a", period_sec=10, cost=4)
+    registry.register("b", lambda: "b", period_sec=10, cost=4)
+    assert len(registry.due(0)) == 1
+    for collector in registry.due(0):
+        collector.run(0)
+    assert [c.name for c in registry.due(1)] == ["b"]
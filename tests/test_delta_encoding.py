@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import copy
+
+from heimdallr.utilities.messaging import DeltaDecoder, DeltaEncoder, apply_patch, diff
+
+
+def host_stats(used: int, pids=(1, 2)):
+    return {
+        "gpu_stats": {
+            "driver_version": "1.0",
+            "devices": [
+                {
+                    "id": 0,
+                    "uuid": "GPU-0",
+                    "used": used,
+                    "processes": [{"pid": pid, "used_gpu_mem": used} for pid in pids],
+                }
+            ],
+        },
+        "du_stats": {},
+    }
+
+
+def test_delta_roundtrip():
+    encoder = DeltaEncoder(keyframe_interval=3)
+    decoder = DeltaDecoder()
+    for tick, pids in enumerate([(1, 2), (1, 2), (2, 3), (3,), ()]):
+        payload = {"host": host_stats(tick, pids)}
+        message = encoder.encode(payload)
+        assert message["host"]["kind"] == ("keyframe" if tick % 3 == 0 else "delta")
+        assert decoder.decode("host", message["host"]) == payload["host"]
+
+
+def test_delta_roundtrip_duplicate_pid():
+    encoder = DeltaEncoder(keyframe_interval=3)
+    decoder = DeltaDecoder()
+    for tick, pids in enumerate([(1, 1, 2), (1, 1, 2), (1, 1), (1,), (1, 1)]):
+        payload = {"host": host_stats(tick, pids)}  # Compute and graphics processes
+        assert (
+            decoder.decode("host", encoder.encode(payload)["host"]) == payload["host"]
+        )
+
+
+def test_delta_gap_waits_for_keyframe():
+    encoder = DeltaEncoder(keyframe_interval=3)
+    decoder = DeltaDecoder()
+    messages = [encoder.encode({"host": host_stats(tick)})["host"] for tick in range(4)]
+    assert decoder.decode("host", messages[0]) is not None
+    assert decoder.decode("host", messages[2]) is None
+    assert decoder.decode("host", messages[3]) == host_stats(3)
+
+
+def test_apply_patch_does_not_mutate():
+    old = {"a": {"b": 1, "c": 2}, "d": 3}
+    new = {"a": {"b": 1, "c": 4}, "e": 5}
+    snapshot = copy.deepcopy(old)
+    assert apply_patch(old, diff(old, new)) == new
+    assert old == snapshot
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+from heimdallr.utilities.publisher import directory_index
+from heimdallr.utilities.publisher.directory_index import DirectoryIndex
+
+
+def sizes(index):
+    return {
+        os.path.basename(d["path"]): d["files"] for d in index.totals()["directories"]
+    }
+
+
+def test_index_follows_changes_without_rescanning(tmp_path, monkeypatch):
+    for name in ("a", "b"):
+        (tmp_path / name / "deep").mkdir(parents=True)
+        (tmp_path / name / "deep" / "x.bin").write_bytes(b"0" * 4096)
+    (tmp_path / "top.bin").write_bytes(b"0")
+
+    with ThreadPoolExecutor(2) as executor:
+        index = DirectoryIndex(tmp_path, executor, hot_window_sec=0)
+        index.refresh()
+        assert len(index) == 5
+        assert sizes(index) == {"a": 1, "b": 1, tmp_path.name: 1}
+
+        scanned = []
+        scan = directory_index.scan_directory
+        monkeypatch.setattr(
+            directory_index,
+            "scan_directory",
+            lambda path: scanned.append(path) or scan(path),
+        )
+        index.refresh()
+        assert scanned == []
+
+        shutil.rmtree(tmp_path / "b")
+        (tmp_path / "a" / "deep" / "y.bin").write_bytes(b"0" * 4096)
+        index.refresh()
+        assert sorted(scanned) == [str(tmp_path), str(tmp_path / "a" / "deep")]
+        assert sizes(index) == {"a": 2, tmp_path.name: 1}
+        (user,) = index.totals()["users"]
+        assert user["files"] == 3
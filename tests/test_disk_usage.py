@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+from heimdallr.utilities.publisher.disk_usage import (
+    parse_mountinfo,
+    partition_usage,
+)
+
+MOUNTINFO = [
+    "23 28 0:22 / /proc rw,relatime - proc proc rw",
+    "28 1 254:0 / / rw,relatime shared:1 - ext4 /dev/vda rw",
+    "29 28 254:0 /srv /mnt/bind rw,relatime - ext4 /dev/vda rw",
+    "30 28 0:40 / /mnt/data\\040sets rw,relatime master:2 - nfs host:/export rw",
+    "31 25 0:24 / /dev/shm rw,relatime - tmpfs tmpfs rw",
+]
+
+
+def test_parse_mountinfo_filters_pseudo_and_bind_mounts():
+    mounts = parse_mountinfo(MOUNTINFO)
+    assert [(m.mountpoint, m.fstype) for m in mounts] == [
+        ("/", "ext4"),
+        ("/mnt/data sets", "nfs"),
+    ]
+
+
+def test_partition_usage_of_root():
+    (mount,) = parse_mountinfo(MOUNTINFO[1:2])
+    (partition,) = partition_usage([mount])
+    assert partition["used"] + partition["free"] <= partition["total"]
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import os
+
+from heimdallr.utilities.nvidia import bindings, smi_parsing
+from heimdallr.utilities.nvidia.fake_nvml import FakeNvml, use_nvml_lib
+from heimdallr.utilities.nvidia.packing import DeviceInventory, get_nv_info
+from heimdallr.utilities.nvidia.smi_parsing import NvidiaSMI
+from heimdallr.utilities.publisher.process_sampling import ProcessCache
+
+
+def test_get_nv_info():
+    fake = FakeNvml(device_count=2, processes_per_device=1, pids=[os.getpid()])
+    inventory = DeviceInventory()
+    cache = ProcessCache(cpu_interval=0)
+    with use_nvml_lib(fake):
+        driver_version, devices = get_nv_info(
+            process_cache=cache, device_inventory=inventory
+        )
+        assert driver_version == fake.driver_version
+        assert [d["uuid"] for d in devices] == [d.uuid for d in fake.devices]
+        assert devices[1]["used"] == fake.devices[1].used_memory
+        process = devices[1]["processes"][0]
+        assert process["pid"] == os.getpid()
+        assert process["used_gpu_mem"] == fake.devices[1].processes[os.getpid()]
+
+        fake.fail("nvmlDeviceGetMemoryInfo", bindings.NVML_ERROR_GPU_IS_LOST)
+        assert get_nv_info(process_cache=cache, device_inventory=inventory)[1] == []
+        fake.step()
+        assert len(get_nv_info(process_cache=cache, device_inventory=inventory)[1]) == 2
+    assert not isinstance(bindings.nvml_lib, FakeNvml)
+
+
+def test_device_query():
+    fake = FakeNvml(device_count=3)
+    with use_nvml_lib(fake):
+        smi = NvidiaSMI.getInstance()
+        results = smi.DeviceQuery("memory.free,utilization.gpu")
+        assert [gpu["utilization"]["gpu_util"] for gpu in results["gpu"]] == [
+            d.gpu_utilization for d in fake.devices
+        ]
+        assert len(smi.DeviceQuery()["gpu"]) == 3
+        NvidiaSMI._NvidiaSMI__instance = None
+
+
+def test_device_query_plan():
+    fake = FakeNvml(device_count=2)
+    NvidiaSMI._NvidiaSMI__handles = None  # Initialise nvml on the fake
+    with use_nvml_lib(fake):
+        smi = NvidiaSMI.getInstance()
+        fake.calls.clear()
+        by_name = smi.DeviceQuery("memory.free,utilization.gpu")
+        assert set(fake.calls) == {
+            "nvmlDeviceGetCount_v2",
+            "nvmlDeviceGetMemoryInfo",
+            "nvmlDeviceGetUtilizationRates",
+        }
+        assert by_name == smi.DeviceQuery(
+            [smi_parsing.NVSMI_MEMORY_FREE, smi_parsing.NVSMI_UTILIZATION_GPU]
+        )
+        assert list(by_name["gpu"][0]) == ["fb_memory_usage", "utilization"]
+
+        fake.calls.clear()
+        smi.DeviceQuery("count")
+        assert sum(fake.calls.values()) == 1
+        NvidiaSMI._NvidiaSMI__instance = None
+        NvidiaSMI._NvidiaSMI__handles = None
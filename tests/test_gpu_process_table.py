@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import warnings
+
+from heimdallr.utilities.date_tools import (
+    timestamp_to_datetime,
+    timestamps_to_datetimes,
+)
+from heimdallr.utilities.server.gpu_utilities import to_overall_gpu_process_df
+
+
+def process(pid, used_gpu_mem, **kws):
+    return {
+        "used_gpu_mem": used_gpu_mem,
+        "device_idx": 0,
+        "name": "python",
+        "username": "user",
+        "cmdline": "python train.py",
+        "create_time": 1.7e9 + pid + 0.5,
+        "pid": pid,
+        **kws,
+    }
+
+
+def test_timestamps_to_datetimes_matches_scalar():
+    ts = [0.0, 1.6e9, 1.7e9 + 0.4999995, 1.7e9 + 0.9999996, 1.71e9 + 0.123456789]
+    assert list(timestamps_to_datetimes(ts)) == [timestamp_to_datetime(t) for t in ts]
+
+
+def test_timestamps_to_datetimes_missing():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        out = timestamps_to_datetimes([1.6e9, None, float("nan")])
+    assert list(out) == [timestamp_to_datetime(1.6e9), None, None]
+
+
+def test_process_table_columns_and_order():
+    stats = {
+        "a": {"devices": [{"processes": [process(1, 3 << 20)]}, {"processes": []}]},
+        "b": {
+            "devices": [
+                {"processes": [process(2, 5 << 20), process(3, 1 << 20, status="x")]}
+            ]
+        },
+    }
+    df = to_overall_gpu_process_df(stats)
+    assert list(df.columns) == [
+        "machine",
+        "used_gpu_mem",
+        "device_idx",
+        "name",
+        "username",
+        "create_time",
+        "pid",
+        "status",
+    ]
+    assert list(df.machine) == ["b", "a", "b"]
+    assert list(df.used_gpu_mem) == [5, 3, 1]
+    assert list(df.pid) == [2, 1, 3]
+    assert list(df.status.isna()) == [True, True, False]
+    assert df.create_time.iloc[1] == timestamp_to_datetime(1.7e9 + 1.5)
+
+
+def test_empty_process_table():
+    assert to_overall_gpu_process_df({}).empty
+    assert to_overall_gpu_process_df({"a": {"devices": [{"processes": []}]}}).empty
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import warnings
+
+import numpy
+
+from heimdallr.utilities.server.history import (
+    RingBuffer,
+    TelemetryHistory,
+    aggregate,
+    history_rows,
+)
+
+
+def test_ring_buffer_overwrites_oldest():
+    ring = RingBuffer(4)
+    for t in range(6):
+        ring.append(t, t * 10)
+    assert len(ring) == 4
+    times, values = ring.window(since=3)
+    assert times.tolist() == [3, 4, 5]
+    assert values.tolist() == [30, 40, 50]
+
+
+def test_aggregate_matches_numpy():
+    rng = numpy.random.default_rng(0)
+    values = rng.random((50, 3, 2)).astype(numpy.float32) * 100
+    values[::3, 0, 0] = numpy.nan
+    values[:, 1, 1] = numpy.nan
+    a = aggregate(values, (3, 2))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        expected = {
+            "min": numpy.nanmin(values, axis=0),
+            "mean": numpy.nanmean(values, axis=0),
+            "max": numpy.nanmax(values, axis=0),
+            "p95": numpy.nanpercentile(values, 95, axis=0),
+        }
+    for k, v in expected.items():
+        numpy.testing.assert_allclose(a[k], v, rtol=1e-5, equal_nan=True)
+    assert numpy.isnan(aggregate(values[:0], (3, 2))["max"]).all()
+
+
+def device(i, gpu_utilization):
+    return {
+        "id": i,
+        "name": "T4",
+        "used": 1 << 30,
+        "total": 4 << 30,
+        "gpu_utilization": gpu_utilization,
+        "memory_utilization": None,
+    }
+
+
+def test_history_windows():
+    history = TelemetryHistory(100, {"5m": 300, "1h": 3600})
+    for t in range(0, 3600, 60):
+        history.record("a", {"devices": [device(0, 0 if t < 3000 else 50)]}, t)
+    aggregates = history.aggregates(now=3600)
+    utilization = aggregates["a"][0]["gpu_utilization"]
+    assert utilization["5m"] == {"min": 50.0, "mean": 50.0, "max": 50.0, "p95": 50.0}
+    assert utilization["1h"]["min"] == 0.0
+    assert aggregates["a"][0]["memory_used"]["1h"]["max"] == 25.0
+    assert aggregates["a"][0]["memory_utilization"]["5m"]["mean"] is None
+    assert len(history_rows(aggregates)) == 5
+
+
+def test_history_peaks_of_utilization_summaries():
+    history = TelemetryHistory(10, {"5m": 300})
+    history.record("a", {"devices": [dict(device(0, 10), gpu_utilization_max=90)]}, 0)
+    history.record("a", {"devices": [device(0, 20)]}, 1)  # No new samples
+    peak = history.aggregates(now=2)["a"][0]["gpu_utilization_peak"]["5m"]
+    assert (peak["min"], peak["max"]) == (20.0, 90.0)
+
+
+def test_history_reset_on_device_change_and_forget():
+    history = TelemetryHistory(10, {"5m": 300})
+    history.record("a", {"devices": [device(0, 10)]}, 0)
+    history.record("a", {"devices": [device(0, 10), device(1, 20)]}, 1)
+    aggregates = history.aggregates(now=2)
+    assert list(aggregates["a"]) == [0, 1]
+    assert aggregates["a"][1]["gpu_utilization"]["5m"]["max"] == 20.0
+    history.forget(["a"])
+    assert history.aggregates(now=2) == {}
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import json
+import time
+
+from heimdallr.utilities.messaging import DeltaEncoder, get_codec
+from heimdallr.utilities.server.history import TelemetryHistory
+from heimdallr.utilities.server.ingest import IngestWorker, PayloadApplier
+from heimdallr.utilities.server.process_table import GpuProcessTable
+from heimdallr.utilities.server.telemetry_store import TelemetryStore
+
+
+def test_ingest_drops_oldest_and_applies_in_batches():
+    batches = []
+    receive_times = []
+
+    def apply_batch(batch, received):
+        batches.append(batch)
+        receive_times.extend(received)
+        return len(batch)
+
+    worker = IngestWorker(apply_batch, maxsize=3, batch_size=2)
+    for i in range(5):
+        worker.put(i)
+    worker.start()
+    deadline = time.monotonic() + 2
+    while worker.applied < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    worker.stop()
+
+    assert batches == [[2, 3], [4]]
+    assert receive_times == sorted(receive_times)
+    stats = worker.stats()
+    assert (stats["received"], stats["dropped"], stats["applied"]) == (5, 2, 3)
+
+
+def gpu_stats(pid):
+    return {
+        "devices": [
+            {"id": 0, "name": "GPU", "processes": [{"pid": pid, "used_gpu_mem": 1}]}
+        ]
+    }
+
+
+def test_bad_payloads_do_not_drop_the_batch():
+    store = TelemetryStore()
+    table = GpuProcessTable()
+    history = TelemetryHistory(10, {"1m": 60})
+    apply_payloads = PayloadApplier(store, table, history, log=lambda message: None)
+    compact = get_codec("compact").encode({"d": {"gpu_stats": gpu_stats(4)}})
+    encoder = DeltaEncoder(keyframe_interval=10)
+    keyframe = encoder.encode({"e": {"gpu_stats": gpu_stats(5), "du_stats": {}}})
+    payloads = [
+        json.dumps({"a": {"gpu_stats": gpu_stats(1), "du_stats": {}}}).encode(),
+        compact[:-3],  # Truncated
+        json.dumps({"b": {"gpu_stats": gpu_stats(2)}}).encode(),  # No du_stats
+        b"[1,2]",
+        json.dumps({"x": 1, "c": gpu_stats(3)}).encode(),  # Skips the host x
+        json.dumps({**keyframe, "y": {"gpu_stats": {"devices": [{}]}}}).encode(),
+        compact,
+    ]
+    assert apply_payloads(payloads, [time.monotonic()] * len(payloads)) == 4
+    assert sorted(store.snapshot().hosts) == ["a", "b", "c", "d"]
+    assert sorted(r["pid"] for r in table.rows()) == [1, 2, 3, 4]
+    assert sorted(history.aggregates()) == ["a", "b", "c", "d"]
+
+    delta = encoder.encode({"e": {"gpu_stats": gpu_stats(6), "du_stats": {}}})
+    assert apply_payloads([json.dumps(delta).encode()], [time.monotonic()]) == 0
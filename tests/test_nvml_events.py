@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import threading
+
+from heimdallr.utilities.nvidia import bindings
+from heimdallr.utilities.nvidia.fake_nvml import FakeNvml, use_nvml_lib
+from heimdallr.utilities.publisher.nvml_events import NvmlEventWatcher
+
+
+def test_events_are_coalesced():
+    fake = FakeNvml(
+        device_count=2,
+        supported_event_types=bindings.nvmlEventTypeXidCriticalError
+        | bindings.nvmlEventTypePState,
+    )
+    received = []
+    notified = threading.Event()
+
+    def on_event(*event):
+        received.append(event)
+        notified.set()
+
+    with use_nvml_lib(fake):
+        watcher = NvmlEventWatcher(on_event, min_interval_sec=0.2, wait_timeout_ms=50)
+        assert watcher.register() == 2
+        assert not fake.emit(0, bindings.nvmlEventTypeClock)  # Not supported
+        watcher.start()
+        try:
+            fake.emit(1, bindings.nvmlEventTypeXidCriticalError, 79)
+            assert notified.wait(1)
+            notified.clear()
+            for _ in range(3):
+                fake.emit(0, bindings.nvmlEventTypePState)
+            assert notified.wait(1)
+        finally:
+            watcher.stop()
+            watcher.join()
+    assert received == [
+        (1, bindings.nvmlEventTypeXidCriticalError, 79),
+        (0, bindings.nvmlEventTypePState, 0),
+    ]
+    assert watcher.events == 4
+
+
+def test_no_driver():
+    fake = FakeNvml()
+    fake.fail("nvmlDeviceGetCount_v2", bindings.NVML_ERROR_DRIVER_NOT_LOADED)
+    with use_nvml_lib(fake):
+        assert NvmlEventWatcher(print).register() == 0
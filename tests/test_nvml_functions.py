@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+from types import SimpleNamespace
+
+import pytest
+
+from heimdallr.utilities.nvidia import bindings
+
+
+@pytest.fixture
+def fake_lib():
+    def get_count(count):
+        count._obj.value = 3
+        return bindings.NVML_SUCCESS
+
+    lib = SimpleNamespace(
+        nvmlInit_v2=lambda: bindings.NVML_SUCCESS,
+        nvmlDeviceGetCount_v2=get_count,
+        nvmlDeviceGetMemoryInfo=lambda handle, memory: bindings.NVML_ERROR_GPU_IS_LOST,
+    )
+    previous = bindings.nvml_lib
+    bindings.nvml_lib = lib
+    yield lib
+    bindings.nvml_lib = previous
+    bindings._func_pointer_cache.clear()
+    bindings.nvml_functions.clear()
+
+
+def test_resolved_at_init(fake_lib):
+    bindings.nvmlInit()
+    assert bindings.nvml_functions.__dict__ == {
+        "nvmlDeviceGetCount_v2": fake_lib.nvmlDeviceGetCount_v2,
+        "nvmlDeviceGetMemoryInfo": fake_lib.nvmlDeviceGetMemoryInfo,
+    }
+    assert bindings.nvmlDeviceGetCount() == 3
+    with pytest.raises(bindings.NVMLError_GpuIsLost):
+        bindings.nvmlDeviceGetMemoryInfo(None)
+    with pytest.raises(bindings.NVMLError_FunctionNotFound):
+        bindings.nvmlDeviceGetUtilizationRates(None)
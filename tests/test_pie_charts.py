@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import json
+
+import plotly
+
+from heimdallr.utilities.server.gpu_utilities import (
+    patch_pie_charts,
+    per_machine_per_device_pie_charts,
+    pie_charts_signature,
+)
+
+
+def stats(used):
+    return {
+        "a": {"devices": [{"id": 0, "name": "A100", "used": used, "total": 8 << 30}]},
+        "b": {
+            "devices": [
+                {"id": 0, "name": "T4", "used": 1 << 30, "total": 4 << 30},
+                {"id": 1, "name": "T4", "used": used, "total": 4 << 30},
+            ]
+        },
+    }
+
+
+def to_json(o):
+    return json.loads(json.dumps(o, cls=plotly.utils.PlotlyJSONEncoder))
+
+
+def test_patch_equals_rebuild():
+    old, new = stats(1 << 30), stats(3 << 30)
+    assert pie_charts_signature(old) == pie_charts_signature(new)
+
+    shown = to_json(per_machine_per_device_pie_charts(old, {"a": 1, "b": 2}))
+    for operation in patch_pie_charts(new, {"a": 3, "b": 4}).to_plotly_json()[
+        "operations"
+    ]:
+        assert operation["operation"] == "Assign"
+        *path, last = operation["location"]
+        target = shown
+        for k in path:
+            target = target[k]
+        target[last] = operation["params"]["value"]
+
+    assert shown == to_json(per_machine_per_device_pie_charts(new, {"a": 3, "b": 4}))
+
+
+def test_signature_changes_with_devices():
+    s = stats(1 << 30)
+    signature = pie_charts_signature(s)
+    del s["b"]["devices"][1]
+    assert pie_charts_signature(s) != signature
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import os
+import time
+
+from heimdallr.utilities.publisher.process_sampling import ProcessCache
+
+
+def test_cache_sleeps_once_for_many_pids():
+    cache = ProcessCache(cpu_interval=0.1)
+    pids = [os.getpid()] * 20 + [os.getppid()]
+    start = time.perf_counter()
+    infos = cache.collect(pids)
+    assert time.perf_counter() - start < 0.5
+    assert infos[os.getpid()]["create_time"] > 0
+
+
+def test_cache_reuses_previous_tick():
+    cache = ProcessCache(cpu_interval=0.1)
+    cache.collect([os.getpid()])
+    start = time.perf_counter()
+    infos = cache.collect([os.getpid()])
+    assert time.perf_counter() - start < 0.1
+    assert infos[os.getpid()]["cpu_percent"] >= 0
+
+
+def test_cache_skips_missing_pids():
+    cache = ProcessCache(cpu_interval=0)
+    infos = cache.collect([os.getpid(), 2**22 + 1])
+    assert os.getpid() in infos
+    assert 2**22 + 1 not in infos
+    assert 2**22 + 1 not in cache
+
+
+def test_cache_evicts_unseen_pids_after_max_idle_ticks():
+    cache = ProcessCache(max_idle_ticks=2, cpu_interval=0)
+    cache.collect([os.getpid()])
+    cache.collect([])
+    cache.collect([])
+    assert os.getpid() in cache
+    cache.collect([])
+    assert os.getpid() not in cache
+    assert len(cache) == 0
+
+
+def test_cache_reads_only_planned_attributes():
+    cache = ProcessCache(attributes=("name", "status"), cpu_interval=1.0)
+    start = time.perf_counter()
+    info = cache.collect([os.getpid()])[os.getpid()]
+    assert time.perf_counter() - start < 1.0  # No cpu_percent, so no priming sleep
+    assert set(info) == {"name", "status"}
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+from heimdallr.utilities.server.gpu_utilities import to_overall_gpu_process_df
+from heimdallr.utilities.server.process_table import GpuProcessTable
+
+
+def stats(*used_gpu_mem):
+    return {
+        "devices": [
+            {
+                "processes": [
+                    {"used_gpu_mem": m << 20, "pid": i, "create_time": 1.7e9 + i}
+                    for i, m in enumerate(used_gpu_mem)
+                ]
+            }
+        ]
+    }
+
+
+def test_rows_match_rebuilt_table():
+    fleet = {"a": stats(3, 1), "b": stats(4, 2)}
+    table = GpuProcessTable()
+    table.update(fleet)
+    assert table.rows() == to_overall_gpu_process_df(fleet).to_dict("records")
+    assert table.columns() == ["machine", "used_gpu_mem", "pid", "create_time"]
+
+
+def test_update_and_remove_hosts():
+    table = GpuProcessTable()
+    table.update({"a": stats(3, 1), "b": stats(4, 2)})
+    version = table.version
+    table.update({"a": stats(5)})
+    assert table.version == version + 1
+    assert [(r["machine"], r["used_gpu_mem"]) for r in table.rows()] == [
+        ("a", 5),
+        ("b", 4),
+        ("b", 2),
+    ]
+    table.remove(["b", "c"])
+    assert [r["machine"] for r in table.rows()] == ["a"]
+    version = table.version
+    table.remove(["c"])
+    assert table.version == version
+
+
+def test_snapshot_cached_per_version():
+    table = GpuProcessTable()
+    table.update({"a": stats(1)})
+    assert table.snapshot() is table.snapshot()
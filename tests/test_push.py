@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import threading
+
+from heimdallr.utilities.server.push import version_events
+from heimdallr.utilities.server.telemetry_store import TelemetryStore
+
+
+def test_events_on_version_change():
+    store = TelemetryStore()
+    events = version_events(
+        store.wait,
+        lambda: {"version": store.version},
+        keep_alive_sec=0.1,
+        min_interval_sec=0,
+        max_duration_sec=5,
+    )
+    assert next(events).startswith("retry:")
+    assert next(events) == 'data: {"version": 0}\n\n'
+    assert next(events) == ": keep-alive\n\n"
+    threading.Timer(0.02, lambda: store.ingest("a", {}, {})).start()
+    assert next(events) == 'data: {"version": 1}\n\n'
+
+
+def test_stream_ends():
+    store = TelemetryStore()
+    events = list(
+        version_events(
+            store.wait,
+            lambda: {},
+            keep_alive_sec=0.01,
+            min_interval_sec=0,
+            max_duration_sec=0.05,
+        )
+    )
+    assert events[1] == "data: {}\n\n"
+    assert set(events[2:]) == {": keep-alive\n\n"}
+
+
+def test_du_version_only_changes_with_disk_usage():
+    store = TelemetryStore()
+    store.ingest("a", {"devices": []}, {"partitions": [1]})
+    du_version = store.snapshot().du_version
+    store.ingest("a", {"devices": [1]}, {"partitions": [1]})
+    assert store.snapshot().du_version == du_version
+    store.ingest("a", {"devices": [1]}, {"partitions": [2]})
+    assert store.snapshot().du_version == du_version + 1
@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+from concurrent.futures import ThreadPoolExecutor
+
+from heimdallr.utilities.server.render_cache import RenderCache
+
+
+def test_render_once_per_key():
+    cache = RenderCache()
+    renders = []
+
+    def render():
+        renders.append(1)
+        return len(renders)
+
+    with ThreadPoolExecutor(8) as executor:
+        outputs = list(executor.map(lambda _: cache.get("a", 1, render), range(30)))
+    assert outputs == [1] * 30
+    assert cache.get("a", 2, render) == 2
+    assert cache.get("a", 2, render) == 2
+    assert cache.misses == 2
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+from heimdallr.utilities.server.table_query import (
+    page_rows,
+    query_rows,
+    split_filter_part,
+    table_columns,
+)
+
+ROWS = [
+    {"machine": "a", "pid": 3, "name": "Python"},
+    {"machine": "b", "pid": 1, "name": "torchrun"},
+    {"machine": "c", "pid": 2},
+    {"machine": "d", "pid": 5, "name": "python3"},
+]
+
+
+def test_split_filter_part():
+    assert split_filter_part("{pid} > 2") == ("pid", ">", 2.0)
+    assert split_filter_part('{name} icontains "py"') == ("name", "icontains", "py")
+    assert split_filter_part("{name} scontains py") == ("name", "contains", "py")
+    assert split_filter_part("{name} unknown py") == (None, None, None)
+
+
+def test_filter_and_sort():
+    assert [r["machine"] for r in query_rows(ROWS, "{pid} >= 2", None)] == [
+        "a",
+        "c",
+        "d",
+    ]
+    assert [r["machine"] for r in query_rows(ROWS, "{name} icontains py", None)] == [
+        "a",
+        "d",
+    ]
+    assert [
+        r["machine"]
+        for r in query_rows(
+            ROWS,
+            "{pid} > 1 && {name} contains py",
+            [{"column_id": "pid", "direction": "desc"}],
+        )
+    ] == ["d"]
+    assert [
+        r["machine"]
+        for r in query_rows(ROWS, "", [{"column_id": "name", "direction": "asc"}])
+    ] == ["a", "d", "b", "c"]
+    assert [
+        r["machine"]
+        for r in query_rows(ROWS, "", [{"column_id": "name", "direction": "desc"}])
+    ] == ["b", "d", "a", "c"]
+
+
+def test_page_rows():
+    rows = list(range(65))
+    assert page_rows(rows, 0, 30) == (list(range(30)), 3)
+    assert page_rows(rows, 2, 30) == (list(range(60, 65)), 3)
+    assert page_rows(rows, 9, 30) == (list(range(60, 65)), 3)
+    assert page_rows([], None, 30) == ([], 1)
+
+
+def test_table_columns():
+    assert [c["type"] for c in table_columns(["pid", "name"], ROWS)] == [
+        "numeric",
+        "text",
+    ]
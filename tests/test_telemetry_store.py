@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import time
+
+from heimdallr.utilities.server.telemetry_store import HostEvictor, TelemetryStore
+
+
+def test_snapshots_are_not_affected_by_later_ingests():
+    store = TelemetryStore()
+    store.ingest("a", {"devices": []}, {}, received=0)
+    before = store.snapshot()
+    store.ingest("b", {"devices": []}, {}, received=5)
+    after = store.snapshot()
+    assert list(before.gpu_stats) == ["a"]
+    assert list(after.gpu_stats) == ["a", "b"]
+    assert after.version == before.version + 1
+    assert after.keep_alive(now=10) == {"a": 10, "b": 5}
+
+
+def test_evict_stale_hosts():
+    store = TelemetryStore()
+    store.ingest("a", {}, {}, received=0)
+    store.ingest("b", {}, {}, received=15)
+    version = store.version
+    assert store.evict(timeout_sec=20, now=30) == ["a"]
+    assert list(store.snapshot().hosts) == ["b"]
+    assert store.evict(timeout_sec=20, now=30) == []
+    assert store.version == version + 1
+
+
+def test_per_host_receive_times():
+    store = TelemetryStore()
+    store.ingest_many({"a": ({}, {}), "b": ({}, {})}, received={"a": 1, "b": 4})
+    assert store.snapshot().keep_alive(now=10) == {"a": 9, "b": 6}
+
+
+def test_evictor_evicts_without_readers():
+    store = TelemetryStore()
+    store.ingest("a", {}, {}, received=time.monotonic() - 10)
+    store.ingest("b", {}, {})
+    evicted = []
+    evictor = HostEvictor(
+        store, timeout_sec=5, on_evict=evicted.extend, interval_sec=0.01
+    )
+    evictor.start()
+    deadline = time.monotonic() + 2
+    while not evicted and time.monotonic() < deadline:
+        time.sleep(0.01)
+    evictor.stop()
+    assert evicted == ["a"]
+    assert list(store.snapshot().hosts) == ["b"]
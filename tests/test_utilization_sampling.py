@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+__author__ = "Christian Heider Nielsen"
+
+import os
+
+from heimdallr.utilities.nvidia import bindings
+from heimdallr.utilities.nvidia.fake_nvml import FakeNvml, use_nvml_lib
+from heimdallr.utilities.nvidia.packing import DeviceInventory, get_nv_info
+from heimdallr.utilities.nvidia.sampling import UtilizationSampler, percentile_summary
+from heimdallr.utilities.publisher.process_sampling import ProcessCache
+
+
+def test_percentile_summary():
+    assert percentile_summary("gpu", [3, 1, 2]) == {
+        "gpu_p50": 2,
+        "gpu_p95": 3,
+        "gpu_max": 3,
+    }
+    summary = percentile_summary("gpu", list(range(1, 101)))
+    assert (summary["gpu_p50"], summary["gpu_p95"], summary["gpu_max"]) == (50, 95, 100)
+
+
+def test_summaries_of_new_samples_only():
+    fake = FakeNvml(
+        device_count=2, processes_per_device=1, pids=[os.getpid()], samples_per_step=60
+    )
+    sampler = UtilizationSampler()
+    inventory = DeviceInventory()
+    cache = ProcessCache(cpu_interval=0)
+    with use_nvml_lib(fake):
+        devices = get_nv_info(
+            process_cache=cache, device_inventory=inventory, utilization_sampler=sampler
+        )[1]
+        for device in devices:  # Bursts between the point readings
+            assert device["gpu_utilization_max"] == 100
+            assert device["gpu_utilization_max"] > device["gpu_utilization"]
+            assert (
+                device["gpu_utilization_p50"]
+                <= device["gpu_utilization_p95"]
+                <= device["gpu_utilization_max"]
+            )
+            assert device["memory_utilization_max"] > device["memory_utilization"]
+
+        devices = get_nv_info(
+            process_cache=cache, device_inventory=inventory, utilization_sampler=sampler
+        )[1]
+        assert "gpu_utilization_p50" not in devices[0]
+
+        fake.step()
+        devices = get_nv_info(
+            process_cache=cache, device_inventory=inventory, utilization_sampler=sampler
+        )[1]
+        assert "gpu_utilization_p50" in devices[0]
+
+
+def test_unsupported_device_is_not_asked_again():
+    fake = FakeNvml(device_count=1, processes_per_device=0)
+    sampler = UtilizationSampler()
+    with use_nvml_lib(fake):
+        bindings.nvmlInit()
+        handle = bindings.nvmlDeviceGetHandleByIndex(0)
+        fake.fail("nvmlDeviceGetSamples", bindings.NVML_ERROR_NOT_SUPPORTED, times=2)
+        assert sampler.summary("uuid", handle) == {}
+        fake.step()
+        calls = fake.calls["nvmlDeviceGetSamples"]
+        assert sampler.summary("uuid", handle) == {}
+        assert fake.calls["nvmlDeviceGetSamples"] == calls